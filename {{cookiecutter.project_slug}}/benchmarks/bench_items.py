@@ -0,0 +1,331 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Benchmark ItemService and the items API, with JSON baselines.
+
+For each catalog size, a fresh store is filled with generated items and
+every operation is timed: ItemService calls (create, get, list at several
+skip depths, search at several selectivities, update, delete) and the same
+requests end to end through the ASGI app, in-process. Each operation runs
+--repeat times after one warm-up call; the median and 95th percentile are
+reported.
+
+Save the results as a baseline, then compare later runs against it; the
+comparison exits with status 1 if any median got slower by more than the
+threshold, so it can gate changes in CI.
+
+Usage:
+    python benchmarks/bench_items.py [--sizes 1000 100000 1000000]
+        [--store memory|sqlite|shared] [--repeat 200]
+        [--save baseline.json] [--compare baseline.json] [--threshold 0.2]
+"""
+
+from __future__ import annotations
+
+import os
+
+# Limits would throttle the benchmark's own requests
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("CONCURRENCY_LIMIT_ENABLED", "false")
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from {{cookiecutter.project_slug}}.api.v1.endpoints import items as items_endpoint
+from {{cookiecutter.project_slug}}.core.logging import setup_logging
+from {{cookiecutter.project_slug}}.main import app
+from {{cookiecutter.project_slug}}.models.item import ItemCreate, ItemUpdate
+from {{cookiecutter.project_slug}}.services.item_service import ItemService
+from {{cookiecutter.project_slug}}.services.storage import (
+    InMemoryItemStore,
+    ItemStore,
+    SharedItemStore,
+    SQLiteItemStore,
+)
+
+MATERIALS = [
+    "steel",
+    "oak",
+    "glass",
+    "linen",
+    "brass",
+    "cotton",
+    "clay",
+    "wool",
+    "slate",
+    "jute",
+]
+COLORS = [
+    "red",
+    "blue",
+    "green",
+    "black",
+    "white",
+    "amber",
+    "teal",
+    "ivory",
+    "olive",
+    "plum",
+]
+# Search queries by the share of the catalog they match
+SEARCHES = {
+    "all": "widget",
+    "10pct": "steel",
+    "1pct": "steel red",
+    "none": "no such thing",
+}
+SEED_BATCH_SIZE = 10_000
+
+
+def make_store(kind: str, directory: str) -> ItemStore:
+    """Empty store of the given kind, with its files in a directory."""
+    if kind == "sqlite":
+        return SQLiteItemStore(os.path.join(directory, "items.db"))
+    if kind == "shared":
+        return SharedItemStore(os.path.join(directory, "items.log"))
+    return InMemoryItemStore()
+
+
+async def seed(service: ItemService, count: int) -> list[str]:
+    """Fill the store with count generated items and return their IDs."""
+    ids: list[str] = []
+    for first in range(0, count, SEED_BATCH_SIZE):
+        batch = [
+            ItemCreate.model_construct(
+                name=f"{MATERIALS[index % 10]} {COLORS[index // 10 % 10]} widget {index}",
+                description="Generated for benchmarking",
+                price=10.0 + index % 100,
+                tax=1.0,
+            )
+            for index in range(first, min(first + SEED_BATCH_SIZE, count))
+        ]
+        ids += [item.id for item in await service.create_items(batch)]
+    return ids
+
+
+async def measure(
+    call: Callable[[int], Awaitable[Any]], repeat: int
+) -> dict[str, float]:
+    """Time repeat calls after one warm-up call; the call gets its run index."""
+    await call(repeat)
+    samples = []
+    for index in range(repeat):
+        start = time.perf_counter()
+        await call(index)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "median_us": round(samples[len(samples) // 2] * 1e6, 2),
+        "p95_us": round(samples[int(len(samples) * 0.95)] * 1e6, 2),
+    }
+
+
+async def request(
+    method: str, path: str, body: Optional[dict[str, Any]] = None
+) -> bytes:
+    """Send one request straight to the ASGI app and return the response body."""
+    raw_path, _, query = path.partition("?")
+    payload = json.dumps(body).encode() if body is not None else b""
+    headers = [(b"content-type", b"application/json")] if body is not None else []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": raw_path,
+        "raw_path": raw_path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+    chunks: list[bytes] = []
+    status: list[int] = []
+    sent = False
+
+    async def receive() -> dict[str, Any]:
+        nonlocal sent
+        if sent:
+            await asyncio.Event().wait()
+        sent = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    if status[0] >= 400:
+        raise RuntimeError(f"{method} {path} returned {status[0]}")
+    return b"".join(chunks)
+
+
+async def run_size(kind: str, count: int, repeat: int) -> dict[str, dict[str, float]]:
+    """Benchmark every operation against a store filled with count items."""
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        service = ItemService(make_store(kind, directory))
+        live = await seed(service, count)
+        deep = max(0, count - 100)
+
+        service_ops: dict[str, Callable[[int], Awaitable[Any]]] = {
+            "get": lambda i: service.get_item(live[i * 7919 % len(live)]),
+            "list_skip_0": lambda *_: service.get_items(skip=0, limit=100),
+            "list_skip_mid": lambda *_: service.get_items(skip=count // 2, limit=100),
+            "list_skip_end": lambda *_: service.get_items(skip=deep, limit=100),
+            **{
+                f"search_{name}": (
+                    lambda *_, q=query: service.search_items(q, limit=100)
+                )
+                for name, query in SEARCHES.items()
+            },
+            "update": lambda i: service.update_item(
+                live[i % len(live)], ItemUpdate(price=20.0 + i % 50)
+            ),
+            "create": lambda i: service.create_item(
+                ItemCreate(name=f"new {i}", price=1.0)
+            ),
+        }
+        for name, call in service_ops.items():
+            results[f"service.{name}[n={count}]"] = await measure(call, repeat)
+        # Extra items for the warm-up and timed deletes
+        deletable = await seed(service, repeat + 1)
+        results[f"service.delete[n={count}]"] = await measure(
+            lambda *_: service.delete_item(deletable.pop()), repeat
+        )
+
+        # The endpoints use the module's service instance
+        items_endpoint.item_service = service
+        api = "/api/v1/items"
+        api_ops: dict[str, Callable[[int], Awaitable[Any]]] = {
+            "get": lambda i: request("GET", f"{api}/{live[i * 7919 % len(live)]}"),
+            "list_skip_0": lambda *_: request("GET", f"{api}/?skip=0&limit=100"),
+            "list_skip_mid": lambda *_: request(
+                "GET", f"{api}/?skip={count // 2}&limit=100"
+            ),
+            "search_10pct": lambda *_: request(
+                "GET", f"{api}/search/?q=steel&limit=100"
+            ),
+            "update": lambda i: request(
+                "PUT", f"{api}/{live[i % len(live)]}", {"price": 30.0 + i % 50}
+            ),
+            "create": lambda i: request(
+                "POST", f"{api}/", {"name": f"api {i}", "price": 1.0}
+            ),
+        }
+        for name, call in api_ops.items():
+            results[f"api.{name}[n={count}]"] = await measure(call, repeat)
+        deletable = await seed(service, repeat + 1)
+        results[f"api.delete[n={count}]"] = await measure(
+            lambda *_: request("DELETE", f"{api}/{deletable.pop()}"), repeat
+        )
+        service.close()
+    return results
+
+
+def compare(
+    baseline: dict[str, Any], results: dict[str, dict[str, float]], threshold: float
+) -> bool:
+    """Print current against baseline medians; return True if any regressed."""
+    regressed = False
+    print(f"\n{'benchmark':40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:40} {'-':>12} {current['median_us']:10.1f}us {'new':>8}")
+            continue
+        change = current["median_us"] / before["median_us"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        regressed = regressed or bool(flag)
+        print(
+            f"{name:40} {before['median_us']:10.1f}us {current['median_us']:10.1f}us "
+            f"{change:+7.1%}{flag}"
+        )
+    return regressed
+
+
+def main() -> None:
+    """Run the benchmarks, then save and/or compare the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 100_000, 1_000_000],
+        help="Catalog sizes to benchmark",
+    )
+    parser.add_argument(
+        "--store",
+        choices=["memory", "sqlite", "shared"],
+        default="memory",
+        help="Storage backend",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=200, help="Timed calls per operation"
+    )
+    parser.add_argument("--save", help="Write the results to this JSON baseline file")
+    parser.add_argument(
+        "--compare", help="Compare the results with this JSON baseline file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative median slowdown reported as a regression",
+    )
+    args = parser.parse_args()
+
+    # Measure the service, not the terminal: only warnings are logged
+    setup_logging(log_format="json")
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results: dict[str, dict[str, float]] = {}
+    for count in args.sizes:
+        started = time.perf_counter()
+        results.update(asyncio.run(run_size(args.store, count, args.repeat)))
+        print(
+            f"n={count}: done in {time.perf_counter() - started:.1f}s", file=sys.stderr
+        )
+
+    for name, result in results.items():
+        print(
+            f"{name:40} median {result['median_us']:10.1f}us  p95 {result['p95_us']:10.1f}us"
+        )
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(
+                {
+                    "meta": {
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "store": args.store,
+                        "repeat": args.repeat,
+                    },
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+{% endif -%}
@@ -0,0 +1,100 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Compare the memory held per stored item by Item models and ItemRecords.
+
+Builds the in-memory store's data structures for the same catalog twice:
+once as Item models with (datetime, id) listing keys, as the store kept
+them before, and once as compact ItemRecords with (microseconds, id) keys,
+as it keeps them now. Memory is measured with tracemalloc. The name search
+index is the same in both layouts and left out.
+
+Usage:
+    python benchmarks/bench_memory.py [--items 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from {{cookiecutter.project_slug}}.models.item import Item
+from {{cookiecutter.project_slug}}.services.storage.records import ItemRecord
+
+DESCRIPTIONS = [
+    "Refurbished, includes original packaging",
+    "New, ships within two business days",
+    "Limited edition",
+]
+
+
+def make_items(count: int, batch_size: int = 10_000) -> Iterator[list[Item]]:
+    """Validated items as created through the API, in batches."""
+    start = datetime.now(timezone.utc)
+    for first in range(0, count, batch_size):
+        yield [
+            Item(
+                id=f"item-{index:08x}",
+                name=f"Product {index}",
+                # Parsed from each request, so not one shared string object
+                description=f"{DESCRIPTIONS[index % len(DESCRIPTIONS)]}",
+                price=19.99,
+                tax=2.0 if index % 2 else None,
+                created_at=start + timedelta(microseconds=index),
+                updated_at=start + timedelta(microseconds=index),
+            )
+            for index in range(first, min(first + batch_size, count))
+        ]
+
+
+def as_models(count: int) -> Any:
+    """Items and listing keys as Item models."""
+    items: dict[str, Item] = {}
+    for batch in make_items(count):
+        for item in batch:
+            items[item.id] = item
+    order = sorted((item.created_at, item.id) for item in items.values())
+    return items, order
+
+
+def as_records(count: int) -> Any:
+    """Items and listing keys as ItemRecords."""
+    items: dict[str, ItemRecord] = {}
+    for batch in make_items(count):
+        for item in batch:
+            items[item.id] = ItemRecord.from_item(item)
+    order = sorted(record.key for record in items.values())
+    return items, order
+
+
+def measure(build: Callable[[int], Any], count: int) -> int:
+    """Bytes still allocated once the structures for count items are built."""
+    gc.collect()
+    tracemalloc.start()
+    data = build(count)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000, help="Items to store")
+    args = parser.parse_args()
+
+    models = measure(as_models, args.items) / args.items
+    records = measure(as_records, args.items) / args.items
+    print(f"items: {args.items}")
+    print(f"Item models: {models:8.0f} bytes/item")
+    print(f"ItemRecords: {records:8.0f} bytes/item")
+    print(f"reduction:   {models / records:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
+{% endif -%}
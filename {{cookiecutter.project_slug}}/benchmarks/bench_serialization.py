@@ -0,0 +1,115 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Compare FastAPI's default response pipeline with PydanticJSONResponse.
+
+Two throwaway apps serve the same list of validated items: one returns the
+models and lets FastAPI validate and encode them through response_model, the
+other returns a PydanticJSONResponse directly. Both are called as raw ASGI
+apps in-process, so client overhead does not hide the difference.
+
+Usage:
+    python benchmarks/bench_serialization.py [--items 1000] [--requests 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from fastapi import FastAPI
+
+from {{cookiecutter.project_slug}}.core.responses import PydanticJSONResponse
+from {{cookiecutter.project_slug}}.models.item import Item
+
+
+def make_items(count: int) -> list[Item]:
+    """Build validated items similar to what ItemService returns."""
+    now = datetime.now(timezone.utc)
+    return [
+        Item(
+            id=f"item-{index:08x}",
+            name=f"Benchmark item {index}",
+            description="Item used to benchmark response serialization",
+            price=19.99,
+            tax=2.0,
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(count)
+    ]
+
+
+def make_app(items: list[Item]) -> FastAPI:
+    """App exposing the same payload through both serialization paths."""
+    app = FastAPI()
+
+    @app.get("/default", response_model=list[Item])
+    async def default_path() -> list[Item]:
+        return items
+
+    @app.get("/fast", response_model=list[Item])
+    async def fast_path() -> PydanticJSONResponse:
+        return PydanticJSONResponse(items)
+
+    return app
+
+
+async def get(app: FastAPI, path: str) -> bytes:
+    """Send a GET request straight to the ASGI app and return the body."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+    chunks: list[bytes] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+async def measure(app: FastAPI, path: str, requests: int) -> float:
+    """Average seconds per request for a path, after one warm-up call."""
+    await get(app, path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await get(app, path)
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000, help="Items per response")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per path")
+    args = parser.parse_args()
+
+    app = make_app(make_items(args.items))
+    default = asyncio.run(measure(app, "/default", args.requests))
+    fast = asyncio.run(measure(app, "/fast", args.requests))
+    print(f"items per response: {args.items}, requests per path: {args.requests}")
+    print(f"response_model pipeline: {default * 1000:8.2f} ms/request")
+    print(f"PydanticJSONResponse:    {fast * 1000:8.2f} ms/request")
+    print(f"speedup:                 {default / fast:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
+{% endif -%}
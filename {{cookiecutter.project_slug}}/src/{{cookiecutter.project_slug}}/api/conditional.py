@@ -0,0 +1,77 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Helpers for ETags and conditional requests (If-None-Match / If-Match)."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+
+from {{cookiecutter.project_slug}}.models.item import Item
+
+IF_NONE_MATCH_DESCRIPTION = (
+    "ETag from a previous response; 304 Not Modified is returned if it still matches"
+)
+IF_MATCH_DESCRIPTION = (
+    "ETag the item must still have; 412 Precondition Failed is returned otherwise"
+)
+
+
+def item_etag(item: Item) -> str:
+    """
+    Strong ETag of a single item.
+
+    Every write sets a new updated_at, so the ID and timestamp identify the
+    representation without serializing it.
+    """
+    digest = hashlib.blake2b(
+        f"{item.id}|{item.updated_at.isoformat()}".encode(), digest_size=8
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def collection_etag(version: str) -> str:
+    """Strong ETag of a collection read, from the store-wide version."""
+    return f'"{version}"'
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = False) -> bool:
+    """
+    Whether an If-None-Match or If-Match header value matches an ETag.
+
+    Args:
+        header: Comma-separated list of entity tags, or "*"
+        etag: Current ETag of the resource
+        weak: Use weak comparison (If-None-Match) instead of strong (If-Match)
+
+    Returns:
+        True if any listed tag matches
+    """
+    if header is None:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            if not weak:
+                continue
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a representation the client already has."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def precondition_failed() -> HTTPException:
+    """412 error for a write whose If-Match precondition does not hold."""
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Item has been modified since it was read",
+    )
+{% endif -%}
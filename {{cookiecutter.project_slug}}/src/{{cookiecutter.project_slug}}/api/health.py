@@ -5,12 +5,14 @@ from __future__ import annotations
 
 import time
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Optional
 
-from fastapi import APIRouter, status
-from pydantic import BaseModel
+from fastapi import APIRouter, Response, status
+from pydantic import BaseModel, ConfigDict
 
 from {{cookiecutter.project_slug}}.core.config import settings
+from {{cookiecutter.project_slug}}.core.loop_monitor import loop_monitor
+from {{cookiecutter.project_slug}}.core.readiness import readiness
 {% if cookiecutter.project_type != "cli" -%}
 from {{cookiecutter.project_slug}}.core.logging import logger
 {% else -%}
@@ -18,6 +20,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 {% endif -%}
+from {{cookiecutter.project_slug}}.services.item_service import get_item_service
 
 # Store application start time for uptime calculation
 _start_time = time.time()
@@ -25,21 +28,43 @@ _start_time = time.time()
 router = APIRouter()
 
 
+class EventLoopLag(BaseModel):
+    """Event loop lag over the monitor's recent window."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    samples: int
+    blocked_calls: int
+
+
 class HealthResponse(BaseModel):
     """Health check response model."""
-    
+
     status: str
     timestamp: datetime
     uptime_seconds: float
     version: str = "{{cookiecutter.first_version}}"
+    event_loop: Optional[EventLoopLag] = None
 
 
 class ReadinessResponse(BaseModel):
     """Readiness check response model."""
-    
+
     status: str
     timestamp: datetime
     checks: dict[str, Any]
+    errors: dict[str, str] = {}
+
+
+def event_loop_lag() -> Optional[EventLoopLag]:
+    """Latest event loop lag percentiles, or None if the monitor is not running."""
+    if not loop_monitor.running:
+        return None
+    return EventLoopLag.model_validate(loop_monitor.summary())
 
 
 @router.get(
@@ -52,24 +77,26 @@ class ReadinessResponse(BaseModel):
 async def health_check() -> HealthResponse:
     """
     Health check endpoint for Kubernetes liveness probe.
-    
+
     This endpoint indicates whether the application is running and responsive.
-    If this endpoint fails, Kubernetes will restart the pod.
+    If this endpoint fails, Kubernetes will restart the pod. The response
+    includes event loop lag percentiles while the lag monitor is running.
     """
     uptime = time.time() - _start_time
-    
+
     response = HealthResponse(
         status="healthy",
         timestamp=datetime.now(timezone.utc),
         uptime_seconds=round(uptime, 2),
+        event_loop=event_loop_lag(),
     )
-    
+
     logger.info("Health check requested", uptime_seconds=uptime)
     return response
 
 
 @router.get(
-    "/livez", 
+    "/livez",
     response_model=HealthResponse,
     status_code=status.HTTP_200_OK,
     summary="Liveness check endpoint",
@@ -78,78 +105,98 @@ async def health_check() -> HealthResponse:
 async def liveness_check() -> HealthResponse:
     """
     Liveness probe endpoint for Kubernetes.
-    
+
     This endpoint checks if the application process is running.
     Similar to healthz but can include additional liveness-specific checks.
     """
     uptime = time.time() - _start_time
-    
+
     response = HealthResponse(
-        status="alive", 
+        status="alive",
         timestamp=datetime.now(timezone.utc),
         uptime_seconds=round(uptime, 2),
+        event_loop=event_loop_lag(),
     )
-    
+
     logger.debug("Liveness check requested")
     return response
 
 
+async def check_item_store() -> bool:
+    """Readiness check: the item store answers a cheap query."""
+    await get_item_service().get_version()
+    return True
+
+
+# Dependency checks run in the background and are cached by the registry.
+# Register more here, for example:
+# readiness.register("database", check_database_connection)
+# readiness.register("redis", check_redis_connection, interval=5, timeout=1)
+readiness.register("item_store", check_item_store)
+
+
 @router.get(
     "/readyz",
     response_model=ReadinessResponse,
     status_code=status.HTTP_200_OK,
-    summary="Readiness check endpoint", 
+    summary="Readiness check endpoint",
     description="Indicates if the application is ready to serve traffic",
+    responses={503: {"model": ReadinessResponse, "description": "Not ready"}},
 )
-async def readiness_check() -> ReadinessResponse:
+async def readiness_check(response: Response) -> ReadinessResponse:
     """
     Readiness probe endpoint for Kubernetes.
-    
+
     This endpoint checks if the application is ready to handle requests.
-    It should verify that all dependencies (database, external services, etc.)
-    are available and the application can serve traffic.
-    
+    Dependency checks (database, external services, etc.) are registered
+    with the readiness registry, which runs them in the background; the
+    probe reports their latest results without calling the dependencies.
+
     If this endpoint fails, Kubernetes will stop sending traffic to this pod
     but won't restart it.
     """
+    # Without the background refresh (e.g. no lifespan), run due checks here
+    if not readiness.running:
+        await readiness.refresh()
+
     checks: dict[str, Any] = {}
-    
-    # Add dependency checks here
-    # For example:
-    # checks["database"] = await check_database_connection()
-    # checks["redis"] = await check_redis_connection()
-    # checks["external_api"] = await check_external_api()
-    
+    errors: dict[str, str] = {}
+
     # Basic readiness checks
     checks["startup_complete"] = True
     checks["configuration_loaded"] = settings.app_name is not None
-    
+
     # Check if we're past the startup grace period
     uptime = time.time() - _start_time
     checks["startup_grace_period"] = uptime > settings.health_check_grace_period
-    
+
+    # Latest results of the registered dependency checks
+    for name, result in readiness.snapshot().items():
+        checks[name] = result.ok
+        if result.error:
+            errors[name] = result.error
+
     # Determine overall status
     all_checks_passed = all(
-        check_result is True 
-        for check_result in checks.values() 
+        check_result is True
+        for check_result in checks.values()
         if isinstance(check_result, bool)
     )
-    
+
     response_status = "ready" if all_checks_passed else "not_ready"
-    
-    response = ReadinessResponse(
+
+    logger.info("Readiness check requested", status=response_status, checks=checks)
+
+    # Return 503 Service Unavailable if not ready
+    if not all_checks_passed:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return ReadinessResponse(
         status=response_status,
         timestamp=datetime.now(timezone.utc),
         checks=checks,
+        errors=errors,
     )
-    
-    logger.info("Readiness check requested", status=response_status, checks=checks)
-    
-    # Return 503 Service Unavailable if not ready
-    if not all_checks_passed:
-        router.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
-    
-    return response
 
 
 # Legacy endpoint for backward compatibility
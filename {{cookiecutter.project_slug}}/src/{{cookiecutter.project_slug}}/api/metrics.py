@@ -0,0 +1,29 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Prometheus metrics endpoint for {{cookiecutter.project_name}}."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Response
+
+from {{cookiecutter.project_slug}}.core.metrics import CONTENT_TYPE, REGISTRY
+from {{cookiecutter.project_slug}}.services.item_service import get_item_service
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    response_class=Response,
+    summary="Prometheus metrics",
+    description="Metrics of this worker process in the Prometheus text format",
+    include_in_schema=False,
+)
+async def metrics() -> Response:
+    """
+    Expose the metrics registry for Prometheus to scrape.
+
+    Sampled gauges (store size, cache statistics) are refreshed first.
+    """
+    await get_item_service().update_metrics()
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+{% endif -%}
@@ -0,0 +1,124 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Helpers for JSON array and NDJSON (newline-delimited JSON) request bodies."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator
+from http import HTTPStatus
+from typing import Any
+
+from fastapi import HTTPException, Request, status
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class BodyLimitError(Exception):
+    """Raised when an NDJSON body goes over a limit, after the records before it."""
+
+
+class InvalidRecord:
+    """Placeholder for a body record that is not valid JSON."""
+
+    def __init__(self, error: str) -> None:
+        """Keep the decoding error to report it for this record."""
+        self.error = error
+
+
+def is_ndjson(request: Request) -> bool:
+    """Whether the request body is declared as NDJSON."""
+    content_type = request.headers.get("content-type", "")
+    return content_type.split(";")[0].strip().lower() == NDJSON_MEDIA_TYPE
+
+
+def _too_large(detail: str) -> HTTPException:
+    """413 error for a body over one of the limits."""
+    # HTTPStatus, as starlette renamed its 413 constant between versions
+    return HTTPException(status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+
+async def read_records(
+    request: Request, max_records: int, max_line_bytes: int
+) -> AsyncIterator[Any]:
+    """
+    Yield the records of a JSON array or NDJSON request body.
+
+    NDJSON bodies are decoded line by line as chunks arrive, so memory stays
+    bounded by max_line_bytes rather than the whole body. A line that is
+    not valid JSON yields an InvalidRecord instead of failing the request.
+    Reading an NDJSON body stops with BodyLimitError at the first record
+    over max_records or line over max_line_bytes; the records before it
+    have been yielded, and the rest of the body is never read. A JSON array
+    is checked against max_records before any record is yielded.
+
+    Args:
+        request: Request whose body to read
+        max_records: Most records a body may hold
+        max_line_bytes: Longest NDJSON line, in bytes
+
+    Raises:
+        HTTPException: 400 if a JSON body is malformed or not an array, 413
+            if a JSON array has too many records
+        BodyLimitError: If an NDJSON body has too many records or too long
+            a line
+    """
+    if is_ndjson(request):
+        count = 0
+        async for record in _read_ndjson(request.stream(), max_line_bytes):
+            count += 1
+            if count > max_records:
+                raise BodyLimitError(
+                    f"Request body has more than {max_records} records"
+                )
+            yield record
+        return
+
+    try:
+        body = await request.json()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Request body is not valid JSON: {e}",
+        ) from e
+    if not isinstance(body, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Request body must be a JSON array or {NDJSON_MEDIA_TYPE}",
+        )
+    if len(body) > max_records:
+        raise _too_large(f"Request body has more than {max_records} records")
+    for record in body:
+        yield record
+
+
+async def _read_ndjson(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[Any]:
+    """Split a stream of byte chunks into decoded NDJSON lines."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            _check_line_length(line, max_line_bytes)
+            if line.strip():
+                yield _decode_line(line)
+        # An unfinished line must not grow without bound either
+        _check_line_length(pending, max_line_bytes)
+    if pending.strip():
+        yield _decode_line(pending)
+
+
+def _check_line_length(line: bytes, max_line_bytes: int) -> None:
+    """Reject an NDJSON line longer than the limit."""
+    if len(line) > max_line_bytes:
+        raise BodyLimitError(f"NDJSON line is longer than {max_line_bytes} bytes")
+
+
+def _decode_line(line: bytes) -> Any:
+    """Decode one NDJSON line, returning InvalidRecord if it is not JSON."""
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return InvalidRecord(f"Invalid JSON: {e}")
+{% endif -%}
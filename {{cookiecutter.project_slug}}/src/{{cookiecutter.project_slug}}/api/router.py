@@ -5,7 +5,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from {{cookiecutter.project_slug}}.api import health
+from {{cookiecutter.project_slug}}.api import health, metrics
 from {{cookiecutter.project_slug}}.api.v1 import v1_router
 from {{cookiecutter.project_slug}}.core.config import settings
 
@@ -15,10 +15,10 @@ api_router = APIRouter()
 # Include health endpoints
 api_router.include_router(health.router, tags=["health"])
 
+# Include the Prometheus metrics endpoint
+if settings.metrics_enabled:
+    api_router.include_router(metrics.router, tags=["metrics"])
+
 # Include versioned API routers
-api_router.include_router(
-    v1_router, 
-    prefix=settings.api_v1_prefix,
-    tags=["v1"]
-)
+api_router.include_router(v1_router, prefix=settings.api_v1_prefix, tags=["v1"])
 {% endif -%}
\ No newline at end of file
@@ -3,35 +3,353 @@
 
 from __future__ import annotations
 
-from typing import Any
+import csv
+import io
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime
+from typing import Any, Optional, TypeVar
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 
-from {{cookiecutter.project_slug}}.models.item import Item, ItemCreate, ItemUpdate
-from {{cookiecutter.project_slug}}.services.item_service import ItemService
+from {{cookiecutter.project_slug}}.api.conditional import (
+    IF_MATCH_DESCRIPTION,
+    IF_NONE_MATCH_DESCRIPTION,
+    collection_etag,
+    etag_matches,
+    item_etag,
+    not_modified,
+    precondition_failed,
+)
+from {{cookiecutter.project_slug}}.api.ndjson import (
+    NDJSON_MEDIA_TYPE,
+    BodyLimitError,
+    InvalidRecord,
+    read_records,
+)
+from {{cookiecutter.project_slug}}.core.config import settings
+from {{cookiecutter.project_slug}}.core.rate_limit import rate_limit
+from {{cookiecutter.project_slug}}.core.responses import PydanticJSONResponse
+from {{cookiecutter.project_slug}}.models.item import (
+    BulkItemResponse,
+    BulkItemResult,
+    Item,
+    ItemBulkUpdate,
+    ItemCreate,
+    ItemList,
+    ItemUpdate,
+)
+from {{cookiecutter.project_slug}}.services.item_service import (
+    InvalidCursorError,
+    StaleItemError,
+    get_item_service,
+)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+BulkBatch = list[tuple[int, Any]]
 
 router = APIRouter()
-item_service = ItemService()
+item_service = get_item_service()
+
+# Endpoints returning service results wrap them in PydanticJSONResponse
+# themselves: the items are already validated, so FastAPI's response_model
+# re-validation is skipped and response_model only documents the schema.
+
+# Bulk bodies are validated and written in batches of this many entries
+BULK_BATCH_SIZE = 1000
+
+# Exports read and send the store in batches of this many items
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CSV_FIELDS = list(Item.model_fields)
+
+# Per-client rate limits: listing and search share the "read" policy, and
+# every endpoint that changes items the "write" policy
+READ_RATE_LIMIT = Depends(rate_limit("read"))
+WRITE_RATE_LIMIT = Depends(rate_limit("write"))
+
+AFTER_DESCRIPTION = (
+    "Cursor from a previous page's next_cursor. Pass an empty value to start "
+    "cursor pagination; the response is then an ItemList envelope."
+)
+
+
+def _check_cursor_mode(skip: int) -> None:
+    """Reject skip in cursor mode, where position comes from the cursor."""
+    if skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'skip' cannot be combined with 'after'",
+        )
+
+
+def _invalid_cursor(e: InvalidCursorError) -> HTTPException:
+    """Convert an invalid cursor into a 400 response."""
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+async def _collection_etag() -> str:
+    """
+    ETag for a cursor page of the collection, which is never cached.
+
+    The version is read before the items, so a concurrent write can only
+    make the ETag older than the body, never newer; the next poll then
+    simply fetches the body again.
+    """
+    return collection_etag(await item_service.get_version())
+
+
+async def _offset_page_response(
+    if_none_match: Optional[str], load: Callable[[], Awaitable[tuple[str, list[Item]]]]
+) -> Response:
+    """
+    Conditional response for an offset page, which the service may cache.
+
+    The ETag comes from the version the page was loaded at, not the current
+    one: a page cached before another process wrote to the store must not
+    be sent under the newer version, or clients would keep the stale body
+    and get 304 for it until the next write. A client already holding the
+    current version gets 304 without the page being loaded.
+    """
+    if if_none_match is not None:
+        current = collection_etag(await item_service.get_version())
+        if etag_matches(if_none_match, current, weak=True):
+            return not_modified(current)
+    version, items = await load()
+    etag = collection_etag(version)
+    if etag_matches(if_none_match, etag, weak=True):
+        return not_modified(etag)
+    return PydanticJSONResponse(items, headers={"ETag": etag})
+
+
+async def _expected_updated_at(
+    item_id: str, if_match: Optional[str]
+) -> Optional[datetime]:
+    """
+    Check an If-Match header against the current item.
+
+    Returns:
+        The updated_at the write must still find, None without If-Match
+
+    Raises:
+        HTTPException: 412 if the item is missing or its ETag does not match
+    """
+    if if_match is None:
+        return None
+    current = await item_service.get_item(item_id)
+    if current is None or not etag_matches(if_match, item_etag(current)):
+        raise precondition_failed()
+    return current.updated_at
+
+
+def _bulk_body(entry_schema: dict[str, Any]) -> dict[str, Any]:
+    """OpenAPI request body for a JSON array or NDJSON stream of entries."""
+    array_schema = {"type": "array", "items": entry_schema}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": array_schema},
+                NDJSON_MEDIA_TYPE: {"schema": entry_schema},
+            },
+        }
+    }
+
+
+def _parse_entry(model: type[ModelT], record: Any) -> ModelT:
+    """Validate one bulk entry, raising ValueError with a readable message."""
+    if isinstance(record, InvalidRecord):
+        raise ValueError(record.error)
+    try:
+        return model.model_validate(record)
+    except ValidationError as e:
+        raise ValueError(
+            "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'body'}: {error['msg']}"
+                for error in e.errors()
+            )
+        ) from e
+
+
+def _parse_batch(
+    model: type[ModelT], batch: BulkBatch
+) -> tuple[list[tuple[int, ModelT]], list[BulkItemResult]]:
+    """Split a batch into validated entries and results for invalid ones."""
+    valid: list[tuple[int, ModelT]] = []
+    invalid: list[BulkItemResult] = []
+    for index, record in batch:
+        try:
+            valid.append((index, _parse_entry(model, record)))
+        except ValueError as e:
+            invalid.append(BulkItemResult(index=index, status="invalid", error=str(e)))
+    return valid, invalid
+
+
+async def _run_bulk(
+    request: Request,
+    process_batch: Callable[[BulkBatch], Awaitable[list[BulkItemResult]]],
+) -> BulkItemResponse:
+    """
+    Feed the request body to process_batch in bounded batches.
+
+    Earlier batches may already be written when an NDJSON body turns out
+    to exceed a limit, so that is not an error response: the entries read
+    so far are processed and reported as usual, the entry at the limit is
+    reported invalid, and stopped_at tells the client where to resume.
+    """
+    results: list[BulkItemResult] = []
+    batch: BulkBatch = []
+    index = 0
+    stopped_at: Optional[int] = None
+    records = read_records(
+        request,
+        max_records=settings.bulk_max_records,
+        max_line_bytes=settings.bulk_max_line_bytes,
+    )
+    try:
+        async for record in records:
+            batch.append((index, record))
+            index += 1
+            if len(batch) >= BULK_BATCH_SIZE:
+                results.extend(await process_batch(batch))
+                batch = []
+    except BodyLimitError as e:
+        stopped_at = index
+        results.append(
+            BulkItemResult(
+                index=index,
+                status="invalid",
+                error=f"{e}; this and any later entries were not processed",
+            )
+        )
+    if batch:
+        results.extend(await process_batch(batch))
+
+    results.sort(key=lambda result: result.index)
+    failed = sum(result.status in ("invalid", "not_found") for result in results)
+    return BulkItemResponse(
+        results=results,
+        succeeded=len(results) - failed,
+        failed=failed,
+        stopped_at=stopped_at,
+    )
+
+
+async def _create_batch(batch: BulkBatch) -> list[BulkItemResult]:
+    """Create the valid entries of a bulk create batch."""
+    valid, results = _parse_batch(ItemCreate, batch)
+    created = await item_service.create_items([entry for _, entry in valid])
+    results.extend(
+        BulkItemResult(index=index, status="created", id=item.id)
+        for (index, _), item in zip(valid, created, strict=True)
+    )
+    return results
+
+
+async def _update_batch(batch: BulkBatch) -> list[BulkItemResult]:
+    """Apply the valid entries of a bulk update batch."""
+    entries, results = _parse_batch(ItemBulkUpdate, batch)
+    # Strip the ID off each entry into an ItemUpdate, validated like PUT bodies
+    valid: list[tuple[int, str]] = []
+    updates: list[tuple[str, ItemUpdate]] = []
+    for index, entry in entries:
+        fields = entry.model_dump(exclude={"id"}, exclude_unset=True)
+        try:
+            update = _parse_entry(ItemUpdate, fields)
+        except ValueError as e:
+            results.append(
+                BulkItemResult(index=index, status="invalid", id=entry.id, error=str(e))
+            )
+            continue
+        valid.append((index, entry.id))
+        updates.append((entry.id, update))
+    updated = await item_service.update_items(updates)
+    results.extend(
+        BulkItemResult(
+            index=index,
+            status="updated" if item is not None else "not_found",
+            id=item_id,
+        )
+        for (index, item_id), item in zip(valid, updated, strict=True)
+    )
+    return results
+
+
+async def _delete_batch(batch: BulkBatch) -> list[BulkItemResult]:
+    """Delete the valid entries of a bulk delete batch."""
+    results: list[BulkItemResult] = []
+    valid: list[tuple[int, str]] = []
+    for index, record in batch:
+        item_id = record.get("id") if isinstance(record, dict) else record
+        if isinstance(item_id, str) and item_id:
+            valid.append((index, item_id))
+        else:
+            results.append(
+                BulkItemResult(
+                    index=index,
+                    status="invalid",
+                    error="Entry must be an item ID or an object with an 'id'",
+                )
+            )
+    deleted = await item_service.delete_items([item_id for _, item_id in valid])
+    results.extend(
+        BulkItemResult(index=index, status="deleted" if ok else "not_found", id=item_id)
+        for (index, item_id), ok in zip(valid, deleted, strict=True)
+    )
+    return results
 
 
 @router.get(
     "/",
-    response_model=list[Item],
+    response_model=list[Item] | ItemList,
     status_code=status.HTTP_200_OK,
     summary="List all items",
     description="Retrieve a list of all items with optional pagination",
+    dependencies=[READ_RATE_LIMIT],
 )
 async def list_items(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
-) -> list[Item]:
+    after: Optional[str] = Query(None, description=AFTER_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
+) -> Response:
     """
     List all items with pagination support.
-    
+
+    Responses carry an ETag that changes whenever any item changes. Send it
+    back in If-None-Match to get an empty 304 while nothing has changed.
+
     - **skip**: Number of items to skip (for pagination)
     - **limit**: Maximum number of items to return
+    - **after**: Cursor for keyset pagination (returns an ItemList envelope)
     """
-    return await item_service.get_items(skip=skip, limit=limit)
+    if after is None:
+        return await _offset_page_response(
+            if_none_match,
+            lambda: item_service.get_items_with_version(skip=skip, limit=limit),
+        )
+
+    _check_cursor_mode(skip)
+    etag = await _collection_etag()
+    if etag_matches(if_none_match, etag, weak=True):
+        return not_modified(etag)
+
+    try:
+        return PydanticJSONResponse(
+            await item_service.get_items_page(after=after, limit=limit),
+            headers={"ETag": etag},
+        )
+    except InvalidCursorError as e:
+        raise _invalid_cursor(e) from e
 
 
 @router.post(
@@ -40,17 +358,144 @@ async def list_items(
     status_code=status.HTTP_201_CREATED,
     summary="Create a new item",
     description="Create a new item with the provided data",
+    dependencies=[WRITE_RATE_LIMIT],
 )
-async def create_item(item: ItemCreate) -> Item:
+async def create_item(item: ItemCreate) -> PydanticJSONResponse:
     """
     Create a new item.
-    
+
     - **name**: Item name (required)
     - **description**: Item description (optional)
     - **price**: Item price (must be positive)
     - **tax**: Tax amount (optional)
     """
-    return await item_service.create_item(item)
+    created = await item_service.create_item(item)
+    return PydanticJSONResponse(
+        created,
+        status_code=status.HTTP_201_CREATED,
+        headers={"ETag": item_etag(created)},
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkItemResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Create items in bulk",
+    description="Create many items from a JSON array or an NDJSON stream",
+    openapi_extra=_bulk_body(ItemCreate.model_json_schema()),
+    dependencies=[WRITE_RATE_LIMIT],
+)
+async def create_items_bulk(request: Request) -> BulkItemResponse:
+    """
+    Create many items in one request.
+
+    Send a JSON array of items, or stream one item per line with
+    `Content-Type: application/x-ndjson`. Each entry is reported separately;
+    invalid entries do not prevent the others from being created. An NDJSON
+    stream is cut off at the first entry over the size limits, which
+    `stopped_at` reports; the entries before it are still created.
+    """
+    return await _run_bulk(request, _create_batch)
+
+
+@router.patch(
+    "/bulk",
+    response_model=BulkItemResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Update items in bulk",
+    description="Update many items from a JSON array or an NDJSON stream",
+    openapi_extra=_bulk_body(ItemBulkUpdate.model_json_schema()),
+    dependencies=[WRITE_RATE_LIMIT],
+)
+async def update_items_bulk(request: Request) -> BulkItemResponse:
+    """
+    Update many items in one request.
+
+    Each entry holds the item `id` and the fields to change.
+    """
+    return await _run_bulk(request, _update_batch)
+
+
+@router.delete(
+    "/bulk",
+    response_model=BulkItemResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Delete items in bulk",
+    description="Delete many items from a JSON array or an NDJSON stream",
+    openapi_extra=_bulk_body(
+        {
+            "anyOf": [
+                {"type": "string"},
+                {"type": "object", "properties": {"id": {"type": "string"}}},
+            ]
+        }
+    ),
+    dependencies=[WRITE_RATE_LIMIT],
+)
+async def delete_items_bulk(request: Request) -> BulkItemResponse:
+    """
+    Delete many items in one request.
+
+    Each entry is an item ID, or an object with an `id` field.
+    """
+    return await _run_bulk(request, _delete_batch)
+
+
+async def _export_ndjson(batches: AsyncIterator[list[Item]]) -> AsyncIterator[bytes]:
+    """Encode batches of items as NDJSON, one chunk per batch."""
+    async for batch in batches:
+        yield b"".join(item.model_dump_json().encode() + b"\n" for item in batch)
+
+
+async def _export_csv(batches: AsyncIterator[list[Item]]) -> AsyncIterator[bytes]:
+    """Encode batches of items as CSV with a header row, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_FIELDS)
+    writer.writeheader()
+    async for batch in batches:
+        writer.writerows(item.model_dump(mode="json") for item in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export all items",
+    description="Stream every item as NDJSON or CSV",
+    responses={
+        200: {"content": {NDJSON_MEDIA_TYPE: {}, "text/csv": {}}},
+    },
+)
+async def export_items(
+    format: str = Query(
+        "ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"
+    ),
+) -> StreamingResponse:
+    """
+    Export the full catalog in created_at order.
+
+    Items are read from the store and written to the client one batch at a
+    time. The next batch is only read once the previous one has been sent,
+    so memory stays constant and slow clients apply backpressure.
+
+    - **format**: `ndjson` (one JSON object per line) or `csv`
+    """
+    batches = item_service.iter_items(batch_size=EXPORT_BATCH_SIZE)
+    if format == "csv":
+        body, media_type = _export_csv(batches), "text/csv"
+    else:
+        body, media_type = _export_ndjson(batches), NDJSON_MEDIA_TYPE
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="items.{format}"'},
+    )
 
 
 @router.get(
@@ -60,10 +505,16 @@ async def create_item(item: ItemCreate) -> Item:
     summary="Get an item by ID",
     description="Retrieve a specific item by its ID",
 )
-async def get_item(item_id: str) -> Item:
+async def get_item(
+    item_id: str,
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
+) -> Response:
     """
     Get a specific item by ID.
-    
+
+    The response carries the item's ETag; send it back in If-None-Match to
+    get an empty 304 while the item is unchanged.
+
     - **item_id**: The unique identifier of the item
     """
     item = await item_service.get_item(item_id)
@@ -72,7 +523,10 @@ async def get_item(item_id: str) -> Item:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Item with id '{item_id}' not found",
         )
-    return item
+    etag = item_etag(item)
+    if etag_matches(if_none_match, etag, weak=True):
+        return not_modified(etag)
+    return PydanticJSONResponse(item, headers={"ETag": etag})
 
 
 @router.put(
@@ -81,26 +535,36 @@ async def get_item(item_id: str) -> Item:
     status_code=status.HTTP_200_OK,
     summary="Update an item",
     description="Update an existing item with new data",
+    dependencies=[WRITE_RATE_LIMIT],
 )
-async def update_item(item_id: str, item_update: ItemUpdate) -> Item:
+async def update_item(
+    item_id: str,
+    item_update: ItemUpdate,
+    if_match: Optional[str] = Header(None, description=IF_MATCH_DESCRIPTION),
+) -> PydanticJSONResponse:
     """
     Update an existing item.
-    
-    All fields are optional - only provided fields will be updated.
-    
+
+    All fields are optional - only provided fields will be updated. With
+    If-Match, the update only applies if the item still has that ETag.
+
     - **item_id**: The unique identifier of the item
     - **name**: New item name
     - **description**: New item description
     - **price**: New item price
     - **tax**: New tax amount
     """
-    item = await item_service.update_item(item_id, item_update)
+    expected_updated_at = await _expected_updated_at(item_id, if_match)
+    try:
+        item = await item_service.update_item(item_id, item_update, expected_updated_at)
+    except StaleItemError as e:
+        raise precondition_failed() from e
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Item with id '{item_id}' not found",
         )
-    return item
+    return PydanticJSONResponse(item, headers={"ETag": item_etag(item)})
 
 
 @router.delete(
@@ -109,14 +573,24 @@ async def update_item(item_id: str, item_update: ItemUpdate) -> Item:
     status_code=status.HTTP_200_OK,
     summary="Delete an item",
     description="Delete an item by its ID",
+    dependencies=[WRITE_RATE_LIMIT],
 )
-async def delete_item(item_id: str) -> dict[str, Any]:
+async def delete_item(
+    item_id: str,
+    if_match: Optional[str] = Header(None, description=IF_MATCH_DESCRIPTION),
+) -> dict[str, Any]:
     """
     Delete an item by ID.
-    
+
+    With If-Match, the item is only deleted if it still has that ETag.
+
     - **item_id**: The unique identifier of the item to delete
     """
-    success = await item_service.delete_item(item_id)
+    expected_updated_at = await _expected_updated_at(item_id, if_match)
+    try:
+        success = await item_service.delete_item(item_id, expected_updated_at)
+    except StaleItemError as e:
+        raise precondition_failed() from e
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -127,22 +601,47 @@ async def delete_item(item_id: str) -> dict[str, Any]:
 
 @router.get(
     "/search/",
-    response_model=list[Item],
+    response_model=list[Item] | ItemList,
     status_code=status.HTTP_200_OK,
     summary="Search items",
     description="Search items by name",
+    dependencies=[READ_RATE_LIMIT],
 )
 async def search_items(
     q: str = Query(..., min_length=1, description="Search query"),
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
-) -> list[Item]:
+    after: Optional[str] = Query(None, description=AFTER_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
+) -> Response:
     """
     Search items by name.
-    
+
+    Responses carry the same collection ETag as the item listing.
+
     - **q**: Search query (searches in item names)
     - **skip**: Number of items to skip (for pagination)
     - **limit**: Maximum number of items to return
+    - **after**: Cursor for keyset pagination (returns an ItemList envelope)
     """
-    return await item_service.search_items(query=q, skip=skip, limit=limit)
+    if after is None:
+        return await _offset_page_response(
+            if_none_match,
+            lambda: item_service.search_items_with_version(
+                query=q, skip=skip, limit=limit
+            ),
+        )
+
+    _check_cursor_mode(skip)
+    etag = await _collection_etag()
+    if etag_matches(if_none_match, etag, weak=True):
+        return not_modified(etag)
+
+    try:
+        return PydanticJSONResponse(
+            await item_service.search_items_page(query=q, after=after, limit=limit),
+            headers={"ETag": etag},
+        )
+    except InvalidCursorError as e:
+        raise _invalid_cursor(e) from e
 {% endif -%}
\ No newline at end of file
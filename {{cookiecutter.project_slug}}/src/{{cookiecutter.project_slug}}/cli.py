@@ -4,10 +4,20 @@
 from __future__ import annotations
 
 {% if cookiecutter.command_line_interface == "Typer" -%}
+{% if cookiecutter.project_type != "cli" -%}
+import asyncio
+import time
+from typing import Optional
+
+{% endif -%}
 import typer
 from typing_extensions import Annotated
 
 from {{cookiecutter.project_slug}} import __version__
+{%- if cookiecutter.project_type != "cli" %}
+from {{cookiecutter.project_slug}}.loadtest import DEFAULT_MIX, run_load_test
+from {{cookiecutter.project_slug}}.services.item_service import seed_item_store
+{%- endif %}
 
 app = typer.Typer(
     name="{{cookiecutter.project_slug}}",
@@ -47,15 +57,72 @@ def hello(
     """Say hello to someone."""
     for _ in range(count):
         typer.echo(f"Hello {name}!")
+{% if cookiecutter.project_type != "cli" %}
+
+@app.command()
+def loadtest(
+    url: Annotated[
+        Optional[str],
+        typer.Option(help="Base URL of a running server (default: in-process app)"),
+    ] = None,
+    rate: Annotated[float, typer.Option(help="Requests started per second")] = 100.0,
+    duration: Annotated[
+        float, typer.Option(help="Seconds to send requests for")
+    ] = 10.0,
+    connections: Annotated[int, typer.Option(help="HTTP connection pool size")] = 64,
+    mix: Annotated[
+        str, typer.Option(help="Request mix as operation=weight pairs")
+    ] = DEFAULT_MIX,
+    timeout: Annotated[
+        float, typer.Option(help="Seconds before a request fails")
+    ] = 10.0,
+    seed: Annotated[
+        Optional[int], typer.Option(help="Random seed for repeatable runs")
+    ] = None,
+) -> None:
+    """Load the API at a fixed request rate and report latency percentiles."""
+    try:
+        report = asyncio.run(
+            run_load_test(url, rate, duration, connections, mix, timeout, seed)
+        )
+    except (RuntimeError, ValueError) as exc:
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(1) from None
+    typer.echo(report.format())
 
 
+@app.command()
+def seed(
+    count: Annotated[int, typer.Argument(help="Number of items to generate")],
+    seed: Annotated[int, typer.Option(help="Random seed of the catalog")] = 0,
+) -> None:
+    """Fill the configured item store with a generated catalog."""
+    started = time.perf_counter()
+    try:
+        added = asyncio.run(seed_item_store(count, seed))
+    except (RuntimeError, ValueError) as exc:
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(1) from None
+    typer.echo(f"Added {added} items in {time.perf_counter() - started:.1f}s")
+{% endif %}
+
 if __name__ == "__main__":
     app()
 
 {% elif cookiecutter.command_line_interface == "Click" -%}
+{% if cookiecutter.project_type != "cli" -%}
+import asyncio
+import time
+from typing import Optional
+
+{% endif -%}
 import click
 
 from {{cookiecutter.project_slug}} import __version__
+{%- if cookiecutter.project_type != "cli" %}
+from {{cookiecutter.project_slug}}.loadtest import DEFAULT_MIX, run_load_test
+from {{cookiecutter.project_slug}}.services.item_service import seed_item_store
+{%- endif %}
 
 
 @click.group()
@@ -73,17 +140,67 @@ def hello(name: str, count: int) -> None:
     """Say hello to someone."""
     for _ in range(count):
         click.echo(f"Hello {name}!")
+{% if cookiecutter.project_type != "cli" %}
+
+@main.command()
+@click.option("--url", default=None, help="Base URL of a running server (default: in-process app).")
+@click.option("--rate", default=100.0, help="Requests started per second.")
+@click.option("--duration", default=10.0, help="Seconds to send requests for.")
+@click.option("--connections", default=64, help="HTTP connection pool size.")
+@click.option("--mix", default=DEFAULT_MIX, help="Request mix as operation=weight pairs.")
+@click.option("--timeout", default=10.0, help="Seconds before a request fails.")
+@click.option("--seed", type=int, default=None, help="Random seed for repeatable runs.")
+def loadtest(
+    url: Optional[str],
+    rate: float,
+    duration: float,
+    connections: int,
+    mix: str,
+    timeout: float,
+    seed: Optional[int],
+) -> None:
+    """Load the API at a fixed request rate and report latency percentiles."""
+    try:
+        report = asyncio.run(
+            run_load_test(url, rate, duration, connections, mix, timeout, seed)
+        )
+    except (RuntimeError, ValueError) as exc:
+        raise click.ClickException(str(exc)) from None
+    click.echo(report.format())
 
 
+@main.command()
+@click.argument("count", type=int)
+@click.option("--seed", default=0, help="Random seed of the catalog.")
+def seed(count: int, seed: int) -> None:
+    """Fill the configured item store with a generated catalog."""
+    started = time.perf_counter()
+    try:
+        added = asyncio.run(seed_item_store(count, seed))
+    except (RuntimeError, ValueError) as exc:
+        raise click.ClickException(str(exc)) from None
+    click.echo(f"Added {added} items in {time.perf_counter() - started:.1f}s")
+{% endif %}
+
 if __name__ == "__main__":
     main()
 
 {% elif cookiecutter.command_line_interface == "argparse" -%}
 import argparse
+{% if cookiecutter.project_type != "cli" -%}
+import asyncio
+{% endif -%}
 import sys
+{% if cookiecutter.project_type != "cli" -%}
+import time
+{% endif -%}
 from typing import Sequence
 
 from {{cookiecutter.project_slug}} import __version__
+{%- if cookiecutter.project_type != "cli" %}
+from {{cookiecutter.project_slug}}.loadtest import DEFAULT_MIX, run_load_test
+from {{cookiecutter.project_slug}}.services.item_service import seed_item_store
+{%- endif %}
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -104,7 +221,38 @@ def create_parser() -> argparse.ArgumentParser:
     hello_parser = subparsers.add_parser("hello", help="Say hello to someone")
     hello_parser.add_argument("name", nargs="?", default="World", help="Name to greet")
     hello_parser.add_argument("--count", type=int, default=1, help="Number of greetings")
+    {% if cookiecutter.project_type != "cli" %}
+    # Load test command
+    loadtest_parser = subparsers.add_parser(
+        "loadtest", help="Load the API at a fixed request rate and report latency percentiles"
+    )
+    loadtest_parser.add_argument(
+        "--url", help="Base URL of a running server (default: in-process app)"
+    )
+    loadtest_parser.add_argument(
+        "--rate", type=float, default=100.0, help="Requests started per second"
+    )
+    loadtest_parser.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds to send requests for"
+    )
+    loadtest_parser.add_argument(
+        "--connections", type=int, default=64, help="HTTP connection pool size"
+    )
+    loadtest_parser.add_argument(
+        "--mix", default=DEFAULT_MIX, help="Request mix as operation=weight pairs"
+    )
+    loadtest_parser.add_argument(
+        "--timeout", type=float, default=10.0, help="Seconds before a request fails"
+    )
+    loadtest_parser.add_argument("--seed", type=int, help="Random seed for repeatable runs")
     
+    # Seed command
+    seed_parser = subparsers.add_parser(
+        "seed", help="Fill the configured item store with a generated catalog"
+    )
+    seed_parser.add_argument("count", type=int, help="Number of items to generate")
+    seed_parser.add_argument("--seed", type=int, default=0, help="Random seed of the catalog")
+    {% endif %}
     return parser
 
 
@@ -112,7 +260,40 @@ def cmd_hello(args: argparse.Namespace) -> None:
     """Say hello to someone."""
     for _ in range(args.count):
         print(f"Hello {args.name}!")
+{% if cookiecutter.project_type != "cli" %}
 
+def cmd_loadtest(args: argparse.Namespace) -> int:
+    """Load the API at a fixed request rate and report latency percentiles."""
+    try:
+        report = asyncio.run(
+            run_load_test(
+                args.url,
+                args.rate,
+                args.duration,
+                args.connections,
+                args.mix,
+                args.timeout,
+                args.seed,
+            )
+        )
+    except (RuntimeError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(report.format())
+    return 0
+
+
+def cmd_seed(args: argparse.Namespace) -> int:
+    """Fill the configured item store with a generated catalog."""
+    started = time.perf_counter()
+    try:
+        added = asyncio.run(seed_item_store(args.count, args.seed))
+    except (RuntimeError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(f"Added {added} items in {time.perf_counter() - started:.1f}s")
+    return 0
+{% endif %}
 
 def main(argv: Sequence[str] | None = None) -> int:
     """Main entry point."""
@@ -125,6 +306,12 @@ def main(argv: Sequence[str] | None = None) -> int:
     
     if args.command == "hello":
         cmd_hello(args)
+    {%- if cookiecutter.project_type != "cli" %}
+    elif args.command == "loadtest":
+        return cmd_loadtest(args)
+    elif args.command == "seed":
+        return cmd_seed(args)
+    {%- endif %}
     
     return 0
 
@@ -0,0 +1,234 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Response compression middleware (gzip, and zstd when available)."""
+
+from __future__ import annotations
+
+import zlib
+from collections.abc import Callable, Iterable
+from typing import Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+
+    HAVE_ZSTD = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_ZSTD = False
+
+
+class _Encoder(Protocol):
+    """Incremental compressor for one response body."""
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        """Compress a chunk, flushing it to the output if requested."""
+        ...
+
+    def finish(self) -> bytes:
+        """Return the remaining output and end the stream."""
+        ...
+
+
+class _GzipEncoder:
+    """gzip encoder built on zlib."""
+
+    def __init__(self, level: int) -> None:
+        """Start a gzip stream (wbits 31 adds the gzip header and trailer)."""
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        """Compress a chunk, flushing it to the output if requested."""
+        output = self._compressor.compress(data)
+        if flush:
+            output += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return output
+
+    def finish(self) -> bytes:
+        """Return the remaining output and end the stream."""
+        return self._compressor.flush()
+
+
+class _ZstdEncoder:
+    """zstd encoder built on the optional zstandard package."""
+
+    def __init__(self, level: int) -> None:
+        """Start a zstd frame."""
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        """Compress a chunk, flushing it to the output if requested."""
+        output = self._compressor.compress(data)
+        if flush:
+            output += self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return output
+
+    def finish(self) -> bytes:
+        """Return the remaining output and end the frame."""
+        return self._compressor.flush()
+
+
+def _accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into codings and their q-values."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies the client accepts in a compressed encoding.
+
+    zstd is preferred when the zstandard package is installed and the client
+    accepts it, gzip otherwise. Complete bodies smaller than minimum_size are
+    sent as-is. Streaming bodies are compressed chunk by chunk, flushing each
+    chunk so clients receive data as soon as it is produced. Excluded paths
+    (health probes) bypass the middleware entirely.
+
+    A strong ETag on a compressed response is made weak: the compressed
+    bytes differ from the identity body the tag was computed for, and weak
+    comparison (If-None-Match) still matches it against the original.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        exclude_paths: Iterable[str] = (),
+    ) -> None:
+        """
+        Wrap an ASGI application.
+
+        Args:
+            app: The application to wrap
+            minimum_size: Smallest complete body, in bytes, worth compressing
+            gzip_level: gzip compression level (1-9)
+            zstd_level: zstd compression level (1-22)
+            exclude_paths: Request paths that are never compressed
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        encoding = self._negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(
+            send, encoding, lambda: self._encoder(encoding), self.minimum_size
+        )
+        await self.app(scope, receive, responder.send)
+
+    def _negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Pick the content coding to use, or None to send identity."""
+        if not accept_encoding:
+            return None
+        accepted = _accepted_encodings(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        if HAVE_ZSTD and accepted.get("zstd", wildcard) > 0:
+            return "zstd"
+        if accepted.get("gzip", wildcard) > 0:
+            return "gzip"
+        return None
+
+    def _encoder(self, encoding: str) -> _Encoder:
+        """Create an encoder for a negotiated coding."""
+        if encoding == "zstd":
+            return _ZstdEncoder(self.zstd_level)
+        return _GzipEncoder(self.gzip_level)
+
+
+class _CompressionResponder:
+    """Rewrites the messages of one response into a compressed body."""
+
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        make_encoder: Callable[[], _Encoder],
+        minimum_size: int,
+    ) -> None:
+        """Prepare to intercept the response messages."""
+        self._send = send
+        self._encoding = encoding
+        self._make_encoder = make_encoder
+        self._minimum_size = minimum_size
+        self._start: Optional[Message] = None
+        self._encoder: Optional[_Encoder] = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        """Intercept a response message."""
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk decides whether to compress
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = Headers(raw=start["headers"])
+            if "content-encoding" in headers or (
+                not more_body and len(body) < self._minimum_size
+            ):
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self._encoder = self._make_encoder()
+            mutable = MutableHeaders(raw=start["headers"])
+            mutable["Content-Encoding"] = self._encoding
+            mutable.add_vary_header("Accept-Encoding")
+            etag = mutable.get("ETag")
+            if etag is not None and not etag.startswith("W/"):
+                mutable["ETag"] = f"W/{etag}"
+            if more_body:
+                del mutable["Content-Length"]
+            else:
+                body = (
+                    self._encoder.compress(body, flush=False) + self._encoder.finish()
+                )
+                mutable["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            await self._send(start)
+
+        assert self._encoder is not None
+        if more_body:
+            body = self._encoder.compress(body, flush=True)
+            if body:
+                await self._send(
+                    {"type": "http.response.body", "body": body, "more_body": True}
+                )
+        else:
+            body = self._encoder.compress(body, flush=False) + self._encoder.finish()
+            await self._send({"type": "http.response.body", "body": body})
+{% endif -%}
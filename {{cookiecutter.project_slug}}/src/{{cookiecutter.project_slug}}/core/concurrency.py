@@ -0,0 +1,277 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Adaptive concurrency limiting and load shedding for HTTP requests."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import math
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from {{cookiecutter.project_slug}}.core.metrics import Counter, Gauge
+
+CONCURRENCY_LIMIT = Gauge(
+    "concurrency_limit",
+    "Current adaptive concurrency limit, by route group",
+    ("group",),
+)
+CONCURRENCY_IN_FLIGHT = Gauge(
+    "concurrency_in_flight",
+    "Requests holding a concurrency slot, by route group",
+    ("group",),
+)
+CONCURRENCY_REJECTED = Counter(
+    "concurrency_rejected_total",
+    "Requests shed by the concurrency limiter, by route group and reason",
+    ("group", "reason"),
+)
+
+# Methods handled by the "read" route group; all others are "write"
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class AIMDLimit:
+    """
+    Additive-increase, multiplicative-decrease concurrency limit.
+
+    A request slower than the latency target signals overload and shrinks
+    the limit by backoff_ratio, at most once per latency_target seconds:
+    the other slow requests of that window started under the old limit and
+    say nothing about the new one. A fast request made while the limit was
+    at least half used grows it by one. The limit stays within
+    [min_limit, max_limit] and starts at max_limit, so it only drops once
+    latency shows the service is saturated.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        latency_target: float = 0.5,
+        backoff_ratio: float = 0.9,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Create the limit.
+
+        Args:
+            max_limit: Upper bound and initial value of the limit
+            min_limit: Lower bound of the limit
+            latency_target: Seconds above which a request signals overload
+            backoff_ratio: Factor applied to the limit on overload
+            clock: Time source for spacing out decreases
+        """
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.latency_target = latency_target
+        self.backoff_ratio = backoff_ratio
+        self._clock = clock
+        self._limit = float(max_limit)
+        self._last_decrease = -math.inf
+
+    @property
+    def limit(self) -> int:
+        """Current limit as a whole number of requests."""
+        return int(self._limit)
+
+    def on_sample(self, latency: float, in_flight: int) -> None:
+        """
+        Update the limit from a completed request.
+
+        Args:
+            latency: Seconds until the request's response started
+            in_flight: Requests in flight when it started, itself included
+        """
+        if latency > self.latency_target:
+            now = self._clock()
+            if now - self._last_decrease >= self.latency_target:
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                self._last_decrease = now
+        elif in_flight * 2 >= self._limit:
+            self._limit = min(self.max_limit, self._limit + 1)
+
+
+class ConcurrencyLimiter:
+    """
+    Slots for one route group, with a bounded FIFO queue of waiting requests.
+
+    Requests beyond the limit wait for a slot for at most max_wait seconds;
+    when max_queue requests are already waiting, new ones are rejected at
+    once. Freed slots are handed directly to the oldest waiter.
+    """
+
+    def __init__(
+        self, limit: AIMDLimit, max_queue: int = 100, max_wait: float = 1.0
+    ) -> None:
+        """
+        Create the limiter.
+
+        Args:
+            limit: Adaptive limit on concurrent requests
+            max_queue: Maximum number of requests waiting for a slot
+            max_wait: Seconds a request may wait for a slot
+        """
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    async def acquire(self) -> str:
+        """
+        Take a slot, waiting for one if needed.
+
+        Returns:
+            "" when a slot was taken, otherwise the reason for rejection
+            ("queue_full" or "timeout")
+        """
+        if self.in_flight < self.limit.limit and not self._waiters:
+            self.in_flight += 1
+            return ""
+        if len(self._waiters) >= self.max_queue:
+            return "queue_full"
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # A granted slot is counted in in_flight by release()
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+            return ""
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Granted just as the deadline passed: keep the slot
+                return ""
+            waiter.cancel()
+            return "timeout"
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            waiter.cancel()
+            raise
+        finally:
+            with contextlib.suppress(ValueError):
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """Free a slot, handing it to the oldest waiter if any."""
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.limit.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    Shed load with per-route-group adaptive concurrency limits.
+
+    Requests are grouped into "read" (GET, HEAD, OPTIONS) and "write" (all
+    other methods), each with its own limit and wait queue, so a burst of
+    writes cannot starve reads. Requests that cannot get a slot in time get
+    503 Service Unavailable with a Retry-After header. Paths in
+    exempt_paths (health probes, metrics) are never limited. Latency is
+    measured up to the start of the response, so streaming a large body
+    (e.g. an export) holds a slot but does not count as overload.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_limits: Mapping[str, int],
+        min_limit: int = 1,
+        latency_target: float = 0.5,
+        max_queue: int = 100,
+        max_wait: float = 1.0,
+        exempt_paths: Iterable[str] = (),
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Wrap an ASGI application.
+
+        Args:
+            app: ASGI application
+            max_limits: Maximum concurrent requests per route group
+                ("read" and "write"); a group without one is not limited
+            min_limit: Lower bound of the adaptive limits
+            latency_target: Seconds above which a request signals overload
+            max_queue: Maximum number of waiting requests per group
+            max_wait: Seconds a request may wait for a slot
+            exempt_paths: Paths that are never limited
+            clock: Time source for request latency
+        """
+        self.app = app
+        self.exempt_paths = frozenset(exempt_paths)
+        self.retry_after = str(max(1, math.ceil(max_wait)))
+        self._clock = clock
+        self.limiters = {
+            group: ConcurrencyLimiter(
+                AIMDLimit(max_limit, min_limit, latency_target, clock=clock),
+                max_queue,
+                max_wait,
+            )
+            for group, max_limit in max_limits.items()
+        }
+        for group, limiter in self.limiters.items():
+            CONCURRENCY_LIMIT.set(limiter.limit.limit, (group,))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        group = "read" if scope["method"] in READ_METHODS else "write"
+        limiter = self.limiters.get(group)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await limiter.acquire()
+        if reason:
+            CONCURRENCY_REJECTED.inc((group, reason))
+            await self._reject(send)
+            return
+
+        in_flight = limiter.in_flight
+        CONCURRENCY_IN_FLIGHT.set(in_flight, (group,))
+        start = self._clock()
+        responded: Optional[float] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal responded
+            if message["type"] == "http.response.start":
+                responded = self._clock()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            latency = (responded if responded is not None else self._clock()) - start
+            limiter.limit.on_sample(latency, in_flight)
+            limiter.release()
+            CONCURRENCY_IN_FLIGHT.set(limiter.in_flight, (group,))
+            CONCURRENCY_LIMIT.set(limiter.limit.limit, (group,))
+
+    async def _reject(self, send: Send) -> None:
+        """Send a 503 response asking the client to retry later."""
+        body = json.dumps({"detail": "Server is overloaded, retry later"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", self.retry_after.encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+{% endif -%}
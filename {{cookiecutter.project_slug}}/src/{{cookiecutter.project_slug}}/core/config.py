@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+from typing import Optional
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,42 +23,330 @@ class Settings(BaseSettings):
     app_name: str = "{{cookiecutter.project_name}}"
     debug: bool = Field(default=False, description="Enable debug mode")
     environment: str = Field(
-        default="development", 
-        description="Environment (development, staging, production)"
+        default="development",
+        description="Environment (development, staging, production)",
     )
 
     # Server settings
     host: str = Field(default="0.0.0.0", description="Host to bind the server")
-    port: int = Field(default=8000, description="Port to bind the server", ge=1, le=65535)
+    port: int = Field(
+        default=8000, description="Port to bind the server", ge=1, le=65535
+    )
+    server_workers: int = Field(
+        default=0,
+        description="Worker processes of the production server (0 = one per CPU)",
+        ge=0,
+    )
+    server_loop: str = Field(
+        default="auto",
+        description="Event loop (auto picks uvloop when installed)",
+        pattern="^(auto|asyncio|uvloop)$",
+    )
+    server_http: str = Field(
+        default="auto",
+        description="HTTP protocol implementation (auto picks httptools when installed)",
+        pattern="^(auto|h11|httptools)$",
+    )
+    server_backlog: int = Field(
+        default=2048,
+        description="Maximum number of pending connections on the listening socket",
+        ge=1,
+    )
+    server_keep_alive: int = Field(
+        default=5,
+        description="Seconds an idle keep-alive connection is kept open",
+        ge=1,
+    )
+    server_limit_concurrency: Optional[int] = Field(
+        default=None,
+        description="Maximum concurrent connections per worker before it responds 503",
+        ge=1,
+    )
+    server_max_requests: int = Field(
+        default=0,
+        description="Requests a worker serves before it is gracefully replaced (0 = never)",
+        ge=0,
+    )
+    server_max_requests_jitter: int = Field(
+        default=0,
+        description="Random extra requests per worker, so workers do not restart together",
+        ge=0,
+    )
+    server_graceful_timeout: float = Field(
+        default=30.0,
+        description="Seconds workers get to finish in-flight requests on shutdown",
+        gt=0,
+    )
 
-{% if cookiecutter.project_type != "cli" -%}
-    # Logging settings
+{% if cookiecutter.project_type != "cli" %}    # Logging settings
     log_level: str = Field(
-        default="INFO", 
+        default="INFO",
         description="Logging level",
-        pattern="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$"
+        pattern="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$",
     )
     log_format: str = Field(
         default="console" if debug else "json",
         description="Log format (json or console)",
-        pattern="^(json|console)$"
+        pattern="^(json|console)$",
+    )
+    log_mode: str = Field(
+        default="sync",
+        description="Write logs inline (sync) or from a background thread (queue)",
+        pattern="^(sync|queue)$",
+    )
+    log_queue_size: int = Field(
+        default=10_000,
+        description="Maximum number of pending log records in queue mode",
+        ge=1,
+    )
+    log_queue_policy: str = Field(
+        default="drop",
+        description="What to do when the log queue is full (drop or block)",
+        pattern="^(drop|block)$",
+    )
+    log_queue_block_timeout: float = Field(
+        default=1.0,
+        description="Seconds to wait for room in a full log queue before dropping",
+        ge=0,
+    )
+    log_sample_rates: dict[str, float] = Field(
+        default={},
+        description="Fraction of events kept per event name ('*' for any other); errors are always kept",
+    )
+    log_rate_limits: dict[str, float] = Field(
+        default={},
+        description="Maximum events per second per event name ('*' for any other); errors are always kept",
+    )
+    log_suppressed_summary_interval: float = Field(
+        default=60.0,
+        description="Minimum seconds between summaries of sampled or rate-limited log events",
+        gt=0,
     )
 
-{% endif -%}
-    # API settings
+{% endif %}    # API settings
     api_v1_prefix: str = Field(default="/api/v1", description="API v1 prefix")
-    
+
     # CORS settings
     cors_origins: list[str] = Field(
-        default=["*"] if debug else [],
-        description="Allowed CORS origins"
+        default=["*"] if debug else [], description="Allowed CORS origins"
+    )
+
+    # Storage settings
+    item_store: str = Field(
+        default="memory",
+        description="Item storage backend (memory, sqlite or shared)",
+        pattern="^(memory|sqlite|shared)$",
+    )
+    sqlite_path: str = Field(
+        default="items.db",
+        description="SQLite database file used by the sqlite item store",
+    )
+    sqlite_pool_size: int = Field(
+        default=4, description="Maximum number of pooled SQLite connections", ge=1
+    )
+    shared_store_path: str = Field(
+        default="items.log",
+        description="Memory-mapped log file used by the shared item store",
+    )
+    wal_dir: str = Field(
+        default="",
+        description=(
+            "Directory for the write-ahead log and snapshots that make the "
+            "memory item store durable (empty to keep items in memory only)"
+        ),
+    )
+    wal_fsync_interval: float = Field(
+        default=0.05,
+        description="Seconds between group commits of the write-ahead log",
+        ge=0,
+    )
+    wal_snapshot_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Write-ahead log segment size that triggers a snapshot",
+        ge=1,
+    )
+    sample_data_enabled: bool = Field(
+        default=True,
+        description="Add a few sample items when the item store starts empty",
+    )
+    seed_items: int = Field(
+        default=0,
+        description="Generated items to add when the item store starts empty (for benchmarks)",
+        ge=0,
+        le=1 << 24,
+    )
+    seed_items_seed: int = Field(
+        default=0, description="Random seed of the generated items"
+    )
+
+    item_cache_enabled: bool = Field(
+        default=False,
+        description="Cache item reads in process (worthwhile with the sqlite store)",
+    )
+    item_cache_max_items: int = Field(
+        default=10_000, description="Maximum number of individually cached items", ge=1
+    )
+    item_cache_max_queries: int = Field(
+        default=1_000,
+        description="Maximum number of cached listing and search pages",
+        ge=1,
+    )
+    item_cache_ttl: float = Field(
+        default=30.0, description="Seconds a cached item or page stays valid", gt=0
+    )
+
+    # Bulk endpoint settings
+    bulk_max_records: int = Field(
+        default=100_000,
+        description="Maximum number of entries in a bulk request body",
+        ge=1,
     )
-    
+    bulk_max_line_bytes: int = Field(
+        default=65_536,
+        description="Maximum length in bytes of one NDJSON line in a bulk request body",
+        ge=1,
+    )
+
+    # Metrics settings
+    metrics_enabled: bool = Field(
+        default=True, description="Record request metrics and serve them at /metrics"
+    )
+
+    # Profiler settings
+    profiler_enabled: bool = Field(
+        default=False, description="Allow sampling profiles of individual requests"
+    )
+    profiler_token: str = Field(
+        default="",
+        description="Secret an X-Profile request header must carry to profile the request",
+    )
+    profiler_sample_rate: float = Field(
+        default=0.0, description="Fraction of requests profiled at random", ge=0, le=1
+    )
+    profiler_interval: float = Field(
+        default=0.005,
+        description="Seconds between stack samples of a profiled request",
+        gt=0,
+    )
+    profiler_dir: str = Field(
+        default="profiles", description="Directory request profiles are written to"
+    )
+    profiler_format: str = Field(
+        default="collapsed",
+        description="Profile file format (collapsed stacks or speedscope JSON)",
+        pattern="^(collapsed|speedscope)$",
+    )
+
+    # Compression settings
+    compression_enabled: bool = Field(
+        default=True,
+        description="Compress responses for clients that accept gzip or zstd",
+    )
+    compression_minimum_size: int = Field(
+        default=1024,
+        description="Smallest response body in bytes that is compressed",
+        ge=0,
+    )
+    compression_gzip_level: int = Field(
+        default=6, description="gzip compression level", ge=1, le=9
+    )
+    compression_zstd_level: int = Field(
+        default=3,
+        description="zstd compression level (requires the zstandard package)",
+        ge=1,
+        le=22,
+    )
+    compression_exclude_paths: list[str] = Field(
+        default=["/healthz", "/livez", "/readyz", "/health"],
+        description="Paths whose responses are never compressed",
+    )
+
+    # Concurrency limiting settings
+    concurrency_limit_enabled: bool = Field(
+        default=True,
+        description="Shed load with adaptive per-route-group concurrency limits",
+    )
+    concurrency_max_limits: dict[str, int] = Field(
+        default={"read": 200, "write": 50},
+        description="Maximum concurrent requests per route group (read or write)",
+    )
+    concurrency_min_limit: int = Field(
+        default=4, description="Lower bound of the adaptive concurrency limits", ge=1
+    )
+    concurrency_latency_target: float = Field(
+        default=0.5,
+        description="Seconds to the start of a response above which the limits back off, at most once per that many seconds",
+        gt=0,
+    )
+    concurrency_max_queue: int = Field(
+        default=100,
+        description="Maximum number of requests waiting for a slot per route group",
+        ge=0,
+    )
+    concurrency_max_wait: float = Field(
+        default=1.0,
+        description="Seconds a request may wait for a slot before it gets a 503",
+        ge=0,
+    )
+    concurrency_exempt_paths: list[str] = Field(
+        default=["/metrics"],
+        description="Paths never limited, in addition to the health endpoints",
+    )
+
+    # Rate limiting settings
+    rate_limit_enabled: bool = Field(
+        default=False,
+        description="Enforce per-client token bucket rate limits (behind a proxy, also set rate_limit_trust_forwarded_for)",
+    )
+    rate_limit_policies: dict[str, str] = Field(
+        default={"read": "600/minute", "write": "120/minute"},
+        description="Rate per client for the list/search (read) and write endpoints, e.g. '100/minute'",
+    )
+    rate_limit_api_key_header: str = Field(
+        default="X-API-Key",
+        description="Header identifying a client by API key instead of IP address",
+    )
+    rate_limit_api_keys: list[str] = Field(
+        default=[],
+        description="Known API keys, each with its own buckets; other keys are limited by IP address",
+    )
+    rate_limit_trust_forwarded_for: bool = Field(
+        default=False,
+        description="Identify clients by X-Forwarded-For (only behind a trusted proxy)",
+    )
+
     # Health check settings
     health_check_grace_period: int = Field(
-        default=30,
-        description="Grace period for health checks in seconds",
-        ge=0
+        default=30, description="Grace period for health checks in seconds", ge=0
+    )
+    readiness_check_interval: float = Field(
+        default=10.0,
+        description="Seconds between background runs of each readiness check",
+        gt=0,
+    )
+    readiness_check_timeout: float = Field(
+        default=2.0,
+        description="Seconds a readiness check may take before it counts as failed",
+        gt=0,
+    )
+
+    # Event loop lag monitoring
+    loop_monitor_enabled: bool = Field(
+        default=True,
+        description="Measure event loop lag and log the stack of callbacks that block it",
+    )
+    loop_monitor_interval: float = Field(
+        default=0.1, description="Seconds between event loop lag measurements", gt=0
+    )
+    loop_monitor_threshold: float = Field(
+        default=0.1,
+        description="Event loop lag in seconds beyond which the blocking callback is logged",
+        gt=0,
+    )
+    loop_monitor_window: int = Field(
+        default=600,
+        description="Number of recent lag measurements the health endpoints report on",
+        ge=1,
     )
 
 
@@ -0,0 +1,149 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Sampling and rate limiting of high-volume structlog events."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Any, Optional
+
+import structlog
+
+from {{cookiecutter.project_slug}}.core.metrics import Counter
+
+# Log methods whose events are never sampled or rate limited
+NEVER_DROPPED = frozenset({"error", "err", "exception", "critical", "fatal"})
+
+# Event name of the periodic summaries of suppressed events
+SUPPRESSED_EVENT = "Log events suppressed"
+
+# Rule key applying to every event name without a rule of its own
+DEFAULT_RULE = "*"
+
+LOG_EVENTS_SUPPRESSED = Counter(
+    "log_events_suppressed_total",
+    "Log events dropped by sampling or rate limiting",
+)
+
+
+class LogSampler:
+    """
+    structlog processor that keeps a fraction of some events and caps others.
+
+    Rules are keyed by event name, with "*" as the fallback for all other
+    names. A sample rate of 0.1 keeps exactly every tenth event; a rate limit
+    of 5 lets through up to 5 events per second, with bursts of up to 5,
+    using a token bucket. Events at error level or above always pass.
+
+    Dropped events are counted per name and reported in a "Log events
+    suppressed" warning at most once per summary interval, emitted when the
+    next event is logged after the interval has passed (or on flush()).
+
+    Place it early in the processor chain, so dropped events cost no
+    timestamping or rendering.
+    """
+
+    def __init__(
+        self,
+        sample_rates: Optional[Mapping[str, float]] = None,
+        rate_limits: Optional[Mapping[str, float]] = None,
+        summary_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create the sampler.
+
+        Args:
+            sample_rates: Fraction of events kept (0-1) per event name
+            rate_limits: Maximum events per second per event name
+            summary_interval: Minimum seconds between suppression summaries
+            clock: Monotonic time source
+        """
+        self._sample_rates = dict(sample_rates or {})
+        self._rate_limits = dict(rate_limits or {})
+        self._summary_interval = summary_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Per event name: accumulated sampling credit
+        self._credit: dict[str, float] = {}
+        # Per event name: [tokens, last refill time]
+        self._buckets: dict[str, list[float]] = {}
+        self._suppressed: dict[str, int] = {}
+        self._last_summary = clock()
+        self._logger = structlog.get_logger(__name__)
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Pass the event on, or raise DropEvent to suppress it."""
+        if method_name in NEVER_DROPPED:
+            return event_dict
+        event = str(event_dict.get("event", ""))
+        if event == SUPPRESSED_EVENT:
+            return event_dict
+
+        now = self._clock()
+        with self._lock:
+            keep = self._sample(event) and self._take_token(event, now)
+            if not keep:
+                self._suppressed[event] = self._suppressed.get(event, 0) + 1
+                LOG_EVENTS_SUPPRESSED.inc()
+            summary = self._due_summary(now)
+        if summary:
+            self._emit(summary)
+        if not keep:
+            raise structlog.DropEvent
+        return event_dict
+
+    def flush(self) -> None:
+        """Emit a summary of events suppressed since the last one, if any."""
+        with self._lock:
+            summary, self._suppressed = self._suppressed, {}
+            self._last_summary = self._clock()
+        if summary:
+            self._emit(summary)
+
+    def _sample(self, event: str) -> bool:
+        """Whether the event is kept by its sample rate."""
+        rate = self._sample_rates.get(event, self._sample_rates.get(DEFAULT_RULE))
+        if rate is None or rate >= 1:
+            return True
+        credit = self._credit.get(event, 0.0) + rate
+        if credit >= 1:
+            self._credit[event] = credit - 1
+            return True
+        self._credit[event] = credit
+        return False
+
+    def _take_token(self, event: str, now: float) -> bool:
+        """Whether the event fits in its rate limit, consuming a token if so."""
+        limit = self._rate_limits.get(event, self._rate_limits.get(DEFAULT_RULE))
+        if limit is None:
+            return True
+        capacity = max(limit, 1.0)
+        bucket = self._buckets.get(event)
+        if bucket is None:
+            bucket = self._buckets[event] = [capacity, now]
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * limit)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return True
+        bucket[0] = tokens
+        return False
+
+    def _due_summary(self, now: float) -> dict[str, int]:
+        """Take the suppressed counts if a summary is due, else return nothing."""
+        if not self._suppressed or now - self._last_summary < self._summary_interval:
+            return {}
+        summary, self._suppressed = self._suppressed, {}
+        self._last_summary = now
+        return summary
+
+    def _emit(self, summary: dict[str, int]) -> None:
+        """Log a summary of suppressed events."""
+        self._logger.warning(
+            SUPPRESSED_EVENT, suppressed=summary, total=sum(summary.values())
+        )
+{% endif -%}
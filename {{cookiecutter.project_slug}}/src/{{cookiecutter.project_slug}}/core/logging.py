@@ -4,38 +4,153 @@
 from __future__ import annotations
 
 import logging
+import queue
 import sys
-from typing import Any
+from collections.abc import Mapping
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
 
 import structlog
-{% if cookiecutter.project_type != "cli" -%}
 from asgi_correlation_id.context import correlation_id
-{% endif -%}
 
+from {{cookiecutter.project_slug}}.core.log_sampling import LogSampler
+from {{cookiecutter.project_slug}}.core.metrics import Counter
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full",
+)
 
-def add_correlation_id(logger: Any, method_name: str, event_dict: dict[str, Any]) -> dict[str, Any]:
+
+def add_correlation_id(
+    logger: Any, method_name: str, event_dict: dict[str, Any]
+) -> dict[str, Any]:
     """Add correlation ID to log records."""
-{% if cookiecutter.project_type != "cli" -%}
     if request_id := correlation_id.get(None):
         event_dict["request_id"] = request_id
-{% endif -%}
     return event_dict
 
 
-def setup_logging(debug: bool = False, log_format: str = "console") -> None:
-    """Configure structured logging with structlog."""
-    
-    # Configure structlog
-    processors: list[Any] = [
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue, with a policy for when it is full.
+
+    With the "drop" policy a record that does not fit is discarded at once,
+    so logging never waits on the consumer. With "block" the caller waits up
+    to block_timeout seconds for room before the record is dropped. Dropped
+    records are counted in ``dropped`` and in the log_records_dropped_total
+    metric.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue[Any],
+        policy: str = "drop",
+        block_timeout: float = 1.0,
+    ) -> None:
+        """
+        Create the handler.
+
+        Args:
+            log_queue: Bounded queue drained by a QueueListener
+            policy: "drop" or "block"
+            block_timeout: Seconds to wait for room with the "block" policy
+        """
+        super().__init__(log_queue)
+        # Typed reference; QueueHandler.queue is declared as a minimal protocol
+        self._log_queue = log_queue
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue, dropping it if there is no room."""
+        try:
+            if self.policy == "block":
+                self._log_queue.put(record, timeout=self.block_timeout)
+            else:
+                self._log_queue.put_nowait(record)
+        except queue.Full:
+            # Called under the handler lock, so the counters cannot race
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+class _DrainingQueueListener(QueueListener):
+    """QueueListener whose stop() waits for room in a full bounded queue."""
+
+    # Set by QueueListener but missing from its type stubs
+    _sentinel: Any
+
+    def __init__(self, log_queue: queue.Queue[Any], *handlers: logging.Handler) -> None:
+        """Create a listener draining log_queue into handlers."""
+        super().__init__(log_queue, *handlers)
+        self._log_queue = log_queue
+
+    def enqueue_sentinel(self) -> None:
+        """Queue the stop sentinel behind the records still pending."""
+        self._log_queue.put(self._sentinel)
+
+
+# Queue logging state, set while the background listener is running
+_queue_handler: Optional[BoundedQueueHandler] = None
+_queue_listener: Optional[QueueListener] = None
+# Sampler in the processor chain, when sampling or rate limits are configured
+_sampler: Optional[LogSampler] = None
+
+
+def setup_logging(
+    debug: bool = False,
+    log_format: str = "console",
+    mode: str = "sync",
+    queue_size: int = 10_000,
+    queue_policy: str = "drop",
+    queue_block_timeout: float = 1.0,
+    sample_rates: Optional[Mapping[str, float]] = None,
+    rate_limits: Optional[Mapping[str, float]] = None,
+    suppressed_summary_interval: float = 60.0,
+) -> None:
+    """
+    Configure structured logging with structlog.
+
+    In "sync" mode records are written to stdout by the thread that logs
+    them. In "queue" mode they are put on a bounded queue and written by a
+    background thread, so a slow stdout consumer never stalls the event
+    loop; call shutdown_logging() to flush the queue on exit.
+
+    Events can be sampled or rate limited by event name to keep hot paths
+    from flooding the logs; errors are never dropped, and the number of
+    suppressed events is logged periodically.
+
+    Args:
+        debug: Log at DEBUG level with console output
+        log_format: "console" or "json"
+        mode: "sync" or "queue"
+        queue_size: Maximum number of queued records in "queue" mode
+        queue_policy: "drop" or "block" when the queue is full
+        queue_block_timeout: Seconds to wait for room with the "block" policy
+        sample_rates: Fraction of events kept per event name ("*" for others)
+        rate_limits: Maximum events per second per event name ("*" for others)
+        suppressed_summary_interval: Minimum seconds between suppression summaries
+    """
+    global _sampler
+
+    # Configure structlog. Level filtering and sampling come first, so
+    # dropped events are not timestamped or rendered.
+    processors: list[Any] = [structlog.stdlib.filter_by_level]
+    _sampler = None
+    if sample_rates or rate_limits:
+        _sampler = LogSampler(sample_rates, rate_limits, suppressed_summary_interval)
+        processors.append(_sampler)
+    processors += [
         structlog.contextvars.merge_contextvars,
         add_correlation_id,
         structlog.processors.TimeStamper(fmt="ISO"),
-        structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.processors.StackInfoRenderer(),
     ]
-    
+
     if debug or log_format == "console":
         # Console-friendly output for development
         processors.append(structlog.dev.ConsoleRenderer(colors=True))
@@ -53,16 +168,66 @@ def setup_logging(debug: bool = False, log_format: str = "console") -> None:
 
     # Configure standard library logging
     log_level = logging.DEBUG if debug else logging.INFO
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=log_level,
-    )
+    if mode == "queue":
+        _start_queue_logging(log_level, queue_size, queue_policy, queue_block_timeout)
+    else:
+        logging.basicConfig(
+            format="%(message)s",
+            stream=sys.stdout,
+            level=log_level,
+        )
 
     # Set third-party loggers to WARNING to reduce noise
-    logging.getLogger("uvicorn").setLevel(logging.WARNING if not debug else logging.INFO)
-    logging.getLogger("uvicorn.access").setLevel(logging.WARNING if not debug else logging.INFO)
-    logging.getLogger("fastapi").setLevel(logging.WARNING if not debug else logging.INFO)
+    logging.getLogger("uvicorn").setLevel(
+        logging.WARNING if not debug else logging.INFO
+    )
+    logging.getLogger("uvicorn.access").setLevel(
+        logging.WARNING if not debug else logging.INFO
+    )
+    logging.getLogger("fastapi").setLevel(
+        logging.WARNING if not debug else logging.INFO
+    )
+
+
+def _start_queue_logging(
+    log_level: int, queue_size: int, policy: str, block_timeout: float
+) -> None:
+    """Route root logging through a bounded queue drained by a background thread."""
+    global _queue_handler, _queue_listener
+
+    root = logging.getLogger()
+    # Like logging.basicConfig, leave an already configured root logger alone
+    if root.handlers:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    log_queue: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+    _queue_handler = BoundedQueueHandler(log_queue, policy, block_timeout)
+    _queue_listener = _DrainingQueueListener(log_queue, stream_handler)
+    _queue_listener.start()
+    root.addHandler(_queue_handler)
+    root.setLevel(log_level)
+
+
+def shutdown_logging() -> None:
+    """
+    Log any pending suppression summary, then flush and stop the background
+    log writer started in "queue" mode.
+    """
+    global _queue_handler, _queue_listener
+
+    if _sampler is not None:
+        _sampler.flush()
+    if _queue_handler is None or _queue_listener is None:
+        return
+    if _queue_handler.dropped:
+        logger.warning("Log records were dropped", dropped=_queue_handler.dropped)
+    # Stopping drains every queued record before the thread exits
+    _queue_listener.stop()
+    logging.getLogger().removeHandler(_queue_handler)
+    _queue_handler = None
+    _queue_listener = None
 
 
 # Create a logger instance
@@ -0,0 +1,195 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Event loop lag monitor and blocking call detector."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import math
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from types import FrameType
+from typing import Optional
+
+from {{cookiecutter.project_slug}}.core.config import settings
+from {{cookiecutter.project_slug}}.core.logging import logger
+from {{cookiecutter.project_slug}}.core.metrics import Counter, Histogram
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the event loop should run a timer callback and when it does",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total",
+    "Times a callback blocked the event loop for longer than the threshold",
+)
+
+
+@dataclass(frozen=True)
+class LagSummary:
+    """Event loop lag over the recent window, in milliseconds."""
+
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    samples: int
+    blocked_calls: int
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[max(math.ceil(len(ordered) * percent / 100) - 1, 0)]
+
+
+def _loop_stack(frame: Optional[FrameType]) -> str:
+    """
+    Stack of the event loop thread, formatted like a traceback.
+
+    The frames of the event loop itself, down to the callback it is
+    running, are left out.
+    """
+    if frame is None:
+        return ""
+    summary = traceback.extract_stack(frame)
+    start = 0
+    for index, entry in enumerate(summary):
+        # asyncio.events.Handle._run calls every callback, including task steps
+        path = entry.filename.replace("\\", "/")
+        if entry.name == "_run" and path.endswith("asyncio/events.py"):
+            start = index + 1
+    return "".join(traceback.format_list(summary[start:]))
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop scheduling lag and reports callbacks that block it.
+
+    A task sleeps for interval seconds at a time and records how much later
+    than asked it wakes up: the lag every other callback on the loop sees
+    too. Each wake-up is a heartbeat; a watchdog thread that finds the
+    heartbeat more than threshold seconds overdue logs the event loop
+    thread's stack once, while the blocking callback is still running, so
+    the offending code is named. A callback that holds the GIL throughout
+    (e.g. one long C call such as sorting a huge list) is only seen once
+    it releases the GIL.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = 0.1,
+        window: int = 600,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a stopped monitor.
+
+        Args:
+            interval: Seconds between lag measurements
+            threshold: Lag in seconds beyond which the loop counts as blocked
+            window: Number of recent measurements the percentiles cover
+            clock: Monotonic time source
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self._clock = clock
+        self._lags: deque[float] = deque(maxlen=window)
+        self._blocked_calls = 0
+        self._heartbeat = 0.0
+        self._reported = 0.0
+        self._thread_id = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Whether the monitor is running."""
+        return self._task is not None
+
+    def summary(self) -> LagSummary:
+        """Lag percentiles over the recent window."""
+        ordered = sorted(self._lags)
+        if not ordered:
+            return LagSummary(0.0, 0.0, 0.0, 0.0, 0, self._blocked_calls)
+        return LagSummary(
+            p50_ms=round(_percentile(ordered, 50) * 1000, 3),
+            p90_ms=round(_percentile(ordered, 90) * 1000, 3),
+            p99_ms=round(_percentile(ordered, 99) * 1000, 3),
+            max_ms=round(ordered[-1] * 1000, 3),
+            samples=len(ordered),
+            blocked_calls=self._blocked_calls,
+        )
+
+    async def start(self) -> None:
+        """Start measuring on the running event loop."""
+        if self._task is not None:
+            return
+        self._thread_id = threading.get_ident()
+        self._loop = asyncio.get_running_loop()
+        self._heartbeat = self._clock()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._measure_loop(), name="loop-lag-monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop measuring."""
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self._watchdog = None
+
+    async def _measure_loop(self) -> None:
+        """Sleep for the interval and record how late each wake-up is."""
+        while True:
+            await asyncio.sleep(self.interval)
+            now = self._clock()
+            lag = max(now - self._heartbeat - self.interval, 0.0)
+            self._heartbeat = now
+            self._lags.append(lag)
+            EVENT_LOOP_LAG.observe(lag)
+
+    def _watch(self) -> None:
+        """Capture the event loop thread's stack when a heartbeat is overdue."""
+        while not self._stopped.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            lag = self._clock() - heartbeat - self.interval
+            if lag <= self.threshold or heartbeat == self._reported:
+                continue
+            # One report per blocking callback
+            self._reported = heartbeat
+            self._blocked_calls += 1
+            EVENT_LOOP_BLOCKED.inc()
+            task = asyncio.current_task(self._loop)
+            # "stack" is rendered like the stack_info of a log call
+            logger.warning(
+                "Event loop blocked",
+                blocked_for=round(lag, 4),
+                threshold=self.threshold,
+                task=task.get_name() if task is not None else None,
+                stack=_loop_stack(sys._current_frames().get(self._thread_id)),
+            )
+
+
+# Application-wide monitor; main.py starts and stops it
+loop_monitor = LoopLagMonitor(
+    interval=settings.loop_monitor_interval,
+    threshold=settings.loop_monitor_threshold,
+    window=settings.loop_monitor_window,
+)
+{% endif -%}
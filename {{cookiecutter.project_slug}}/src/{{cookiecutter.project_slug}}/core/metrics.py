@@ -0,0 +1,336 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Lightweight Prometheus metrics: counters, gauges, histograms and middleware."""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import math
+import time
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from typing import Any, Optional, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+Labels = tuple[str, ...]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+DEFAULT_SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+class Registry:
+    """
+    Collection of metrics rendered together in the Prometheus text format.
+
+    Metrics are per process. Updates take no locks: they are made from the
+    event loop thread, where they cannot interleave, which keeps the cost
+    on the request path to a few dictionary operations.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        """
+        Add a metric to the registry.
+
+        Raises:
+            ValueError: If a metric with the same name is already registered
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name!r} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format a label set, or an empty string when there are no labels."""
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """Base class holding a metric's name, help text and label names."""
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[Registry] = REGISTRY,
+    ) -> None:
+        """Create the metric and register it unless registry is None."""
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        if registry is not None:
+            registry.register(self)
+
+    def samples(self) -> Iterator[str]:
+        """Yield the metric's sample lines."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Create a counter; see _Metric for the arguments."""
+        super().__init__(*args, **kwargs)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        """Increase the counter for a label set."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        """Set the total directly, to mirror a counter maintained elsewhere."""
+        self._values[labels] = value
+
+    def value(self, labels: Labels = ()) -> float:
+        """Current value for a label set."""
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[str]:
+        """Yield the metric's sample lines."""
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        """Decrease the gauge for a label set."""
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        registry: Optional[Registry] = REGISTRY,
+    ) -> None:
+        """
+        Create a histogram.
+
+        Args:
+            name: Metric name
+            help: Help text
+            labelnames: Names of the labels
+            buckets: Sorted upper bounds of the buckets, without +Inf
+            registry: Registry to add the metric to, None for none
+        """
+        super().__init__(name, help, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (last is +Inf), sum]
+        self._values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Record one observation for a label set."""
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = state
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        """Number of observations for a label set."""
+        state = self._values.get(labels)
+        return sum(state[0]) if state else 0
+
+    def samples(self) -> Iterator[str]:
+        """Yield the bucket, sum and count lines for every label set."""
+        names = (*self.labelnames, "le")
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                label_text = _format_labels(names, (*labels, _format_value(bound)))
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(total[0])}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+def timed(histogram: Histogram, *labels: str) -> Callable[[F], F]:
+    """
+    Decorate a coroutine function to observe its duration in a histogram.
+
+    Args:
+        histogram: Histogram receiving the durations in seconds
+        labels: Label values for the observations
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start, labels)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled, by method, route and status code",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds, by method and route",
+    ("method", "route"),
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size in bytes as sent, by method and route",
+    ("method", "route"),
+    buckets=DEFAULT_SIZE_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+)
+
+# Requests that match no route share one label value, so scanners probing
+# random paths cannot blow up the number of series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _route_template(scope: Scope, cache: dict[int, str]) -> str:
+    """
+    Full path template of the route that handled a request.
+
+    Depending on the FastAPI version, the matched route's path may be
+    relative to the router it was included from. The include prefix is then
+    recovered as the part of the request path before the suffix the route
+    itself matches. The result is cached per route object (by id, as routes
+    are not hashable and live as long as the application).
+    """
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    cached = cache.get(id(route))
+    if cached is not None:
+        return cached
+    path: str = scope["path"]
+    path_regex = getattr(route, "path_regex", None)
+    template: str = getattr(route, "path_format", "") or getattr(route, "path", "")
+    if path_regex is not None and not path_regex.match(path):
+        for index, char in enumerate(path):
+            if char == "/" and path_regex.match(path[index:]):
+                template = path[:index] + template
+                break
+    cache[id(route)] = template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Record per-route request counts, latency, response sizes and in-flight
+    requests.
+
+    Requests are labelled with the route template (e.g.
+    ``/api/v1/items/{item_id}``) rather than the raw path, which keeps the
+    number of series bounded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap an ASGI application."""
+        self.app = app
+        self._templates: dict[int, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            labels = (scope["method"], _route_template(scope, self._templates))
+            HTTP_REQUESTS.inc((*labels, str(status_code)))
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, labels)
+            HTTP_RESPONSE_SIZE.observe(size, labels)
+{% endif -%}
@@ -0,0 +1,314 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""On-demand sampling profiler for individual HTTP requests."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter as Tally
+from collections.abc import Callable, Iterator
+from types import CoroutineType, FrameType
+from typing import Any, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from {{cookiecutter.project_slug}}.core.logging import logger
+from {{cookiecutter.project_slug}}.core.metrics import Counter
+
+PROFILED_REQUESTS = Counter(
+    "profiled_requests_total",
+    "Requests run under the sampling profiler, by trigger (header or sample)",
+    ("trigger",),
+)
+
+# Leaf of the stacks sampled while the request waits, e.g. for a worker thread
+SUSPENDED = "<suspended>"
+_UNSAFE_PATH_CHARACTERS = re.compile(r"[^A-Za-z0-9]+")
+
+Stack = tuple[str, ...]
+
+
+def _frame_name(frame: FrameType) -> str:
+    """Flame graph label of a frame: qualified function name and location."""
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    path = code.co_filename.replace("\\", "/").rsplit("/", 2)
+    return f"{name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+
+
+def _await_chain(coroutine: Any) -> Iterator[FrameType]:
+    """Frames of a suspended coroutine and of everything it awaits, outermost first."""
+    awaitable = coroutine
+    while awaitable is not None:
+        # Coroutines, or generators such as Future.__await__
+        if hasattr(awaitable, "cr_frame"):
+            frame, awaitable = awaitable.cr_frame, awaitable.cr_await
+        else:
+            frame, awaitable = (
+                getattr(awaitable, "gi_frame", None),
+                getattr(awaitable, "gi_yieldfrom", None),
+            )
+        if frame is None:
+            return
+        yield frame
+
+
+class RequestProfile:
+    """
+    Samples the stack of one asyncio task from a background thread.
+
+    While the task runs, the sample is the event loop thread's stack, cut
+    at the task's outermost coroutine, so everything called synchronously
+    (service methods, log processors, serialization) is included and the
+    event loop's own frames and other requests' tasks are not. While the
+    task is suspended, the sample is its chain of awaiting coroutines
+    ending in SUSPENDED, so time spent waiting is attributed to the await
+    that waits. Samples are taken every interval seconds; a busy event loop
+    holds the GIL for up to sys.getswitchinterval() at a time, which can
+    stretch the interval.
+    """
+
+    def __init__(
+        self, task: asyncio.Task[Any], thread_id: int, interval: float
+    ) -> None:
+        """
+        Prepare to profile a task.
+
+        Args:
+            task: Task to sample
+            thread_id: Identifier of the thread running the task's event loop
+            interval: Seconds between samples
+        """
+        self._coroutine = task.get_coro()
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+        self._on_done: Optional[Callable[[RequestProfile], None]] = None
+        self.samples: list[tuple[Stack, float]] = []
+        self.started = 0.0
+        self.duration = 0.0
+
+    def start(self) -> None:
+        """Start sampling."""
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self, on_done: Optional[Callable[[RequestProfile], None]] = None) -> None:
+        """
+        Stop sampling without waiting for the sampler thread.
+
+        Args:
+            on_done: Called with the profile in the sampler thread once the
+                last sample is taken, e.g. to write it out
+        """
+        self._on_done = on_done
+        self._stop.set()
+
+    def sample(self) -> Optional[Stack]:
+        """Current stack of the task, outermost frame first, or None once it is done."""
+        coroutine = self._coroutine
+        if not isinstance(coroutine, CoroutineType):
+            # Only native coroutines expose the frame being run
+            return None
+        root = coroutine.cr_frame
+        if root is None:
+            return None
+        if not coroutine.cr_running:
+            return (
+                *(_frame_name(frame) for frame in _await_chain(coroutine)),
+                SUSPENDED,
+            )
+
+        frame = sys._current_frames().get(self._thread_id)
+        names: list[str] = []
+        while frame is not None:
+            names.append(_frame_name(frame))
+            if frame is root:
+                names.reverse()
+                return tuple(names)
+            frame = frame.f_back
+        # The task finished or yielded between the two checks
+        return None
+
+    def _run(self) -> None:
+        """Sample until stopped, then hand the profile over."""
+        last = self.started
+        while not self._stop.wait(self._interval):
+            try:
+                stack = self.sample()
+            except (AttributeError, ValueError):
+                # Frames changed under us; skip this sample
+                stack = None
+            now = time.perf_counter()
+            if stack is not None:
+                self.samples.append((stack, now - last))
+            last = now
+        self.duration = time.perf_counter() - self.started
+        if self._on_done is not None:
+            self._on_done(self)
+
+    def collapsed(self) -> str:
+        """Samples in the collapsed stack format of flamegraph.pl and speedscope."""
+        counts = Tally(stack for stack, _ in self.samples)
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in counts.items()
+        )
+
+    def speedscope(self, name: str) -> dict[str, Any]:
+        """Samples as a speedscope sampled profile, weighted by elapsed seconds."""
+        frames: dict[str, int] = {}
+        samples = [
+            [frames.setdefault(frame, len(frames)) for frame in stack]
+            for stack, _ in self.samples
+        ]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "{{cookiecutter.project_slug}}",
+            "shared": {"frames": [{"name": frame} for frame in frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.duration,
+                    "samples": samples,
+                    "weights": [weight for _, weight in self.samples],
+                }
+            ],
+        }
+
+
+class ProfilerMiddleware:
+    """
+    Profile selected requests and write their flame graphs to a directory.
+
+    A request is profiled when it carries the header with the configured
+    token, or at random with probability sample_rate. Its response then
+    gets the header X-Profile-File naming the written file. Other requests
+    pass through after a header lookup and a random draw, at no other cost.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str,
+        token: str = "",
+        sample_rate: float = 0.0,
+        interval: float = 0.005,
+        output_format: str = "collapsed",
+        header_name: str = "X-Profile",
+        random_source: Callable[[], float] = random.random,
+    ) -> None:
+        """
+        Wrap an ASGI application.
+
+        Args:
+            app: ASGI application
+            directory: Directory the profiles are written to
+            token: Secret the header must carry; empty to ignore the header
+            sample_rate: Fraction of other requests to profile
+            interval: Seconds between stack samples
+            output_format: "collapsed" (flamegraph.pl) or "speedscope" (JSON)
+            header_name: Request header that asks for a profile
+            random_source: Source of uniform random numbers in [0, 1)
+        """
+        self.app = app
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.output_format = output_format
+        self._token = token.encode()
+        self._header = header_name.lower().encode()
+        self._random = random_source
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        task = asyncio.current_task() if trigger else None
+        if task is None:
+            await self.app(scope, receive, send)
+            return
+
+        assert trigger is not None
+        PROFILED_REQUESTS.inc((trigger,))
+        extension = (
+            "speedscope.json" if self.output_format == "speedscope" else "collapsed"
+        )
+        slug = _UNSAFE_PATH_CHARACTERS.sub("_", scope["path"]).strip("_")[:60] or "root"
+        filename = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{slug}-"
+            f"{uuid.uuid4().hex[:8]}.{extension}"
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-file", filename.encode()),
+                ]
+            await send(message)
+
+        name = f"{scope['method']} {scope['path']}"
+        profile = RequestProfile(task, threading.get_ident(), self.interval)
+        profile.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Written by the sampler thread, off the event loop
+            profile.stop(lambda done: self._write(done, filename, name))
+
+    def _trigger(self, scope: Scope) -> Optional[str]:
+        """Why a request is profiled ("header" or "sample"), or None if it is not."""
+        if self._token:
+            for name, value in scope["headers"]:
+                if name == self._header:
+                    if hmac.compare_digest(value, self._token):
+                        return "header"
+                    break
+        if self.sample_rate and self._random() < self.sample_rate:
+            return "sample"
+        return None
+
+    def _write(self, profile: RequestProfile, filename: str, name: str) -> None:
+        """
+        Write a finished profile to the output directory.
+
+        The profile is written to a temporary file that is then renamed, so
+        the named file only ever appears complete.
+        """
+        path = os.path.join(self.directory, filename)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+                if self.output_format == "speedscope":
+                    json.dump(profile.speedscope(name), file)
+                else:
+                    file.write(profile.collapsed())
+            os.replace(f"{path}.tmp", path)
+        except OSError as exc:
+            logger.warning("Request profile not written", path=path, error=str(exc))
+            with contextlib.suppress(OSError):
+                os.remove(f"{path}.tmp")
+            return
+        logger.info(
+            "Request profiled",
+            request=name,
+            path=path,
+            samples=len(profile.samples),
+            duration=round(profile.duration, 4),
+        )
+{% endif -%}
@@ -0,0 +1,339 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Per-client rate limiting with token buckets."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
+from fastapi import HTTPException, Request, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from {{cookiecutter.project_slug}}.core.config import Settings
+from {{cookiecutter.project_slug}}.core.metrics import Counter
+
+RATE_LIMITED = Counter(
+    "rate_limited_requests_total",
+    "Requests rejected by per-client rate limits, by policy",
+    ("policy",),
+)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(second|minute|hour|day)\s*$")
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """A token bucket: up to ``limit`` requests, refilled evenly over ``window`` seconds."""
+
+    name: str
+    limit: int
+    window: int
+
+    @classmethod
+    def parse(cls, name: str, rate: str) -> RateLimitPolicy:
+        """
+        Build a policy from a rate such as "100/minute".
+
+        Raises:
+            ValueError: If the rate is not "<count>/<second|minute|hour|day>"
+        """
+        match = _RATE_PATTERN.match(rate)
+        if match is None or int(match.group(1)) < 1:
+            raise ValueError(f"Invalid rate limit {rate!r}, expected e.g. '100/minute'")
+        return cls(name, int(match.group(1)), _PERIODS[match.group(2)])
+
+    @property
+    def interval(self) -> float:
+        """Seconds for one token to refill."""
+        return self.window / self.limit
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of taking a token from a client's bucket."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float = 0.0
+
+
+class RateLimitStore(Protocol):
+    """
+    Storage of token buckets per client and policy.
+
+    The in-memory store keeps buckets per process; an implementation
+    backed by a shared store (e.g. Redis) gives every worker the same view.
+    """
+
+    async def take(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        """Take one token from the bucket of a client under a policy."""
+        ...
+
+
+class MemoryRateLimitStore:
+    """
+    In-process token buckets, sharded so idle buckets are swept in small steps.
+
+    Buckets use the generic cell rate algorithm (GCRA), which behaves like a
+    token bucket but stores a single float per key: the time at which the
+    bucket will be full again. A key whose time has passed is at full
+    capacity and can be dropped without changing any decision, so a sweep
+    runs on one shard at a time, covering every shard once per
+    sweep_interval, without a background task.
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        sweep_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create an empty store.
+
+        Args:
+            shards: Number of shards the keys are spread over
+            sweep_interval: Seconds in which every shard is swept once
+            clock: Monotonic time source
+        """
+        self._shards: list[dict[str, float]] = [{} for _ in range(shards)]
+        self._clock = clock
+        self._sweep_step = sweep_interval / shards
+        self._next_sweep = clock() + self._sweep_step
+        self._sweep_index = 0
+
+    def __len__(self) -> int:
+        """Number of buckets that are not full."""
+        return sum(len(shard) for shard in self._shards)
+
+    async def take(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        """Take one token from the bucket of a client under a policy."""
+        now = self._clock()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        shard = self._shards[hash(key) % len(self._shards)]
+        interval = policy.interval
+        capacity = policy.window  # = limit * interval
+        full_at = max(shard.get(key, now), now) + interval
+        if full_at - now > capacity:
+            # Not even one token left
+            return RateLimitResult(
+                allowed=False,
+                limit=policy.limit,
+                remaining=0,
+                reset_after=full_at - interval - now,
+                retry_after=full_at - capacity - now,
+            )
+        shard[key] = full_at
+        return RateLimitResult(
+            allowed=True,
+            limit=policy.limit,
+            remaining=int((capacity - (full_at - now)) / interval + 1e-9),
+            reset_after=full_at - now,
+        )
+
+    def _sweep(self, now: float) -> None:
+        """Drop full buckets from the next shard."""
+        shard = self._shards[self._sweep_index]
+        for key in [key for key, full_at in shard.items() if full_at <= now]:
+            del shard[key]
+        self._sweep_index = (self._sweep_index + 1) % len(self._shards)
+        self._next_sweep = now + self._sweep_step
+
+
+class RateLimiter:
+    """
+    Per-client token bucket limits, applied to endpoints by policy name.
+
+    Clients are identified by API key when they send one of the known keys,
+    otherwise by IP address. Unknown keys are ignored rather than given a
+    bucket of their own, so a client cannot widen its quota, or fill the
+    store, by sending a different key with every request. Endpoints opt in
+    through the rate_limit() dependency.
+    """
+
+    def __init__(
+        self,
+        policies: Mapping[str, RateLimitPolicy],
+        store: Optional[RateLimitStore] = None,
+        api_key_header: str = "X-API-Key",
+        api_keys: Iterable[str] = (),
+        trust_forwarded_for: bool = False,
+    ) -> None:
+        """
+        Create the limiter.
+
+        Args:
+            policies: Policies by name; endpoints using a missing policy are
+                not limited
+            store: Token bucket store, in memory by default
+            api_key_header: Header carrying a client's API key
+            api_keys: Known API keys, each limited on its own
+            trust_forwarded_for: Identify clients by the first address in
+                X-Forwarded-For (only behind a trusted proxy)
+        """
+        self.policies = dict(policies)
+        # An empty MemoryRateLimitStore is falsy
+        self.store: RateLimitStore = (
+            store if store is not None else MemoryRateLimitStore()
+        )
+        self._api_key_header = api_key_header.lower().encode()
+        # Keep only digests, so API keys are not held in memory
+        self._api_keys = frozenset(_digest(key.encode()) for key in api_keys)
+        self._trust_forwarded_for = trust_forwarded_for
+
+    async def hit(
+        self, policy_name: str, scope: Scope
+    ) -> Optional[tuple[RateLimitPolicy, RateLimitResult]]:
+        """Take a token for the client making a request, if the policy exists."""
+        policy = self.policies.get(policy_name)
+        if policy is None:
+            return None
+        result = await self.store.take(
+            f"{policy_name}:{self.client_key(scope)}", policy
+        )
+        return policy, result
+
+    def client_key(self, scope: Scope) -> str:
+        """Bucket key of the client: a digest of its known API key, or its IP address."""
+        forwarded_for = b""
+        for name, value in scope["headers"]:
+            if name == self._api_key_header and value and self._api_keys:
+                digest = _digest(value)
+                if digest in self._api_keys:
+                    return "key:" + digest
+            elif name == b"x-forwarded-for":
+                forwarded_for = value
+        if self._trust_forwarded_for and forwarded_for:
+            return "ip:" + forwarded_for.split(b",")[0].strip().decode("latin-1")
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+
+def _digest(api_key: bytes) -> str:
+    """Digest identifying an API key."""
+    return hashlib.blake2b(api_key, digest_size=12).hexdigest()
+
+
+def rate_limit_headers(
+    policy: RateLimitPolicy, result: RateLimitResult
+) -> dict[str, str]:
+    """RateLimit-* response headers describing a client's bucket."""
+    return {
+        "RateLimit-Limit": str(result.limit),
+        "RateLimit-Remaining": str(result.remaining),
+        "RateLimit-Reset": str(math.ceil(result.reset_after)),
+        "RateLimit-Policy": f"{policy.limit};w={policy.window}",
+    }
+
+
+# Headers for the current response, collected by RateLimitHeadersMiddleware
+_response_headers: ContextVar[Optional[dict[str, str]]] = ContextVar(
+    "rate_limit_response_headers", default=None
+)
+
+
+def rate_limit(policy_name: str) -> Callable[[Request], Awaitable[None]]:
+    """
+    Dependency limiting an endpoint with the named policy.
+
+    Requests over the limit get 429 Too Many Requests with Retry-After.
+    Allowed requests get RateLimit-* headers when RateLimitHeadersMiddleware
+    is installed. Nothing is limited unless the application has a limiter
+    in ``app.state.rate_limiter`` (see create_rate_limiter()).
+
+    Args:
+        policy_name: Name of the policy, e.g. "read" or "write"
+    """
+
+    async def check_rate_limit(request: Request) -> None:
+        limiter: Optional[RateLimiter] = getattr(
+            request.app.state, "rate_limiter", None
+        )
+        if limiter is None:
+            return
+        hit = await limiter.hit(policy_name, request.scope)
+        if hit is None:
+            return
+        policy, result = hit
+        headers = rate_limit_headers(policy, result)
+        if not result.allowed:
+            RATE_LIMITED.inc((policy_name,))
+            headers["Retry-After"] = str(max(1, math.ceil(result.retry_after)))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded, retry later",
+                headers=headers,
+            )
+        pending = _response_headers.get()
+        if pending is not None:
+            pending.update(headers)
+
+    return check_rate_limit
+
+
+class RateLimitHeadersMiddleware:
+    """Add the RateLimit-* headers set by rate_limit() dependencies to responses."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap an ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers: dict[str, str] = {}
+        token = _response_headers.set(headers)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and headers:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    *(
+                        (name.lower().encode(), value.encode())
+                        for name, value in headers.items()
+                    ),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _response_headers.reset(token)
+
+
+def create_rate_limiter(app_settings: Settings) -> Optional[RateLimiter]:
+    """
+    Build the limiter for an application.
+
+    Args:
+        app_settings: Settings of the application
+
+    Returns:
+        The configured limiter, or None when rate limiting is disabled
+    """
+    if not app_settings.rate_limit_enabled:
+        return None
+    return RateLimiter(
+        {
+            name: RateLimitPolicy.parse(name, rate)
+            for name, rate in app_settings.rate_limit_policies.items()
+        },
+        api_key_header=app_settings.rate_limit_api_key_header,
+        api_keys=app_settings.rate_limit_api_keys,
+        trust_forwarded_for=app_settings.rate_limit_trust_forwarded_for,
+    )
+{% endif -%}
@@ -0,0 +1,192 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Registry of readiness checks refreshed in the background."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from {{cookiecutter.project_slug}}.core.config import settings
+from {{cookiecutter.project_slug}}.core.logging import logger
+
+CheckFunc = Callable[[], Awaitable[bool]]
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    """Outcome of one run of a readiness check."""
+
+    ok: bool
+    checked_at: datetime
+    duration_seconds: float
+    error: Optional[str] = None
+
+
+@dataclass
+class _Check:
+    """A registered check and when it is next due."""
+
+    name: str
+    func: CheckFunc
+    interval: float
+    timeout: float
+    next_run: float = field(default=0.0)
+
+
+class ReadinessRegistry:
+    """
+    Readiness checks that run on their own intervals, off the request path.
+
+    Each check is an async function returning True when its dependency is
+    usable. A background task runs the checks that are due concurrently,
+    each bounded by its timeout, and keeps the latest result per check, so
+    a probe only reads the snapshot instead of calling every dependency.
+    A check that raises or times out counts as failed.
+    """
+
+    def __init__(
+        self,
+        default_interval: float = 10.0,
+        default_timeout: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create an empty registry.
+
+        Args:
+            default_interval: Seconds between runs of a check
+            default_timeout: Seconds a check may take before it fails
+            clock: Monotonic time source
+        """
+        self.default_interval = default_interval
+        self.default_timeout = default_timeout
+        self._clock = clock
+        self._checks: dict[str, _Check] = {}
+        self._results: dict[str, CheckResult] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def register(
+        self,
+        name: str,
+        func: CheckFunc,
+        interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Add a check, replacing any check with the same name.
+
+        Args:
+            name: Name reported in the readiness response
+            func: Async function returning True when ready
+            interval: Seconds between runs, defaults to default_interval
+            timeout: Seconds before the check fails, defaults to default_timeout
+        """
+        self._checks[name] = _Check(
+            name,
+            func,
+            self.default_interval if interval is None else interval,
+            self.default_timeout if timeout is None else timeout,
+        )
+        self._results.pop(name, None)
+
+    def unregister(self, name: str) -> None:
+        """Remove a check and its last result."""
+        self._checks.pop(name, None)
+        self._results.pop(name, None)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background refresh is running."""
+        return self._task is not None
+
+    def snapshot(self) -> dict[str, CheckResult]:
+        """Latest result of every check that has run."""
+        return dict(self._results)
+
+    async def refresh(self, force: bool = False) -> None:
+        """
+        Run the checks that are due (or all of them) concurrently.
+
+        Args:
+            force: Run every check regardless of its interval
+        """
+        now = self._clock()
+        due = [
+            check
+            for check in self._checks.values()
+            if force or check.next_run <= now or check.name not in self._results
+        ]
+        for check in due:
+            check.next_run = now + check.interval
+        results = await asyncio.gather(*(self._run(check) for check in due))
+        for check, result in zip(due, results, strict=True):
+            # Skip checks unregistered or replaced while running
+            if self._checks.get(check.name) is check:
+                self._record(check.name, result)
+
+    async def start(self) -> None:
+        """Run every check once, then keep refreshing in the background."""
+        if self._task is not None:
+            return
+        await self.refresh(force=True)
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop the background refresh."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _refresh_loop(self) -> None:
+        """Sleep until the next check is due, then refresh."""
+        while True:
+            next_run = min(
+                (check.next_run for check in self._checks.values()),
+                default=self._clock() + self.default_interval,
+            )
+            await asyncio.sleep(max(next_run - self._clock(), 0.0))
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Readiness refresh failed")
+
+    async def _run(self, check: _Check) -> CheckResult:
+        """Run one check within its timeout."""
+        start = self._clock()
+        error: Optional[str] = None
+        try:
+            ok = bool(await asyncio.wait_for(check.func(), check.timeout))
+        except asyncio.TimeoutError:
+            ok, error = False, f"timed out after {check.timeout}s"
+        except Exception as exc:
+            ok, error = False, f"{type(exc).__name__}: {exc}"
+        return CheckResult(
+            ok=ok,
+            checked_at=datetime.now(timezone.utc),
+            duration_seconds=round(self._clock() - start, 6),
+            error=error,
+        )
+
+    def _record(self, name: str, result: CheckResult) -> None:
+        """Store a result, logging when a check changes state."""
+        previous = self._results.get(name)
+        if previous is None or previous.ok != result.ok:
+            log = logger.info if result.ok else logger.warning
+            log("Readiness check changed", check=name, ok=result.ok, error=result.error)
+        self._results[name] = result
+
+
+# Application-wide registry; main.py starts and stops its refresh
+readiness = ReadinessRegistry(
+    default_interval=settings.readiness_check_interval,
+    default_timeout=settings.readiness_check_timeout,
+)
+{% endif -%}
@@ -0,0 +1,26 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Fast JSON response class for {{cookiecutter.project_name}}."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response rendered directly by pydantic-core.
+
+    Pydantic models, lists of models, datetimes and plain JSON data are
+    serialized in a single Rust pass, without jsonable_encoder building an
+    intermediate dict tree. Endpoints that already hold validated models can
+    return this response directly to also skip FastAPI's response_model
+    re-validation.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Serialize the content to JSON bytes."""
+        return pydantic_core.to_json(content)
+{% endif -%}
@@ -0,0 +1,380 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""
+Open-loop load generator for the API.
+
+Requests are started at a fixed arrival rate, whether or not earlier ones
+have completed, and each latency is measured from the moment its request
+was due to start. A closed-loop generator waits for a response before
+sending the next request, so a stalled server also stalls the generator
+and the requests it should have sent are never timed (coordinated
+omission); here they queue up and their waiting time shows in the tail.
+
+Targets a running server by URL or, without one, the in-process ASGI app,
+with its rate and concurrency limits turned off so the run measures the
+service rather than its throttling. Only 2xx responses count towards the
+latency percentiles and throughput; other responses, such as 429 or 503
+from a throttled remote server, are reported on their own.
+Requires the httpx package (the "loadtest" extra).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import Counter as Tally
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+OPERATIONS = ("get", "list", "search", "create", "update", "delete", "health")
+DEFAULT_MIX = "get=50,list=20,search=10,create=10,update=5,health=5"
+SEARCH_TERMS = ("laptop", "mouse", "keyboard", "load", "test")
+
+# Latencies are recorded in microseconds in log-linear buckets: exact below
+# 2 * _SUB_BUCKETS, then _SUB_BUCKETS buckets per power of two, i.e. within
+# 1 / _SUB_BUCKETS (about 1.6%) of the true value, as HdrHistogram does with
+# two significant digits
+_SUB_BUCKET_BITS = 6
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+_MAX_MICROS = 3_600_000_000
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of latencies in microseconds."""
+
+    def __init__(self) -> None:
+        """Create an empty histogram covering up to one hour."""
+        self._counts = [0] * (self._index(_MAX_MICROS) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _index(micros: int) -> int:
+        """Bucket holding a value."""
+        shift = max(0, micros.bit_length() - _SUB_BUCKET_BITS - 1)
+        return (shift << _SUB_BUCKET_BITS) + (micros >> shift)
+
+    @staticmethod
+    def _highest(index: int) -> int:
+        """Largest value in a bucket."""
+        shift = max(0, (index >> _SUB_BUCKET_BITS) - 1)
+        return ((index - (shift << _SUB_BUCKET_BITS) + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        """Add a latency."""
+        micros = min(_MAX_MICROS, max(0, round(seconds * 1e6)))
+        self._counts[self._index(micros)] += 1
+        self.count += 1
+        self.total += micros
+        self.max = max(self.max, micros)
+
+    def percentile(self, percent: float) -> float:
+        """Latency in milliseconds that percent of the recorded ones do not exceed."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index, bucket in enumerate(self._counts):
+            seen += bucket
+            if seen >= rank:
+                return min(self._highest(index), self.max) / 1000
+        return self.max / 1000
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in milliseconds."""
+        return self.total / self.count / 1000 if self.count else 0.0
+
+
+@dataclass
+class LoadTestReport:
+    """Outcome of a load test."""
+
+    rate: float
+    duration: float
+    elapsed: float = 0.0
+    sent: int = 0
+    # Successful (2xx) responses only
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    operations: dict[str, LatencyHistogram] = field(default_factory=dict)
+    # Other responses, often fast rejections that would flatter the percentiles
+    failed: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: Tally[int] = field(default_factory=Tally)
+    errors: Tally[str] = field(default_factory=Tally)
+
+    @property
+    def completed(self) -> int:
+        """Requests that got a successful (2xx) response."""
+        return self.latency.count
+
+    @property
+    def throttled(self) -> int:
+        """Requests rejected by the server's rate (429) or concurrency (503) limits."""
+        return self.statuses[429] + self.statuses[503]
+
+    @property
+    def throughput(self) -> float:
+        """Successful responses per second."""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    def format(self) -> str:
+        """Human-readable summary, with percentiles in the style of HdrHistogram."""
+        lines = []
+        if self.throttled:
+            lines += [
+                f"WARNING: {self.throttled} of {self.sent} requests were throttled (429/503)"
+                " by the server's rate or concurrency limits; the results show those",
+                "limits rather than the capacity of the service. Raise or disable them"
+                " on the target, or test the in-process app.",
+                "",
+            ]
+        lines += [
+            f"Target rate:  {self.rate:.1f} req/s for {self.duration:.1f}s",
+            f"Throughput:   {self.throughput:.1f} req/s"
+            f" ({self.completed} successful of {self.sent} requests in {self.elapsed:.2f}s)",
+            f"Statuses:     {_tally(self.statuses) or '-'}",
+        ]
+        if self.failed.count:
+            lines.append(
+                f"Non-2xx:      {self.failed.count} responses, p50 {self.failed.percentile(50):.3f}"
+                f" ms, p99 {self.failed.percentile(99):.3f} ms (not in the percentiles below)"
+            )
+        if self.errors:
+            lines.append(f"Errors:       {_tally(self.errors)}")
+        lines += [
+            "",
+            "Latency of 2xx responses (ms, from the scheduled send time)",
+            f"{'percentile':>12} {'value':>10}",
+        ]
+        for percent in (50, 75, 90, 99, 99.9, 99.99, 100):
+            lines.append(f"{percent:>11}% {self.latency.percentile(percent):10.3f}")
+        lines.append(f"{'mean':>12} {self.latency.mean:10.3f}")
+        lines += ["", f"{'operation':10} {'count':>8} {'p50':>9} {'p99':>9} {'max':>9}"]
+        for name, histogram in sorted(self.operations.items()):
+            lines.append(
+                f"{name:10} {histogram.count:8} {histogram.percentile(50):9.3f}"
+                f" {histogram.percentile(99):9.3f} {histogram.max / 1000:9.3f}"
+            )
+        return "\n".join(lines)
+
+
+def _tally(counts: Tally[Any]) -> str:
+    """Counts as "key=count" pairs."""
+    return ", ".join(f"{key}={count}" for key, count in sorted(counts.items(), key=str))
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """
+    Parse a request mix such as "get=70,list=20,create=10".
+
+    Args:
+        mix: Comma-separated operation=weight pairs
+
+    Returns:
+        Weight of each operation
+
+    Raises:
+        ValueError: If an operation is unknown or a weight is not positive
+    """
+    weights: dict[str, float] = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(
+                f"Unknown operation {name!r}, expected one of {', '.join(OPERATIONS)}"
+            )
+        try:
+            weights[name] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"Invalid weight {weight!r} for {name}") from None
+        if weights[name] <= 0:
+            raise ValueError(f"Weight for {name} must be positive")
+    return weights
+
+
+class _Workload:
+    """Builds the requests of the mix and tracks the IDs they can use."""
+
+    def __init__(
+        self, client: Any, weights: dict[str, float], rng: random.Random
+    ) -> None:
+        self._client = client
+        self._names = list(weights)
+        self._weights = list(weights.values())
+        self._rng = rng
+        self._ids: list[str] = []
+        # Only items created by the test are deleted
+        self._created: list[str] = []
+
+    async def prepare(self) -> None:
+        """Fetch existing item IDs for get and update requests."""
+        response = await self._client.get("/api/v1/items/", params={"limit": 1000})
+        response.raise_for_status()
+        self._ids = [item["id"] for item in response.json()]
+
+    def next(self) -> tuple[str, Callable[[], Awaitable[Any]]]:
+        """Pick the next operation and return its name and request."""
+        name = self._rng.choices(self._names, self._weights)[0]
+        rng = self._rng
+        if name == "get" and self._ids:
+            path = f"/api/v1/items/{rng.choice(self._ids)}"
+            return name, lambda: self._client.get(path)
+        if name == "list":
+            return name, lambda: self._client.get(
+                "/api/v1/items/", params={"limit": 100}
+            )
+        if name == "search":
+            term = rng.choice(SEARCH_TERMS)
+            return name, lambda: self._client.get(
+                "/api/v1/items/search/", params={"q": term}
+            )
+        if name == "update" and self._ids:
+            item_id = rng.choice(self._ids)
+            body = {"price": round(rng.uniform(1, 500), 2)}
+            return name, lambda: self._client.put(f"/api/v1/items/{item_id}", json=body)
+        if name == "delete" and self._created:
+            item_id = self._created.pop(rng.randrange(len(self._created)))
+            self._ids.remove(item_id)
+            return name, lambda: self._client.delete(f"/api/v1/items/{item_id}")
+        if name == "health":
+            return name, lambda: self._client.get("/healthz")
+        # Creates, and the other operations while there is nothing to use
+        return "create", self._create
+
+    async def _create(self) -> Any:
+        """Create an item and remember its ID."""
+        body = {"name": f"load test {self._rng.getrandbits(32):08x}", "price": 9.99}
+        response = await self._client.post("/api/v1/items/", json=body)
+        if response.status_code == 201:
+            item_id = response.json()["id"]
+            self._ids.append(item_id)
+            self._created.append(item_id)
+        return response
+
+
+async def run_load_test(
+    url: Optional[str] = None,
+    rate: float = 100.0,
+    duration: float = 10.0,
+    connections: int = 64,
+    mix: str = DEFAULT_MIX,
+    timeout: float = 10.0,
+    seed: Optional[int] = None,
+) -> LoadTestReport:
+    """
+    Send requests at a fixed rate and measure their latencies.
+
+    Args:
+        url: Base URL of a running server, or None for the in-process app
+        rate: Requests started per second
+        duration: Seconds to keep starting requests
+        connections: Size of the HTTP connection pool
+        mix: Request mix, see parse_mix()
+        timeout: Seconds before a request fails
+        seed: Seed for the choice of requests, for repeatable runs
+
+    Returns:
+        Throughput, latency percentiles and outcomes
+
+    Raises:
+        RuntimeError: If httpx is not installed
+        ValueError: If the mix, rate or duration is invalid
+    """
+    try:
+        import httpx
+    except ImportError:
+        raise RuntimeError(
+            "The load generator requires httpx; install the 'loadtest' extra"
+        ) from None
+    if rate <= 0 or duration <= 0:
+        raise ValueError("Rate and duration must be positive")
+    weights = parse_mix(mix)
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    limits = httpx.Limits(
+        max_connections=connections, max_keepalive_connections=connections
+    )
+    if url is not None:
+        client = httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout)
+        return await _run(client, weights, rate, duration, seed)
+
+    from {{cookiecutter.project_slug}}.core.config import settings
+    from {{cookiecutter.project_slug}}.main import create_app
+
+    # A single client at a high rate is what the limits exist to stop, so the
+    # run gets its own application without them
+    app = create_app(
+        settings.model_copy(
+            update={"rate_limit_enabled": False, "concurrency_limit_enabled": False}
+        )
+    )
+    async with app.router.lifespan_context(app):
+        # The app shares the terminal; per-request logs would drown the report
+        # and make the terminal the bottleneck
+        root = logging.getLogger()
+        level = root.level
+        root.setLevel(logging.WARNING)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://loadtest",
+            limits=limits,
+            timeout=timeout,
+        )
+        try:
+            return await _run(client, weights, rate, duration, seed)
+        finally:
+            root.setLevel(level)
+
+
+async def _run(
+    client: Any,
+    weights: dict[str, float],
+    rate: float,
+    duration: float,
+    seed: Optional[int],
+) -> LoadTestReport:
+    """Drive the workload through a client and collect the report."""
+    report = LoadTestReport(rate=rate, duration=duration)
+    async with client:
+        workload = _Workload(client, weights, random.Random(seed))  # noqa: S311 - non-crypto request choice
+        await workload.prepare()
+
+        async def send(
+            name: str, request: Callable[[], Awaitable[Any]], due: float
+        ) -> None:
+            try:
+                response = await request()
+            except Exception as exc:
+                report.errors[type(exc).__name__] += 1
+                return
+            latency = time.perf_counter() - due
+            report.statuses[response.status_code] += 1
+            if not 200 <= response.status_code < 300:
+                report.failed.record(latency)
+                return
+            report.latency.record(latency)
+            report.operations.setdefault(name, LatencyHistogram()).record(latency)
+
+        tasks = set()
+        total = max(1, round(rate * duration))
+        start = time.perf_counter()
+        for number in range(total):
+            due = start + number / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Late starts keep their due time, so the delay counts as latency
+            task = asyncio.create_task(send(*workload.next(), due))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            report.sent += 1
+        if tasks:
+            await asyncio.wait(tasks)
+        report.elapsed = time.perf_counter() - start
+    return report
+{% endif -%}
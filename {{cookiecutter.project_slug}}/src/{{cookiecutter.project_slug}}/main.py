@@ -7,63 +7,168 @@ import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.routing import APIRoute
 {% if cookiecutter.project_type != "cli" -%}
 from asgi_correlation_id import CorrelationIdMiddleware
 {% endif -%}
 
 {% if cookiecutter.project_type != "cli" -%}
-from {{cookiecutter.project_slug}}.core.logging import setup_logging
+from {{cookiecutter.project_slug}}.core.logging import setup_logging, shutdown_logging
 {% endif -%}
-from {{cookiecutter.project_slug}}.core.config import settings
+from {{cookiecutter.project_slug}}.core.compression import CompressionMiddleware
+from {{cookiecutter.project_slug}}.core.concurrency import ConcurrencyLimitMiddleware
+from {{cookiecutter.project_slug}}.core.config import Settings, settings
+from {{cookiecutter.project_slug}}.core.loop_monitor import loop_monitor
+from {{cookiecutter.project_slug}}.core.metrics import MetricsMiddleware
+from {{cookiecutter.project_slug}}.core.profiling import ProfilerMiddleware
+from {{cookiecutter.project_slug}}.core.rate_limit import (
+    RateLimitHeadersMiddleware,
+    create_rate_limiter,
+)
+from {{cookiecutter.project_slug}}.core.readiness import readiness
+from {{cookiecutter.project_slug}}.core.responses import PydanticJSONResponse
+from {{cookiecutter.project_slug}}.api import health
 from {{cookiecutter.project_slug}}.api.router import api_router
+from {{cookiecutter.project_slug}}.services.item_service import get_item_service
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
-{% if cookiecutter.project_type != "cli" %}    setup_logging(debug=settings.debug, log_format=settings.log_format)
+{% if cookiecutter.project_type != "cli" %}    setup_logging(
+        debug=settings.debug,
+        log_format=settings.log_format,
+        mode=settings.log_mode,
+        queue_size=settings.log_queue_size,
+        queue_policy=settings.log_queue_policy,
+        queue_block_timeout=settings.log_queue_block_timeout,
+        sample_rates=settings.log_sample_rates,
+        rate_limits=settings.log_rate_limits,
+        suppressed_summary_interval=settings.log_suppressed_summary_interval,
+    )
 {% endif %}    logging.info("{{cookiecutter.project_name}} starting up...")
+    # Open the item store before serving, restoring any persisted items
+    item_service = get_item_service()
+    if settings.seed_items and await item_service.get_item_count() == 0:
+        await item_service.seed_items(settings.seed_items, settings.seed_items_seed)
+    # After the store is loaded, so only blocking while serving is reported
+    if settings.loop_monitor_enabled:
+        await loop_monitor.start()
+    await readiness.start()
     yield
     # Shutdown
     logging.info("{{cookiecutter.project_name}} shutting down...")
+    await readiness.stop()
+    await loop_monitor.stop()
+    get_item_service().close()
+{% if cookiecutter.project_type != "cli" %}    shutdown_logging()
+{% endif %}
 
+def create_app(app_settings: Settings = settings) -> FastAPI:
+    """
+    Build the application and its middleware from settings.
 
-app = FastAPI(
-    title=settings.app_name,
-    description="{{cookiecutter.project_short_description}}",
-    version="{{cookiecutter.first_version}}",
-    docs_url="/docs" if settings.debug else None,
-    redoc_url="/redoc" if settings.debug else None,
-    lifespan=lifespan,
-)
+    Args:
+        app_settings: Settings selecting the middleware and limits to install
 
-{% if cookiecutter.project_type != "cli" -%}
-# Add correlation ID middleware for request tracing
-app.add_middleware(
-    CorrelationIdMiddleware,
-    header_name="X-Request-ID",
-    generator=lambda: __import__("uuid").uuid4().hex,
-)
+    Returns:
+        The configured application
+    """
+    app = FastAPI(
+        title=app_settings.app_name,
+        description="{{cookiecutter.project_short_description}}",
+        version="{{cookiecutter.first_version}}",
+        docs_url="/docs" if app_settings.debug else None,
+        redoc_url="/redoc" if app_settings.debug else None,
+        default_response_class=PydanticJSONResponse,
+        lifespan=lifespan,
+    )
+    # Consulted by the rate_limit() dependencies, None when disabled
+    app.state.rate_limiter = create_rate_limiter(app_settings)
 
-{% endif -%}
-# Include API router
-app.include_router(api_router)
+{% if cookiecutter.project_type != "cli" %}    # Add correlation ID middleware for request tracing
+    app.add_middleware(
+        CorrelationIdMiddleware,
+        header_name="X-Request-ID",
+        generator=lambda: __import__("uuid").uuid4().hex,
+    )
+
+{% endif %}    # Compress large responses; health probes bypass it entirely
+    if app_settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=app_settings.compression_minimum_size,
+            gzip_level=app_settings.compression_gzip_level,
+            zstd_level=app_settings.compression_zstd_level,
+            exclude_paths=app_settings.compression_exclude_paths,
+        )
 
+    # Reject excess requests fast instead of letting every request slow down;
+    # health probes are exempt so they keep passing under overload
+    if app_settings.concurrency_limit_enabled:
+        app.add_middleware(
+            ConcurrencyLimitMiddleware,
+            max_limits=app_settings.concurrency_max_limits,
+            min_limit=app_settings.concurrency_min_limit,
+            latency_target=app_settings.concurrency_latency_target,
+            max_queue=app_settings.concurrency_max_queue,
+            max_wait=app_settings.concurrency_max_wait,
+            exempt_paths=[
+                *(
+                    route.path
+                    for route in health.router.routes
+                    if isinstance(route, APIRoute)
+                ),
+                *app_settings.concurrency_exempt_paths,
+            ],
+        )
 
-@app.get("/", include_in_schema=False)
-async def root():
-    """Root endpoint redirect to docs."""
-    return {"message": "{{cookiecutter.project_name}} API", "docs": "/docs"}
+    # Report per-client rate limits, enforced by the rate_limit() dependencies
+    if app_settings.rate_limit_enabled:
+        app.add_middleware(RateLimitHeadersMiddleware)
+
+    # Around the other middleware, so profiles cover the whole request
+    if app_settings.profiler_enabled:
+        app.add_middleware(
+            ProfilerMiddleware,
+            directory=app_settings.profiler_dir,
+            token=app_settings.profiler_token,
+            sample_rate=app_settings.profiler_sample_rate,
+            interval=app_settings.profiler_interval,
+            output_format=app_settings.profiler_format,
+        )
+
+    # Outermost, so latency and response sizes are measured as sent
+    if app_settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
+    # Include API router
+    app.include_router(api_router)
+
+    @app.get("/", include_in_schema=False)
+    async def root():
+        """Root endpoint redirect to docs."""
+        return {"message": "{{cookiecutter.project_name}} API", "docs": "/docs"}
+
+    return app
+
+
+app = create_app()
 
 
 if __name__ == "__main__":
-    import uvicorn
+    if settings.debug:
+        import uvicorn
 
-    uvicorn.run(
-        "{{cookiecutter.project_slug}}.main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=settings.debug,
-    )
+        uvicorn.run(
+            "{{cookiecutter.project_slug}}.main:app",
+            host=settings.host,
+            port=settings.port,
+            reload=True,
+        )
+    else:
+        from {{cookiecutter.project_slug}}.server import serve
+
+        serve(app)
 {% endif -%}
\ No newline at end of file
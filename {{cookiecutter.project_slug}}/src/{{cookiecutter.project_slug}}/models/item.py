@@ -4,25 +4,27 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
 
 class ItemBase(BaseModel):
     """Base model for Item with common fields."""
-    
+
     name: str = Field(..., min_length=1, max_length=100, description="Item name")
-    description: Optional[str] = Field(None, max_length=500, description="Item description")
+    description: Optional[str] = Field(
+        None, max_length=500, description="Item description"
+    )
     price: float = Field(..., gt=0, description="Item price (must be positive)")
     tax: Optional[float] = Field(None, ge=0, description="Tax amount (optional)")
-    
+
     @field_validator("price")
     @classmethod
     def validate_price(cls, v: float) -> float:
         """Ensure price has at most 2 decimal places."""
         return round(v, 2)
-    
+
     @field_validator("tax")
     @classmethod
     def validate_tax(cls, v: Optional[float]) -> Optional[float]:
@@ -34,18 +36,26 @@ class ItemBase(BaseModel):
 
 class ItemCreate(ItemBase):
     """Model for creating a new item."""
-    
+
     pass
 
 
 class ItemUpdate(BaseModel):
     """Model for updating an existing item - all fields optional."""
-    
+
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=500)
     price: Optional[float] = Field(None, gt=0)
     tax: Optional[float] = Field(None, ge=0)
-    
+
+    @field_validator("name", "price", mode="before")
+    @classmethod
+    def reject_null(cls, v: Any) -> Any:
+        """Reject null for fields every item must have; omit them instead."""
+        if v is None:
+            raise ValueError("may be omitted but not null")
+        return v
+
     @field_validator("price")
     @classmethod
     def validate_price(cls, v: Optional[float]) -> Optional[float]:
@@ -53,7 +63,7 @@ class ItemUpdate(BaseModel):
         if v is not None:
             return round(v, 2)
         return v
-    
+
     @field_validator("tax")
     @classmethod
     def validate_tax(cls, v: Optional[float]) -> Optional[float]:
@@ -63,13 +73,19 @@ class ItemUpdate(BaseModel):
         return v
 
 
+class ItemBulkUpdate(ItemUpdate):
+    """Model for one entry of a bulk update - the item ID plus fields to change."""
+
+    id: str = Field(..., min_length=1, description="ID of the item to update")
+
+
 class Item(ItemBase):
     """Complete Item model with all fields."""
-    
+
     id: str = Field(..., description="Unique identifier")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
-    
+
     model_config = {
         "from_attributes": True,
         "json_schema_extra": {
@@ -82,26 +98,54 @@ class Item(ItemBase):
                 "created_at": "2024-01-01T12:00:00Z",
                 "updated_at": "2024-01-01T12:00:00Z",
             }
-        }
+        },
     }
 
 
+class BulkItemResult(BaseModel):
+    """Outcome of one entry of a bulk request."""
+
+    index: int = Field(..., description="Position of the entry in the request")
+    status: str = Field(
+        ..., description="created, updated, deleted, not_found or invalid"
+    )
+    id: Optional[str] = Field(default=None, description="Item ID, when known")
+    error: Optional[str] = Field(default=None, description="Why the entry was rejected")
+
+
+class BulkItemResponse(BaseModel):
+    """Per-entry results of a bulk request."""
+
+    results: list[BulkItemResult]
+    succeeded: int
+    failed: int
+    stopped_at: Optional[int] = Field(
+        default=None,
+        description="Index of the first entry not processed, when an NDJSON body went over a size limit",
+    )
+
+
 # Example of additional models for different use cases
 class ItemInDB(Item):
     """Model for Item as stored in database - can include internal fields."""
-    
+
     is_deleted: bool = False
     version: int = 1
 
 
 class ItemList(BaseModel):
     """Model for paginated list of items."""
-    
+
     items: list[Item]
-    total: int
+    total: Optional[int] = Field(
+        None, description="Total number of items, when cheap to compute"
+    )
     skip: int
     limit: int
-    
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, null on the last page"
+    )
+
     model_config = {
         "json_schema_extra": {
             "example": {
@@ -119,6 +163,7 @@ class ItemList(BaseModel):
                 "total": 100,
                 "skip": 0,
                 "limit": 10,
+                "next_cursor": "MjAyNC0wMS0wMVQxMjowMDowMCswMDowMHxpdGVtLTEyMw",
             }
         }
     }
@@ -0,0 +1,267 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""
+Production server for {{cookiecutter.project_name}}.
+
+Runs preforked uvicorn workers that share one listening socket::
+
+    python -m {{cookiecutter.project_slug}}.server
+
+The application is imported once in the master process before the workers
+are forked, so they share its memory pages copy-on-write and start fast.
+Each worker runs its own event loop (uvloop and httptools when installed)
+and lifespan; workers that exit, e.g. after serving SERVER_MAX_REQUESTS
+requests, are replaced. Everything is configured through Settings.
+
+Per-process state is not shared between workers: the in-memory item store,
+caches, metrics and rate limits each exist once per worker. Use
+ITEM_STORE=shared (one memory-mapped file) or ITEM_STORE=sqlite so every
+worker sees the same items.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import random
+import signal
+import socket
+import time
+from collections.abc import Callable
+from typing import Any, Optional
+
+from {{cookiecutter.project_slug}}.core.config import Settings, settings
+from {{cookiecutter.project_slug}}.core.logging import logger
+
+# Seconds to wait before restarting a worker that failed right after start
+RESTART_BACKOFF = 1.0
+
+
+def worker_count(configured: int) -> int:
+    """
+    Number of worker processes to run.
+
+    Args:
+        configured: Configured count, 0 for one per CPU available to us
+    """
+    if configured > 0:
+        return configured
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def uvicorn_options(config: Settings) -> dict[str, Any]:
+    """Keyword arguments for uvicorn.Config taken from the settings."""
+    return {
+        "loop": config.server_loop,
+        "http": config.server_http,
+        "backlog": config.server_backlog,
+        "timeout_keep_alive": config.server_keep_alive,
+        "limit_concurrency": config.server_limit_concurrency,
+        "timeout_graceful_shutdown": config.server_graceful_timeout,
+    }
+
+
+def max_requests(limit: int, jitter: int) -> Optional[int]:
+    """
+    Requests a worker serves before it is recycled, None for no limit.
+
+    A random jitter keeps workers started together from restarting together.
+    """
+    if limit <= 0:
+        return None
+    return limit + random.randint(0, jitter)  # noqa: S311 - spreads restarts, not security sensitive
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """Open the listening socket shared by all workers."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve_worker(app: Any, sock: socket.socket, config: Settings) -> None:
+    """Run one uvicorn server on an already bound socket until it exits."""
+    import uvicorn
+
+    server_config = uvicorn.Config(
+        app,
+        limit_max_requests=max_requests(
+            config.server_max_requests, config.server_max_requests_jitter
+        ),
+        **uvicorn_options(config),
+    )
+    uvicorn.Server(server_config).run(sockets=[sock])
+
+
+class WorkerPool:
+    """
+    Master process keeping a fixed number of forked workers running.
+
+    SIGTERM or SIGINT stops the pool: the workers are asked to shut down
+    gracefully and killed if they are still running after graceful_timeout
+    (plus a small margin). Any other worker exit is followed by a restart in
+    the same slot; a worker that fails right after starting is restarted
+    after a short backoff, so a broken deployment does not fork in a loop.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[int], None],
+        workers: int,
+        graceful_timeout: float = 30.0,
+    ) -> None:
+        """
+        Create the pool.
+
+        Args:
+            target: Function run in each worker with its slot index
+            workers: Number of workers to keep running
+            graceful_timeout: Seconds workers get to finish on shutdown
+        """
+        self.target = target
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self._pids: dict[int, int] = {}
+        self._started: dict[int, float] = {}
+        self._restart_at: dict[int, float] = {}
+        self._stop_deadline: Optional[float] = None
+
+    def run(self) -> None:
+        """Start the workers and supervise them until the pool is stopped."""
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        logger.info("Starting workers", workers=self.workers, master_pid=os.getpid())
+
+        while True:
+            self._reap()
+            if self._stop_deadline is None:
+                self._spawn_missing()
+            elif not self._pids:
+                break
+            elif time.monotonic() > self._stop_deadline:
+                self._signal_workers(signal.SIGKILL)
+            time.sleep(0.1)
+        logger.info("All workers stopped")
+
+    def _handle_stop(self, signum: int, frame: Any) -> None:
+        """Ask every worker to shut down gracefully."""
+        if self._stop_deadline is None:
+            logger.info("Stopping workers", signal=signal.Signals(signum).name)
+            self._stop_deadline = time.monotonic() + self.graceful_timeout + 5
+            self._signal_workers(signal.SIGTERM)
+
+    def _signal_workers(self, signum: int) -> None:
+        """Send a signal to every running worker."""
+        for pid in list(self._pids):
+            # A worker that already exited is reaped by the supervisor loop
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signum)
+
+    def _spawn_missing(self) -> None:
+        """Fork a worker for every empty slot that is due to start."""
+        now = time.monotonic()
+        running = set(self._pids.values())
+        for index in range(self.workers):
+            if index not in running and self._restart_at.get(index, 0.0) <= now:
+                self._spawn(index)
+
+    def _spawn(self, index: int) -> None:
+        """Fork one worker."""
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                # Workers must not share the master's random state
+                random.seed()
+                self.target(index)
+                exit_code = 0
+            except SystemExit as exc:
+                exit_code = exc.code if isinstance(exc.code, int) else 1
+            except BaseException:
+                logger.exception("Worker failed", worker=index)
+            finally:
+                os._exit(exit_code)
+        self._pids[pid] = index
+        self._started[index] = time.monotonic()
+
+    def _reap(self) -> None:
+        """Collect exited workers and schedule their restart."""
+        while self._pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._pids.clear()
+                return
+            if pid == 0:
+                return
+            index = self._pids.pop(pid, None)
+            if index is None:
+                continue
+            exit_code = os.waitstatus_to_exitcode(status)
+            failed_fast = (
+                exit_code != 0
+                and time.monotonic() - self._started[index] < RESTART_BACKOFF
+            )
+            self._restart_at[index] = time.monotonic() + (
+                RESTART_BACKOFF if failed_fast else 0.0
+            )
+            if self._stop_deadline is None:
+                logger.info(
+                    "Worker exited, restarting",
+                    worker=index,
+                    pid=pid,
+                    exit_code=exit_code,
+                )
+
+
+def serve(app: Any, config: Settings = settings) -> None:
+    """
+    Serve an already imported application with the configured workers.
+
+    Args:
+        app: ASGI application, imported before the workers are forked
+        config: Server settings
+    """
+    workers = worker_count(config.server_workers)
+    sock = bind_socket(config.host, config.port, config.server_backlog)
+    if workers > 1 and config.item_store == "memory" and config.wal_dir:
+        logger.warning(
+            "The write-ahead log of the memory item store can only be opened "
+            "by one process; running a single worker",
+            workers=workers,
+        )
+        workers = 1
+    elif workers > 1 and config.item_store == "memory":
+        logger.warning(
+            "Each worker has its own in-memory item store; "
+            "set ITEM_STORE=shared or sqlite to share items between workers",
+            workers=workers,
+        )
+
+    if workers == 1 or not hasattr(os, "fork"):
+        serve_worker(app, sock, config)
+        return
+    WorkerPool(
+        lambda *_: serve_worker(app, sock, config),
+        workers,
+        config.server_graceful_timeout,
+    ).run()
+
+
+def main() -> None:
+    """Preload the application, then serve it."""
+    from {{cookiecutter.project_slug}}.main import app
+
+    serve(app)
+
+
+if __name__ == "__main__":
+    main()
+{% endif -%}
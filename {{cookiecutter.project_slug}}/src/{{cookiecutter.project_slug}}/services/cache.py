@@ -0,0 +1,144 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Async in-process cache with LRU/TTL eviction and single-flight loading."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters of an AsyncCache."""
+
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    expirations: int
+    size: int
+    maxsize: int
+
+
+class AsyncCache(Generic[K, V]):
+    """
+    Bounded read-through cache for async loaders.
+
+    Entries expire ``ttl`` seconds after they are loaded, and the least
+    recently used entry is evicted once ``maxsize`` is reached. Concurrent
+    misses for the same key share a single load. None results are never
+    cached, so lookups of missing items always reach the loader.
+
+    Invalidating a key (or clearing the cache) also detaches any load in
+    progress for it: callers already waiting still get its result, but the
+    result is not stored, so a load racing with a write cannot re-cache data
+    the write made stale.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Seconds an entry stays valid after it is loaded
+            clock: Monotonic time source
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._loading: dict[K, asyncio.Future[V]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        """
+        Return the cached value for a key, loading it on a miss.
+
+        Args:
+            key: Cache key
+            loader: Called without arguments to load the value on a miss
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            del self._entries[key]
+            self._expirations += 1
+
+        future = self._loading.get(key)
+        if future is None:
+            self._misses += 1
+            future = asyncio.ensure_future(loader())
+            self._loading[key] = future
+            future.add_done_callback(functools.partial(self._loaded, key))
+        else:
+            self._coalesced += 1
+        # Shielded so one cancelled caller does not cancel the shared load
+        return await asyncio.shield(future)
+
+    def invalidate(self, key: K) -> None:
+        """Drop a key and detach any load in progress for it."""
+        self._entries.pop(key, None)
+        self._loading.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry and detach all loads in progress."""
+        self._entries.clear()
+        self._loading.clear()
+
+    def stats(self) -> CacheStats:
+        """Return the current counters."""
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            coalesced=self._coalesced,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            size=len(self._entries),
+            maxsize=self.maxsize,
+        )
+
+    def __len__(self) -> int:
+        """Number of cached entries, including expired ones not yet dropped."""
+        return len(self._entries)
+
+    def _loaded(self, key: K, future: asyncio.Future[Any]) -> None:
+        """Store a finished load unless it was detached or failed."""
+        if self._loading.get(key) is not future:
+            return
+        del self._loading[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        value = future.result()
+        if value is None:
+            return
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+{% endif -%}
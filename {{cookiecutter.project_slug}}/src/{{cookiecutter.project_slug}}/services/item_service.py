@@ -3,33 +3,122 @@
 
 from __future__ import annotations
 
-import uuid
+import base64
+import binascii
+import gc
+import secrets
+import time
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+from {{cookiecutter.project_slug}}.core.config import settings
+from {{cookiecutter.project_slug}}.core.metrics import Counter, Gauge, Histogram, timed
+from {{cookiecutter.project_slug}}.models.item import Item, ItemCreate, ItemList, ItemUpdate
+from {{cookiecutter.project_slug}}.services.cache import AsyncCache, CacheStats
+from {{cookiecutter.project_slug}}.services.seeding import catalog_id, generate_items
+from {{cookiecutter.project_slug}}.services.storage import (
+    InMemoryItemStore,
+    ItemStore,
+    StaleItemError,
+    create_item_store,
+    sort_key,
+)
 
-from {{cookiecutter.project_slug}}.models.item import Item, ItemCreate, ItemUpdate
 {% if cookiecutter.project_type != "cli" -%}
 from {{cookiecutter.project_slug}}.core.logging import logger
 {% else -%}
 import logging
 
 logger = logging.getLogger(__name__)
-{% endif -%}
+{% endif %}
+T = TypeVar("T")
+
+OPERATION_DURATION = Histogram(
+    "item_service_operation_duration_seconds",
+    "ItemService operation latency in seconds (cache hits excluded)",
+    ("operation",),
+)
+STORE_ITEMS = Gauge("item_store_items", "Number of items in the item store")
+CACHE_REQUESTS = Counter(
+    "item_cache_requests_total",
+    "Item cache lookups, by cache and result (hit, miss or coalesced)",
+    ("cache", "result"),
+)
+CACHE_EVICTIONS = Counter(
+    "item_cache_evictions_total",
+    "Item cache entries evicted to stay within the size limit, by cache",
+    ("cache",),
+)
+CACHE_ENTRIES = Gauge("item_cache_entries", "Item cache entries, by cache", ("cache",))
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    """
+    Encode a (created_at, id) position as an opaque cursor.
+
+    Args:
+        created_at: Creation timestamp of the last item on a page
+        item_id: ID of the last item on a page
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        The (created_at, id) position the cursor points at
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode()
+        timestamp, separator, item_id = raw.partition("|")
+        created_at = datetime.fromisoformat(timestamp)
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+    if not separator or not item_id or created_at.tzinfo is None:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+    return created_at, item_id
 
 
 class ItemService:
     """
     Service class for item operations.
-    
-    This is an example implementation using in-memory storage.
-    In a real application, this would interact with a database.
+
+    Persistence is delegated to a pluggable ItemStore backend. Calls into
+    blocking backends run in a worker thread so the event loop stays free.
     """
-    
-    def __init__(self):
-        """Initialize the service with in-memory storage."""
-        self._items: dict[str, Item] = {}
-        self._initialize_sample_data()
-    
+
+    def __init__(self, store: Optional[ItemStore] = None, sample_data: bool = True):
+        """
+        Initialize the service.
+
+        Args:
+            store: Storage backend, in-memory storage if not provided
+            sample_data: Add a few sample items if the store is empty
+        """
+        self._store: ItemStore = store if store is not None else InMemoryItemStore()
+        if sample_data and self._store.count() == 0:
+            self._initialize_sample_data()
+
     def _initialize_sample_data(self) -> None:
         """Add some sample items for demonstration."""
         sample_items = [
@@ -52,172 +141,678 @@ class ItemService:
                 tax=15.00,
             ),
         ]
-        
+
         for item_data in sample_items:
             self.create_item_sync(item_data)
-    
+
+    @timed(OPERATION_DURATION, "get_items")
     async def get_items(self, skip: int = 0, limit: int = 100) -> list[Item]:
         """
         Get a list of items with pagination.
-        
+
         Args:
             skip: Number of items to skip
             limit: Maximum number of items to return
-            
+
         Returns:
             List of items
         """
-        items = list(self._items.values())
-        # Sort by created_at for consistent ordering
-        items.sort(key=lambda x: x.created_at)
-        
-        logger.info("Fetching items", skip=skip, limit=limit, total=len(items))
-        return items[skip : skip + limit]
-    
+        items = await self._call(self._store.list_page, skip, limit)
+
+        logger.info("Fetching items", skip=skip, limit=limit, returned=len(items))
+        return items
+
+    async def get_items_with_version(
+        self, skip: int = 0, limit: int = 100
+    ) -> tuple[str, list[Item]]:
+        """
+        Get a list of items together with the collection version they reflect.
+
+        The version is read before the items, so a concurrent write can only
+        make it older than the items, never newer.
+
+        Args:
+            skip: Number of items to skip
+            limit: Maximum number of items to return
+
+        Returns:
+            The collection version (see get_version) and the list of items
+        """
+        version = await self.get_version()
+        # Not self.get_items: CachedItemService serves that from this method
+        return version, await ItemService.get_items(self, skip, limit)
+
+    @timed(OPERATION_DURATION, "get_items_page")
+    async def get_items_page(
+        self, after: Optional[str] = None, limit: int = 100
+    ) -> ItemList:
+        """
+        Get a page of items using keyset (cursor) pagination.
+
+        Args:
+            after: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of items to return
+
+        Returns:
+            Page of items with the cursor for the next page
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        position = decode_cursor(after) if after else None
+        items = await self._call(self._store.list_after, position, limit + 1)
+        total = await self._call(self._store.count)
+
+        logger.info("Fetching items page", limit=limit, returned=min(len(items), limit))
+        return self._page(items, limit, total=total)
+
+    async def iter_items(self, batch_size: int = 1000) -> AsyncIterator[list[Item]]:
+        """
+        Iterate over every item in created_at order, one batch at a time.
+
+        Each batch is fetched with a keyset query resuming after the previous
+        one, so memory use is bounded by the batch size and items written
+        while iterating do not shift the remaining batches.
+
+        Args:
+            batch_size: Maximum number of items per batch
+
+        Yields:
+            Lists of items
+        """
+        position = None
+        exported = 0
+        while True:
+            batch = await self._call(self._store.list_after, position, batch_size)
+            if not batch:
+                break
+            exported += len(batch)
+            yield batch
+            if len(batch) < batch_size:
+                break
+            position = sort_key(batch[-1])
+
+        logger.info("Items iterated", count=exported)
+
+    @timed(OPERATION_DURATION, "get_item")
     async def get_item(self, item_id: str) -> Optional[Item]:
         """
         Get a single item by ID.
-        
+
         Args:
             item_id: The item's unique identifier
-            
+
         Returns:
             The item if found, None otherwise
         """
-        item = self._items.get(item_id)
+        item = await self._call(self._store.get, item_id)
         if item:
             logger.info("Item retrieved", item_id=item_id)
         else:
             logger.warning("Item not found", item_id=item_id)
         return item
-    
+
+    @timed(OPERATION_DURATION, "create_item")
     async def create_item(self, item_create: ItemCreate) -> Item:
         """
         Create a new item.
-        
+
         Args:
             item_create: The item data
-            
+
         Returns:
             The created item
         """
-        return self.create_item_sync(item_create)
-    
+        item = self._new_item(item_create)
+        await self._call(self._store.add, item)
+        logger.info("Item created", item_id=item.id, item_name=item.name)
+        return item
+
     def create_item_sync(self, item_create: ItemCreate) -> Item:
         """
         Synchronous version of create_item for internal use.
-        
+
+        This calls the store directly, blocking if the backend does I/O.
+
         Args:
             item_create: The item data
-            
+
         Returns:
             The created item
         """
-        now = datetime.now(timezone.utc)
-        item = Item(
-            id=f"item-{uuid.uuid4().hex[:8]}",
-            **item_create.model_dump(),
-            created_at=now,
-            updated_at=now,
-        )
-        
-        self._items[item.id] = item
+        item = self._new_item(item_create)
+        self._store.add(item)
         logger.info("Item created", item_id=item.id, item_name=item.name)
         return item
-    
+
+    @timed(OPERATION_DURATION, "update_item")
     async def update_item(
-        self, item_id: str, item_update: ItemUpdate
+        self,
+        item_id: str,
+        item_update: ItemUpdate,
+        expected_updated_at: Optional[datetime] = None,
     ) -> Optional[Item]:
         """
         Update an existing item.
-        
+
         Args:
             item_id: The item's unique identifier
             item_update: The updated item data
-            
+            expected_updated_at: Only update if the item was last updated at
+                this time (optimistic concurrency)
+
         Returns:
             The updated item if found, None otherwise
+
+        Raises:
+            StaleItemError: If the item changed since expected_updated_at
         """
-        existing_item = self._items.get(item_id)
+        existing_item = await self._call(self._store.get, item_id)
         if not existing_item:
             logger.warning("Item not found for update", item_id=item_id)
             return None
-        
+        if (
+            expected_updated_at is not None
+            and existing_item.updated_at != expected_updated_at
+        ):
+            logger.warning("Stale item update rejected", item_id=item_id)
+            raise StaleItemError(item_id)
+
         # Update only provided fields
         update_data = item_update.model_dump(exclude_unset=True)
-        if update_data:
-            for field, value in update_data.items():
-                setattr(existing_item, field, value)
-            existing_item.updated_at = datetime.now(timezone.utc)
-            
-            logger.info(
-                "Item updated",
-                item_id=item_id,
-                updated_fields=list(update_data.keys()),
-            )
-        
-        return existing_item
-    
-    async def delete_item(self, item_id: str) -> bool:
+        if not update_data:
+            return existing_item
+
+        updated_item = self._apply_update(
+            existing_item, update_data, datetime.now(timezone.utc)
+        )
+        await self._call(self._store.replace, updated_item, expected_updated_at)
+
+        logger.info(
+            "Item updated",
+            item_id=item_id,
+            updated_fields=list(update_data.keys()),
+        )
+        return updated_item
+
+    @timed(OPERATION_DURATION, "delete_item")
+    async def delete_item(
+        self, item_id: str, expected_updated_at: Optional[datetime] = None
+    ) -> bool:
         """
         Delete an item.
-        
+
         Args:
             item_id: The item's unique identifier
-            
+            expected_updated_at: Only delete if the item was last updated at
+                this time (optimistic concurrency)
+
         Returns:
             True if the item was deleted, False if not found
+
+        Raises:
+            StaleItemError: If the item changed since expected_updated_at
         """
-        if item_id in self._items:
-            item = self._items.pop(item_id)
+        item = await self._call(self._store.delete, item_id, expected_updated_at)
+        if item is not None:
             logger.info("Item deleted", item_id=item_id, item_name=item.name)
             return True
-        
+
         logger.warning("Item not found for deletion", item_id=item_id)
         return False
-    
+
+    @timed(OPERATION_DURATION, "create_items")
+    async def create_items(self, item_creates: list[ItemCreate]) -> list[Item]:
+        """
+        Create several items in one batch.
+
+        The batch shares one timestamp, draws its 64-bit IDs from a single
+        random token, skips re-validating already validated input and logs
+        once.
+
+        Args:
+            item_creates: The data for each item
+
+        Returns:
+            The created items, in input order
+        """
+        now = datetime.now(timezone.utc)
+        token = secrets.token_hex(8 * len(item_creates))
+        items = [
+            Item.model_construct(
+                id=f"item-{token[16 * index : 16 * index + 16]}",
+                **item_create.model_dump(),
+                created_at=now,
+                updated_at=now,
+            )
+            for index, item_create in enumerate(item_creates)
+        ]
+        if items:
+            await self._call(self._store.add_many, items)
+
+        logger.info("Items created", count=len(items))
+        return items
+
+    @timed(OPERATION_DURATION, "seed_items")
+    async def seed_items(
+        self, count: int, seed: int = 0, batch_size: int = 10_000
+    ) -> int:
+        """
+        Add a generated catalog straight to the store.
+
+        Items come from generate_items(), so a seed always yields the same
+        catalog. They are stored batch by batch, without validation and
+        with a single log entry for the whole catalog. The cyclic garbage
+        collector is paused meanwhile: the catalog holds no cycles, but its
+        millions of new objects would trigger repeated full collections.
+
+        Args:
+            count: Number of items to generate
+            seed: Seed of the catalog
+            batch_size: Items stored per store call
+
+        Returns:
+            The number of items added
+
+        Raises:
+            ValueError: If count is negative or too large
+        """
+        started = time.perf_counter()
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for batch in generate_items(count, seed, batch_size):
+                await self._call(self._store.add_many, batch)
+        finally:
+            if collecting:
+                gc.enable()
+
+        logger.info(
+            "Items seeded",
+            count=count,
+            seed=seed,
+            duration=round(time.perf_counter() - started, 3),
+        )
+        return count
+
+    @timed(OPERATION_DURATION, "update_items")
+    async def update_items(
+        self, updates: list[tuple[str, ItemUpdate]]
+    ) -> list[Optional[Item]]:
+        """
+        Update several items in one batch.
+
+        Args:
+            updates: Pairs of item ID and the fields to update
+
+        Returns:
+            The updated item for each pair, None where the item was not found
+
+        Raises:
+            ValidationError: If an update would produce an invalid item; no
+                item is written then
+        """
+        current = await self._call(
+            self._store.get_many, [item_id for item_id, _ in updates]
+        )
+        now = datetime.now(timezone.utc)
+        results: list[Optional[Item]] = []
+        changed: list[Item] = []
+        for item_id, item_update in updates:
+            item = current.get(item_id)
+            update_data = item_update.model_dump(exclude_unset=True)
+            if item is not None and update_data:
+                item = self._apply_update(item, update_data, now)
+                current[item_id] = item
+                changed.append(item)
+            results.append(item)
+        if changed:
+            await self._call(self._store.replace_many, changed)
+
+        logger.info(
+            "Items updated",
+            count=len(changed),
+            not_found=sum(item is None for item in results),
+        )
+        return results
+
+    @timed(OPERATION_DURATION, "delete_items")
+    async def delete_items(self, item_ids: list[str]) -> list[bool]:
+        """
+        Delete several items in one batch.
+
+        Args:
+            item_ids: The IDs of the items to delete
+
+        Returns:
+            Whether each ID was deleted, False if not found or repeated
+        """
+        deleted = await self._call(self._store.delete_many, item_ids)
+        remaining = {item.id for item in deleted}
+        results = []
+        for item_id in item_ids:
+            results.append(item_id in remaining)
+            remaining.discard(item_id)
+
+        logger.info(
+            "Items deleted", count=len(deleted), not_found=len(item_ids) - len(deleted)
+        )
+        return results
+
+    @timed(OPERATION_DURATION, "search_items")
     async def search_items(
         self, query: str, skip: int = 0, limit: int = 100
     ) -> list[Item]:
         """
         Search items by name.
-        
+
         Args:
             query: Search query (searches in item names, case-insensitive)
             skip: Number of items to skip
             limit: Maximum number of items to return
-            
+
         Returns:
             List of matching items
         """
-        query_lower = query.lower()
-        matching_items = [
-            item
-            for item in self._items.values()
-            if query_lower in item.name.lower()
-        ]
-        
-        # Sort by created_at for consistent ordering
-        matching_items.sort(key=lambda x: x.created_at)
-        
+        items, matches = await self._call(self._store.search_page, query, skip, limit)
+
         logger.info(
             "Items searched",
             query=query,
-            matches=len(matching_items),
+            matches=matches,
             skip=skip,
             limit=limit,
         )
-        
-        return matching_items[skip : skip + limit]
-    
+
+        return items
+
+    async def search_items_with_version(
+        self, query: str, skip: int = 0, limit: int = 100
+    ) -> tuple[str, list[Item]]:
+        """
+        Search items by name, with the collection version the results reflect.
+
+        The version is read before the items, as in get_items_with_version.
+
+        Args:
+            query: Search query (searches in item names, case-insensitive)
+            skip: Number of items to skip
+            limit: Maximum number of items to return
+
+        Returns:
+            The collection version (see get_version) and the matching items
+        """
+        version = await self.get_version()
+        # Not self.search_items: CachedItemService serves that from this method
+        return version, await ItemService.search_items(self, query, skip, limit)
+
+    @timed(OPERATION_DURATION, "search_items_page")
+    async def search_items_page(
+        self, query: str, after: Optional[str] = None, limit: int = 100
+    ) -> ItemList:
+        """
+        Search items by name using keyset (cursor) pagination.
+
+        Matching resumes at the cursor position, so deep pages cost no more
+        than the first one. The total number of matches is not computed.
+
+        Args:
+            query: Search query (searches in item names, case-insensitive)
+            after: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of items to return
+
+        Returns:
+            Page of matching items with the cursor for the next page
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        position = decode_cursor(after) if after else None
+        items = await self._call(self._store.search_after, query, position, limit + 1)
+
+        logger.info(
+            "Items page searched",
+            query=query,
+            limit=limit,
+            returned=min(len(items), limit),
+        )
+        return self._page(items, limit)
+
     async def get_item_count(self) -> int:
         """
         Get the total number of items.
-        
+
         Returns:
             Total number of items
         """
-        return len(self._items)
+        return await self._call(self._store.count)
+
+    async def get_version(self) -> str:
+        """
+        Get the version of the whole item collection.
+
+        The version changes whenever any item is created, updated or deleted,
+        including by other processes sharing a persistent store.
+
+        Returns:
+            Opaque version token
+        """
+        return await self._call(self._store.version)
+
+    async def update_metrics(self) -> None:
+        """Refresh the gauges that are sampled rather than updated in place."""
+        STORE_ITEMS.set(await self.get_item_count())
+
+    def close(self) -> None:
+        """Release the resources held by the storage backend."""
+        self._store.close()
+
+    async def _call(self, method: Callable[..., T], *args: Any) -> T:
+        """Call a store method, in a worker thread if the store blocks."""
+        if self._store.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    @staticmethod
+    def _new_item(item_create: ItemCreate) -> Item:
+        """Build a new item with a fresh ID and timestamps."""
+        now = datetime.now(timezone.utc)
+        return Item(
+            id=f"item-{secrets.token_hex(8)}",
+            **item_create.model_dump(),
+            created_at=now,
+            updated_at=now,
+        )
+
+    @staticmethod
+    def _apply_update(item: Item, update_data: dict[str, Any], now: datetime) -> Item:
+        """
+        Merge changed fields into an item and validate the result.
+
+        Raises:
+            ValidationError: If the merged item is not a valid Item
+        """
+        return Item.model_validate(
+            {**item.model_dump(), **update_data, "updated_at": now}
+        )
+
+    @staticmethod
+    def _page(items: list[Item], limit: int, total: Optional[int] = None) -> ItemList:
+        """Build a cursor page from up to limit + 1 fetched items."""
+        page = items[:limit]
+        next_cursor = encode_cursor(*sort_key(page[-1])) if len(items) > limit else None
+        return ItemList(
+            items=page, total=total, skip=0, limit=limit, next_cursor=next_cursor
+        )
+
+
+class CachedItemService(ItemService):
+    """
+    ItemService with a read-through cache in front of the store.
+
+    get_item is cached per item ID, get_items and search_items per query.
+    Writes through this service invalidate precisely: the written items'
+    entries and, because any write can change a listing or search, all
+    query entries. Writes made by other processes sharing the store are
+    only picked up once the TTL expires; until then a cached page keeps the
+    collection version it was loaded at, so ETags built from that version
+    describe the cached body rather than the current store.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ItemStore] = None,
+        max_items: int = 10_000,
+        max_queries: int = 1_000,
+        ttl: float = 30.0,
+        sample_data: bool = True,
+    ):
+        """
+        Initialize the service and its caches.
+
+        Args:
+            store: Storage backend, in-memory storage if not provided
+            max_items: Maximum number of cached items
+            max_queries: Maximum number of cached listing and search pages
+            ttl: Seconds a cached entry stays valid
+            sample_data: Add a few sample items if the store is empty
+        """
+        # Created first: seeding sample data already invalidates them
+        self._item_cache: AsyncCache[str, Optional[Item]] = AsyncCache(max_items, ttl)
+        self._query_cache: AsyncCache[tuple[Any, ...], tuple[str, list[Item]]] = (
+            AsyncCache(max_queries, ttl)
+        )
+        super().__init__(store, sample_data)
+
+    async def get_item(self, item_id: str) -> Optional[Item]:
+        """Get a single item by ID, from the cache when possible."""
+        return await self._item_cache.get_or_load(
+            item_id, lambda: super(CachedItemService, self).get_item(item_id)
+        )
+
+    async def get_items(self, skip: int = 0, limit: int = 100) -> list[Item]:
+        """Get a list of items with pagination, from the cache when possible."""
+        _, items = await self.get_items_with_version(skip, limit)
+        return items
+
+    async def get_items_with_version(
+        self, skip: int = 0, limit: int = 100
+    ) -> tuple[str, list[Item]]:
+        """Get a list of items and the version it was loaded at, cached together."""
+        return await self._query_cache.get_or_load(
+            ("list", skip, limit),
+            lambda: super(CachedItemService, self).get_items_with_version(skip, limit),
+        )
+
+    async def search_items(
+        self, query: str, skip: int = 0, limit: int = 100
+    ) -> list[Item]:
+        """Search items by name, from the cache when possible."""
+        _, items = await self.search_items_with_version(query, skip, limit)
+        return items
+
+    async def search_items_with_version(
+        self, query: str, skip: int = 0, limit: int = 100
+    ) -> tuple[str, list[Item]]:
+        """Search items and keep the version the results were loaded at, cached together."""
+        return await self._query_cache.get_or_load(
+            ("search", query.lower(), skip, limit),
+            lambda: super(CachedItemService, self).search_items_with_version(
+                query, skip, limit
+            ),
+        )
+
+    async def create_item(self, item_create: ItemCreate) -> Item:
+        """Create a new item and invalidate cached queries."""
+        item = await super().create_item(item_create)
+        self._query_cache.clear()
+        return item
+
+    def create_item_sync(self, item_create: ItemCreate) -> Item:
+        """Synchronous create_item that invalidates cached queries."""
+        item = super().create_item_sync(item_create)
+        self._query_cache.clear()
+        return item
+
+    async def update_item(
+        self,
+        item_id: str,
+        item_update: ItemUpdate,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Item]:
+        """Update an item and invalidate its entry and cached queries."""
+        try:
+            return await super().update_item(item_id, item_update, expected_updated_at)
+        finally:
+            self._invalidate([item_id])
+
+    async def delete_item(
+        self, item_id: str, expected_updated_at: Optional[datetime] = None
+    ) -> bool:
+        """Delete an item and invalidate its entry and cached queries."""
+        try:
+            return await super().delete_item(item_id, expected_updated_at)
+        finally:
+            self._invalidate([item_id])
+
+    async def create_items(self, item_creates: list[ItemCreate]) -> list[Item]:
+        """Create several items and invalidate cached queries."""
+        items = await super().create_items(item_creates)
+        self._query_cache.clear()
+        return items
+
+    async def seed_items(
+        self, count: int, seed: int = 0, batch_size: int = 10_000
+    ) -> int:
+        """Add a generated catalog and invalidate cached queries."""
+        try:
+            return await super().seed_items(count, seed, batch_size)
+        finally:
+            self._query_cache.clear()
+
+    async def update_items(
+        self, updates: list[tuple[str, ItemUpdate]]
+    ) -> list[Optional[Item]]:
+        """Update several items and invalidate their entries and cached queries."""
+        try:
+            return await super().update_items(updates)
+        finally:
+            self._invalidate([item_id for item_id, _ in updates])
+
+    async def delete_items(self, item_ids: list[str]) -> list[bool]:
+        """Delete several items and invalidate their entries and cached queries."""
+        try:
+            return await super().delete_items(item_ids)
+        finally:
+            self._invalidate(item_ids)
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        """
+        Get the counters of the item and query caches.
+
+        Returns:
+            Cache statistics keyed by cache name ("items" and "queries")
+        """
+        return {
+            "items": self._item_cache.stats(),
+            "queries": self._query_cache.stats(),
+        }
+
+    async def update_metrics(self) -> None:
+        """Refresh the store gauge and mirror the cache counters."""
+        await super().update_metrics()
+        for name, stats in self.cache_stats().items():
+            CACHE_REQUESTS.set(stats.hits, (name, "hit"))
+            CACHE_REQUESTS.set(stats.misses, (name, "miss"))
+            CACHE_REQUESTS.set(stats.coalesced, (name, "coalesced"))
+            CACHE_EVICTIONS.set(stats.evictions, (name,))
+            CACHE_ENTRIES.set(stats.size, (name,))
+
+    def _invalidate(self, item_ids: list[str]) -> None:
+        """Drop the given items and every cached query."""
+        for item_id in item_ids:
+            self._item_cache.invalidate(item_id)
+        self._query_cache.clear()
 
 
 # Singleton instance for demonstration
@@ -228,12 +823,56 @@ _item_service_instance: Optional[ItemService] = None
 def get_item_service() -> ItemService:
     """
     Get the singleton instance of ItemService.
-    
+
     Returns:
         The ItemService instance
     """
     global _item_service_instance
     if _item_service_instance is None:
-        _item_service_instance = ItemService()
+        store = create_item_store(settings)
+        # A generated catalog replaces the samples
+        sample_data = settings.sample_data_enabled and not settings.seed_items
+        if settings.item_cache_enabled:
+            _item_service_instance = CachedItemService(
+                store,
+                max_items=settings.item_cache_max_items,
+                max_queries=settings.item_cache_max_queries,
+                ttl=settings.item_cache_ttl,
+                sample_data=sample_data,
+            )
+        else:
+            _item_service_instance = ItemService(store, sample_data)
     return _item_service_instance
-{% endif -%}
\ No newline at end of file
+
+
+async def seed_item_store(count: int, seed: int = 0) -> int:
+    """
+    Add a generated catalog to the configured item store, e.g. from the CLI.
+
+    Args:
+        count: Number of items to generate
+        seed: Seed of the catalog
+
+    Returns:
+        The number of items added
+
+    Raises:
+        RuntimeError: If the store would not keep the items or already
+            holds the catalog
+        ValueError: If count is negative or too large
+    """
+    if settings.item_store == "memory" and not settings.wal_dir:
+        raise RuntimeError(
+            "The memory item store is lost when this process exits; seed a sqlite "
+            "or shared store or set WAL_DIR, or set SEED_ITEMS for the server"
+        )
+    service = ItemService(create_item_store(settings), sample_data=False)
+    try:
+        if count and await service.get_item(catalog_id(seed, 0)) is not None:
+            raise RuntimeError(
+                f"The item store already holds the catalog with seed {seed}"
+            )
+        return await service.seed_items(count, seed)
+    finally:
+        service.close()
+{% endif -%}
@@ -0,0 +1,115 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Inverted n-gram index for case-insensitive substring search."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+
+class NgramIndex:
+    """
+    Incrementally maintained n-gram index over short text fields.
+
+    Every key's lowercased text is split into overlapping n-grams, and each
+    n-gram maps to the set of keys containing it. A substring query must
+    contain all of its own n-grams, so intersecting their postings yields a
+    small candidate set that is then verified with a plain substring check.
+    Queries shorter than n fall back to scanning the cached lowercase texts.
+    """
+
+    def __init__(self, n: int = 3) -> None:
+        """Initialize an empty index of n-grams of the given size."""
+        self._n = n
+        self._texts: dict[str, str] = {}
+        self._postings: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        """Number of indexed keys."""
+        return len(self._texts)
+
+    def add(self, key: str, text: str) -> None:
+        """
+        Index a key's text, replacing any text previously indexed for it.
+
+        Args:
+            key: Unique key the text belongs to
+            text: Text to index
+        """
+        text_lower = text.lower()
+        if self._texts.get(key) == text_lower:
+            return
+        self.remove(key)
+        self._texts[key] = text_lower
+        for gram in self._grams(text_lower):
+            self._postings.setdefault(gram, set()).add(key)
+
+    def add_many(self, entries: Iterable[tuple[str, str]]) -> None:
+        """
+        Index several keys' texts, as add() does for each.
+
+        Keys sharing a text (catalogs repeat names) are split into n-grams
+        once and added to each posting set in a single update.
+
+        Args:
+            entries: (key, text) pairs
+        """
+        keys_by_text: dict[str, list[str]] = {}
+        # The last text of a key wins, as with repeated add() calls
+        for key, text in dict(entries).items():
+            text_lower = text.lower()
+            if self._texts.get(key) == text_lower:
+                continue
+            self.remove(key)
+            self._texts[key] = text_lower
+            keys_by_text.setdefault(text_lower, []).append(key)
+        for text_lower, keys in keys_by_text.items():
+            for gram in self._grams(text_lower):
+                self._postings.setdefault(gram, set()).update(keys)
+
+    def remove(self, key: str) -> None:
+        """
+        Remove a key from the index if present.
+
+        Args:
+            key: Key to remove
+        """
+        text_lower = self._texts.pop(key, None)
+        if text_lower is None:
+            return
+        for gram in self._grams(text_lower):
+            postings = self._postings[gram]
+            postings.discard(key)
+            if not postings:
+                del self._postings[gram]
+
+    def search(self, query: str) -> set[str]:
+        """
+        Find keys whose text contains the query, case-insensitively.
+
+        Args:
+            query: Substring to look for
+
+        Returns:
+            Set of matching keys
+        """
+        query_lower = query.lower()
+        texts = self._texts
+        if len(query_lower) < self._n:
+            return {key for key, text in texts.items() if query_lower in text}
+
+        postings: list[set[str]] = []
+        for gram in self._grams(query_lower):
+            keys = self._postings.get(gram)
+            if not keys:
+                return set()
+            postings.append(keys)
+        postings.sort(key=len)
+
+        candidates = postings[0].intersection(*postings[1:])
+        return {key for key in candidates if query_lower in texts[key]}
+
+    def _grams(self, text: str) -> set[str]:
+        """Distinct n-grams of an already lowercased text."""
+        n = self._n
+        return {text[i : i + n] for i in range(len(text) - n + 1)}
+{% endif -%}
@@ -0,0 +1,219 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Deterministic synthetic item catalogs for seeding stores at scale."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from {{cookiecutter.project_slug}}.models.item import Item
+
+# Each block of generated items is created one second after the previous one
+CATALOG_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+# Item IDs are a bijection of (seed, index) onto 32 bits, so they are
+# unique across catalogs of up to MAX_CATALOG_SIZE items and 256 seeds
+MAX_CATALOG_SIZE = 1 << 24
+# Random attributes are drawn for this many items at a time, so a catalog
+# does not depend on the batch size it is generated in
+_BLOCK_SIZE = 1024
+
+# Word lists, most common first
+_VOCABULARY = {
+    "brand": [
+        "Acme",
+        "Northwind",
+        "Contoso",
+        "Globex",
+        "Initech",
+        "Umbrella",
+        "Stark",
+        "Wayne",
+    ],
+    "adjective": [
+        "Classic",
+        "Premium",
+        "Compact",
+        "Wireless",
+        "Portable",
+        "Deluxe",
+        "Ergonomic",
+        "Heavy-Duty",
+        "Smart",
+        "Vintage",
+        "Ultra-Light",
+        "Modular",
+        "Rugged",
+        "Slim",
+    ],
+    "material": [
+        "Steel",
+        "Aluminum",
+        "Oak",
+        "Bamboo",
+        "Leather",
+        "Cotton",
+        "Glass",
+        "Ceramic",
+        "Carbon",
+        "Wool",
+        "Brass",
+        "Silicone",
+    ],
+    "noun": [
+        "Laptop",
+        "Mouse",
+        "Keyboard",
+        "Monitor",
+        "Chair",
+        "Desk",
+        "Lamp",
+        "Backpack",
+        "Headphones",
+        "Speaker",
+        "Bottle",
+        "Notebook",
+        "Charger",
+        "Tripod",
+        "Kettle",
+        "Blender",
+        "Jacket",
+        "Watch",
+        "Camera",
+        "Router",
+    ],
+    "description": [
+        "{quality} {noun} made of {material}",
+        "{quality} {noun} with a {material} finish, ships within two business days",
+        "Refurbished {noun}, includes original packaging",
+        "{quality} {noun} for home and office use",
+        "Limited edition {material} {noun}",
+        "Best-selling {noun}, backed by a two-year warranty",
+    ],
+    "quality": [
+        "Durable",
+        "Lightweight",
+        "Everyday",
+        "Professional",
+        "Budget",
+        "High-end",
+    ],
+}
+_TAX_RATES = [0.05, 0.07, 0.1, 0.2]
+
+
+def _zipf_weights(count: int, exponent: float = 1.1) -> list[float]:
+    """Cumulative weights of count choices ranked by Zipf's law."""
+    return list(accumulate(1 / rank**exponent for rank in range(1, count + 1)))
+
+
+# Few words account for most items, as in real catalogs
+_CUM_WEIGHTS = {kind: _zipf_weights(len(words)) for kind, words in _VOCABULARY.items()}
+
+
+def _pick(rng: random.Random, kind: str, count: int) -> list[str]:
+    """count Zipf-distributed picks from one word list."""
+    return rng.choices(_VOCABULARY[kind], cum_weights=_CUM_WEIGHTS[kind], k=count)
+
+
+def catalog_id(seed: int, index: int) -> str:
+    """ID of the item at an index of the catalog generated from a seed."""
+    value = (seed & 0xFF) << 24 | index
+    # Each step is invertible on 32 bits, so distinct inputs never collide
+    for _ in range(2):
+        value = (value ^ value >> 16) * 0x45D9F3B & 0xFFFFFFFF
+    return f"item-{value ^ value >> 16:08x}"
+
+
+def generate_items(
+    count: int, seed: int = 0, batch_size: int = 10_000
+) -> Iterator[list[Item]]:
+    """
+    Generate a pseudo-random item catalog in batches.
+
+    The same seed always yields the same catalog. Words, descriptions and
+    brands follow Zipf distributions, prices a log-normal one (median about
+    $33); one item in eight has no description and one in five no tax.
+    Every random attribute of a batch is drawn in one call, and items are
+    built without validation, so generation costs a few microseconds per
+    item.
+
+    Args:
+        count: Number of items, at most MAX_CATALOG_SIZE
+        seed: Seed of the catalog; catalogs with different seeds (mod 256)
+            have no IDs in common
+        batch_size: Items per yielded batch
+
+    Yields:
+        Lists of up to batch_size items, in creation order
+
+    Raises:
+        ValueError: If count is negative or above MAX_CATALOG_SIZE
+    """
+    if not 0 <= count <= MAX_CATALOG_SIZE:
+        raise ValueError(f"count must be between 0 and {MAX_CATALOG_SIZE}")
+    batch: list[Item] = []
+    for block in _generate_blocks(count, seed):
+        batch += block
+        while len(batch) >= batch_size:
+            yield batch[:batch_size]
+            batch = batch[batch_size:]
+    if batch:
+        yield batch
+
+
+def _generate_blocks(count: int, seed: int) -> Iterator[list[Item]]:
+    """Generate a catalog in blocks of _BLOCK_SIZE items."""
+    rng = random.Random(seed)  # noqa: S311 - deterministic test data, not security sensitive
+    construct = Item.model_construct
+    for number, first in enumerate(range(0, count, _BLOCK_SIZE)):
+        size = min(_BLOCK_SIZE, count - first)
+        ids = [catalog_id(seed, index) for index in range(first, first + size)]
+        nouns = _pick(rng, "noun", size)
+        materials = _pick(rng, "material", size)
+        names = [
+            f"{brand} {adjective} {material} {noun}"
+            for brand, adjective, material, noun in zip(
+                _pick(rng, "brand", size),
+                _pick(rng, "adjective", size),
+                materials,
+                nouns,
+                strict=True,
+            )
+        ]
+        descriptions = [
+            template.format(
+                quality=quality, noun=noun.lower(), material=material.lower()
+            )
+            for template, quality, noun, material in zip(
+                _pick(rng, "description", size),
+                _pick(rng, "quality", size),
+                nouns,
+                materials,
+                strict=True,
+            )
+        ]
+        rolls = [rng.random() for _ in range(size)]
+        prices = [
+            max(0.01, round(rng.lognormvariate(3.5, 1.0), 2)) for _ in range(size)
+        ]
+        rates = rng.choices(_TAX_RATES, k=size)
+        # Like a batch created through the API, a block shares one timestamp
+        created_at = CATALOG_START + timedelta(seconds=number)
+
+        yield [
+            construct(
+                id=item_id,
+                name=name,
+                description=description if roll >= 0.125 else None,
+                price=price,
+                tax=round(price * rate, 2) if roll < 0.8 else None,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            for item_id, name, description, roll, price, rate in zip(
+                ids, names, descriptions, rolls, prices, rates, strict=True
+            )
+        ]
+{% endif -%}
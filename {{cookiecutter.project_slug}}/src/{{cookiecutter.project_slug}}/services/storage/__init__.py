@@ -0,0 +1,55 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Pluggable storage backends for items."""
+
+from __future__ import annotations
+
+from {{cookiecutter.project_slug}}.core.config import Settings, settings
+from {{cookiecutter.project_slug}}.services.storage.base import (
+    DuplicateItemError,
+    ItemStore,
+    SortKey,
+    StaleItemError,
+    sort_key,
+)
+from {{cookiecutter.project_slug}}.services.storage.durable import DurableItemStore
+from {{cookiecutter.project_slug}}.services.storage.memory import InMemoryItemStore
+from {{cookiecutter.project_slug}}.services.storage.shared import SharedItemStore
+from {{cookiecutter.project_slug}}.services.storage.sqlite import SQLiteItemStore
+
+
+def create_item_store(config: Settings = settings) -> ItemStore:
+    """
+    Create the storage backend selected in the settings.
+
+    Args:
+        config: Application settings
+
+    Returns:
+        A ready-to-use item store
+    """
+    if config.item_store == "sqlite":
+        return SQLiteItemStore(config.sqlite_path, pool_size=config.sqlite_pool_size)
+    if config.item_store == "shared":
+        return SharedItemStore(config.shared_store_path)
+    if config.wal_dir:
+        return DurableItemStore(
+            config.wal_dir,
+            fsync_interval=config.wal_fsync_interval,
+            snapshot_bytes=config.wal_snapshot_bytes,
+        )
+    return InMemoryItemStore()
+
+
+__all__ = [
+    "DuplicateItemError",
+    "DurableItemStore",
+    "InMemoryItemStore",
+    "ItemStore",
+    "SQLiteItemStore",
+    "SharedItemStore",
+    "SortKey",
+    "StaleItemError",
+    "create_item_store",
+    "sort_key",
+]
+{% endif -%}
@@ -0,0 +1,133 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Storage backend protocol for items."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Protocol
+
+from {{cookiecutter.project_slug}}.models.item import Item
+
+# Position of an item in the listing order: (created_at, id)
+SortKey = tuple[datetime, str]
+
+
+def sort_key(item: Item) -> SortKey:
+    """Key of an item in the created_at-ordered listing."""
+    return (item.created_at, item.id)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_micros(value: datetime) -> int:
+    """Convert an aware datetime to integer microseconds since the epoch."""
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_micros(value: int) -> datetime:
+    """Convert integer microseconds since the epoch to an aware datetime."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class StaleItemError(Exception):
+    """Raised when a conditional write finds the item changed since it was read."""
+
+
+class DuplicateItemError(Exception):
+    """Raised when adding an item whose ID is already stored."""
+
+
+class ItemStore(Protocol):
+    """
+    Storage backend used by ItemService.
+
+    Methods are synchronous. Backends that do I/O set ``blocking`` to True,
+    and ItemService then runs their calls in a worker thread so the event
+    loop is never blocked. Listings are ordered by (created_at, id).
+    """
+
+    blocking: bool
+
+    def get(self, item_id: str) -> Optional[Item]:
+        """Return the item with the given ID, or None."""
+        ...
+
+    def add(self, item: Item) -> None:
+        """Store a new item; DuplicateItemError if its ID is already stored."""
+        ...
+
+    def replace(
+        self, item: Item, expected_updated_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Overwrite an existing item with the same ID.
+
+        If ``expected_updated_at`` is given, the write only happens if the
+        stored item still has that timestamp, otherwise StaleItemError is
+        raised. The check and the write are atomic.
+        """
+        ...
+
+    def delete(
+        self, item_id: str, expected_updated_at: Optional[datetime] = None
+    ) -> Optional[Item]:
+        """
+        Remove an item and return it, or None if it did not exist.
+
+        ``expected_updated_at`` makes the delete conditional, as for replace.
+        """
+        ...
+
+    def get_many(self, item_ids: list[str]) -> dict[str, Item]:
+        """Return the existing items among the given IDs, keyed by ID."""
+        ...
+
+    def add_many(self, items: list[Item]) -> None:
+        """
+        Store several new items in one operation.
+
+        If any ID is already stored or repeated in the batch, DuplicateItemError
+        is raised and none of the items are stored.
+        """
+        ...
+
+    def replace_many(self, items: list[Item]) -> None:
+        """Overwrite several existing items in one operation."""
+        ...
+
+    def delete_many(self, item_ids: list[str]) -> list[Item]:
+        """Remove the given items and return those that existed."""
+        ...
+
+    def list_page(self, skip: int, limit: int) -> list[Item]:
+        """Return a slice of all items in listing order."""
+        ...
+
+    def list_after(self, position: Optional[SortKey], limit: int) -> list[Item]:
+        """Return up to ``limit`` items ordered after ``position``."""
+        ...
+
+    def search_page(self, query: str, skip: int, limit: int) -> tuple[list[Item], int]:
+        """Return a slice of items whose name contains ``query`` and the match count."""
+        ...
+
+    def search_after(
+        self, query: str, position: Optional[SortKey], limit: int
+    ) -> list[Item]:
+        """Return up to ``limit`` matching items ordered after ``position``."""
+        ...
+
+    def count(self) -> int:
+        """Return the number of stored items."""
+        ...
+
+    def version(self) -> str:
+        """Return an opaque token that changes whenever any item is written."""
+        ...
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+        ...
+{% endif -%}
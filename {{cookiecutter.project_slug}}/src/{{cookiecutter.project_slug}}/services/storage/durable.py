@@ -0,0 +1,416 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""In-memory item store made durable by a write-ahead log and snapshots."""
+
+from __future__ import annotations
+
+import fcntl
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from datetime import datetime
+from typing import IO, Optional
+
+from {{cookiecutter.project_slug}}.core.logging import logger
+from {{cookiecutter.project_slug}}.core.metrics import Counter
+from {{cookiecutter.project_slug}}.models.item import Item
+from {{cookiecutter.project_slug}}.services.storage.memory import InMemoryItemStore
+from {{cookiecutter.project_slug}}.services.storage.records import ItemRecord
+
+WAL_RECORDS = Counter(
+    "item_wal_records_total", "Records committed to the item write-ahead log"
+)
+WAL_FSYNCS = Counter(
+    "item_wal_fsyncs_total",
+    "Group commits (one write and fsync) of the item write-ahead log",
+)
+
+_WAL_MAGIC = b"ITEMWAL1"
+_SNAPSHOT_MAGIC = b"ITEMSNP1"
+# File header: magic, segment number. A snapshot's segment number is the
+# first log segment it does not cover.
+_FILE_HEADER = struct.Struct("<8sQ")
+# Record header: payload length, CRC-32 of the payload, operation
+_RECORD = struct.Struct("<IIB")
+_PUT = 1
+_DELETE = 2
+
+_SNAPSHOT = "snapshot"
+_SEGMENT_PATTERN = re.compile(r"^wal\.(\d{8})$")
+
+
+def _record(op: int, payload: bytes) -> bytes:
+    """Frame a payload as a log record."""
+    return _RECORD.pack(len(payload), zlib.crc32(payload), op) + payload
+
+
+def _segment_path(directory: str, segment: int) -> str:
+    """Path of a log segment."""
+    return os.path.join(directory, f"wal.{segment:08d}")
+
+
+def _fsync_directory(directory: str) -> None:
+    """Make renames and new files in a directory durable."""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WriteAheadLog:
+    """
+    Append-only log segments written with group commit.
+
+    append() only buffers a record. A background thread writes everything
+    buffered with one write and one fsync, then waits fsync_interval seconds
+    so the records arriving meanwhile are committed together. A write is
+    therefore durable at most fsync_interval seconds (plus one fsync) after
+    it was made, and the caller never waits for the disk.
+    """
+
+    def __init__(
+        self, directory: str, segment: int, fsync_interval: float = 0.05
+    ) -> None:
+        """
+        Start a new log segment and its writer thread.
+
+        Args:
+            directory: Directory holding the segments
+            segment: Number of the segment to start
+            fsync_interval: Seconds between group commits
+        """
+        self._directory = directory
+        self._fsync_interval = fsync_interval
+        # Records, and None marking where the next segment starts
+        self._pending: list[Optional[bytes]] = []
+        self._condition = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._closed = False
+        # Segment receiving new records, and the one being written to disk
+        self.segment = segment
+        self.size = _FILE_HEADER.size
+        self._file_segment = segment
+        self._file = self._open_segment(segment)
+        self._thread = threading.Thread(
+            target=self._run, name="item-wal-writer", daemon=True
+        )
+        self._thread.start()
+
+    def append(self, op: int, payload: bytes) -> None:
+        """Buffer one record for the next group commit."""
+        record = _record(op, payload)
+        self.size += len(record)
+        with self._condition:
+            self._pending.append(record)
+            self._condition.notify()
+
+    def rotate(self) -> int:
+        """
+        Start a new segment for the records appended from now on.
+
+        Returns:
+            Number of the new segment
+        """
+        self.segment += 1
+        self.size = _FILE_HEADER.size
+        with self._condition:
+            self._pending.append(None)
+            self._condition.notify()
+        return self.segment
+
+    def flush(self) -> None:
+        """Commit everything appended so far."""
+        with self._io_lock:
+            self._commit()
+
+    def close(self) -> None:
+        """Commit everything appended so far and stop the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+        self._file.close()
+
+    def _run(self) -> None:
+        """Group-commit buffered records until the log is closed."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            with self._io_lock:
+                try:
+                    self._commit()
+                except OSError:
+                    logger.exception("Write-ahead log commit failed, retrying")
+            time.sleep(self._fsync_interval)
+
+    def _commit(self) -> None:
+        """Write and fsync the buffered records, switching segments where marked."""
+        with self._condition:
+            pending, self._pending = self._pending, []
+        start = 0  # first entry not committed yet
+        try:
+            for index, record in enumerate(pending):
+                if record is None:
+                    self._write(pending[start:index])
+                    start = index
+                    self._file.close()
+                    self._file = self._open_segment(self._file_segment + 1)
+                    self._file_segment += 1
+                    start = index + 1
+            self._write(pending[start:])
+        except OSError:
+            # Retry what was not committed with the next group
+            with self._condition:
+                self._pending[:0] = pending[start:]
+            raise
+
+    def _write(self, records: list[Optional[bytes]]) -> None:
+        """Append records to the current segment and fsync it."""
+        if not records:
+            return
+        self._file.write(b"".join(records))  # type: ignore[arg-type]
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        WAL_RECORDS.inc(amount=len(records))
+        WAL_FSYNCS.inc()
+
+    def _open_segment(self, segment: int) -> IO[bytes]:
+        """Create a segment file and write its header."""
+        # Stays open for appends until the next rotation or close()
+        file = open(_segment_path(self._directory, segment), "wb")  # noqa: SIM115
+        try:
+            file.write(_FILE_HEADER.pack(_WAL_MAGIC, segment))
+            file.flush()
+            os.fsync(file.fileno())
+            _fsync_directory(self._directory)
+        except BaseException:
+            file.close()
+            raise
+        return file
+
+
+class DurableItemStore(InMemoryItemStore):
+    """
+    In-memory item store whose writes survive restarts.
+
+    Reads are served from memory exactly as by InMemoryItemStore. Every write
+    is also appended to a WriteAheadLog in the compact binary item encoding,
+    and committed in groups by a background thread. Once the current log
+    segment outgrows snapshot_bytes, a new segment is started and another
+    thread writes a snapshot of all items; the segments it covers are then
+    deleted, so the log never grows without bound.
+
+    On open, the latest snapshot and the segments after it are memory-mapped
+    and replayed. A record cut short by a crash ends the replay of its
+    segment. Only one process can open a directory at a time.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fsync_interval: float = 0.05,
+        snapshot_bytes: int = 64 << 20,
+    ) -> None:
+        """
+        Restore the items persisted in a directory and start logging writes.
+
+        Args:
+            directory: Directory for log segments and the snapshot
+            fsync_interval: Seconds between group commits of the log
+            snapshot_bytes: Log segment size that triggers a snapshot
+
+        Raises:
+            RuntimeError: If another process has the directory open
+        """
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._snapshot_bytes = snapshot_bytes
+        self._snapshot_thread: Optional[threading.Thread] = None
+        # The lock is held, and the file kept open, until close()
+        self._lock_file = open(os.path.join(directory, "LOCK"), "a")  # noqa: SIM115
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            raise RuntimeError(f"{directory} is in use by another process") from None
+        try:
+            self._wal = WriteAheadLog(directory, self._recover(), fsync_interval)
+        except BaseException:
+            # Release the directory if recovery or opening the log fails
+            self._lock_file.close()
+            raise
+
+    def add(self, item: Item) -> None:
+        """Store a new item."""
+        super().add(item)
+        self._log(_PUT, self._items[item.id].encode())
+
+    def replace(
+        self, item: Item, expected_updated_at: Optional[datetime] = None
+    ) -> None:
+        """Overwrite an existing item; created_at must not change."""
+        super().replace(item, expected_updated_at)
+        self._log(_PUT, self._items[item.id].encode())
+
+    def delete(
+        self, item_id: str, expected_updated_at: Optional[datetime] = None
+    ) -> Optional[Item]:
+        """Remove an item and return it, or None if it did not exist."""
+        item = super().delete(item_id, expected_updated_at)
+        if item is not None:
+            self._log(_DELETE, item_id.encode())
+        return item
+
+    def add_many(self, items: list[Item]) -> None:
+        """Store several new items."""
+        super().add_many(items)
+        for item in items:
+            self._wal.append(_PUT, self._items[item.id].encode())
+        self._maybe_snapshot()
+
+    def close(self) -> None:
+        """Commit the log and release the directory."""
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        self._wal.close()
+        self._lock_file.close()
+
+    def _log(self, op: int, payload: bytes) -> None:
+        """Append one write to the log."""
+        self._wal.append(op, payload)
+        self._maybe_snapshot()
+
+    def _maybe_snapshot(self) -> None:
+        """Start a snapshot once the current log segment is large enough."""
+        if self._wal.size < self._snapshot_bytes:
+            return
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return
+        segment = self._wal.rotate()
+        # Records are never modified in place, so a shallow copy is consistent
+        records = list(self._items.values())
+        self._snapshot_thread = threading.Thread(
+            target=self._write_snapshot,
+            args=(records, segment),
+            name="item-snapshot",
+            daemon=True,
+        )
+        self._snapshot_thread.start()
+
+    def _write_snapshot(self, records: list[ItemRecord], segment: int) -> None:
+        """Write a snapshot covering the log before a segment, then drop those segments."""
+        started = time.perf_counter()
+        path = os.path.join(self._directory, _SNAPSHOT)
+        try:
+            with open(f"{path}.tmp", "wb") as file:
+                file.write(_FILE_HEADER.pack(_SNAPSHOT_MAGIC, segment))
+                for start in range(0, len(records), 10_000):
+                    batch = records[start : start + 10_000]
+                    file.write(
+                        b"".join(_record(_PUT, record.encode()) for record in batch)
+                    )
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(f"{path}.tmp", path)
+            _fsync_directory(self._directory)
+            for covered in self._segments():
+                if covered < segment:
+                    os.remove(_segment_path(self._directory, covered))
+        except OSError:
+            logger.exception("Item store snapshot failed")
+            return
+        logger.info(
+            "Item store snapshot written",
+            items=len(records),
+            segment=segment,
+            duration_seconds=round(time.perf_counter() - started, 3),
+        )
+
+    def _recover(self) -> int:
+        """
+        Load the snapshot and the log segments after it.
+
+        Returns:
+            Number for the next log segment
+        """
+        started = time.perf_counter()
+        items: dict[str, ItemRecord] = {}
+        first_segment = 1
+        snapshot = os.path.join(self._directory, _SNAPSHOT)
+        if os.path.exists(snapshot):
+            first_segment = self._replay(snapshot, _SNAPSHOT_MAGIC, items)
+        segments = [segment for segment in self._segments() if segment >= first_segment]
+        for segment in segments:
+            self._replay(_segment_path(self._directory, segment), _WAL_MAGIC, items)
+
+        self._items = items
+        self._order = sorted(record.key for record in items.values())
+        self._name_index.add_many((record.id, record.name) for record in items.values())
+        logger.info(
+            "Item store restored",
+            items=len(items),
+            segments=len(segments),
+            duration_seconds=round(time.perf_counter() - started, 3),
+        )
+        return max(segments, default=first_segment - 1) + 1
+
+    def _replay(self, path: str, magic: bytes, items: dict[str, ItemRecord]) -> int:
+        """
+        Apply the records of a snapshot or log segment to a dict of items.
+
+        Returns:
+            Segment number from the file header
+        """
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _FILE_HEADER.size:
+                # Crashed while creating the file: nothing was committed to it
+                return 0
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                file_magic, segment = _FILE_HEADER.unpack_from(mm)
+                if file_magic != magic:
+                    raise ValueError(f"{path} is not an item store log or snapshot")
+                for op, start, end in self._records(mm, size):
+                    if op == _PUT:
+                        record = ItemRecord.decode(mm, start)
+                        items[record.id] = record
+                    else:
+                        items.pop(mm[start:end].decode(), None)
+        return segment
+
+    def _records(self, mm: mmap.mmap, size: int) -> Iterator[tuple[int, int, int]]:
+        """Operation, payload start and end of each intact record in a file."""
+        position = _FILE_HEADER.size
+        while position < size:
+            if position + _RECORD.size > size:
+                break
+            length, crc, op = _RECORD.unpack_from(mm, position)
+            start = position + _RECORD.size
+            end = start + length
+            if end > size or zlib.crc32(mm[start:end]) != crc:
+                break
+            yield op, start, end
+            position = end
+        if position < size:
+            logger.warning(
+                "Ignoring torn write at the end of the item log", offset=position
+            )
+
+    def _segments(self) -> list[int]:
+        """Numbers of the log segments in the directory, in order."""
+        return sorted(
+            int(match.group(1))
+            for match in map(_SEGMENT_PATTERN.match, os.listdir(self._directory))
+            if match
+        )
+{% endif -%}
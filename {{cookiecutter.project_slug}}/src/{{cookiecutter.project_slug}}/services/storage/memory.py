@@ -0,0 +1,199 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""In-memory item storage backend."""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import secrets
+from datetime import datetime
+from typing import Optional
+
+from {{cookiecutter.project_slug}}.models.item import Item
+from {{cookiecutter.project_slug}}.services.search_index import NgramIndex
+from {{cookiecutter.project_slug}}.services.storage.base import (
+    DuplicateItemError,
+    SortKey,
+    StaleItemError,
+    to_micros,
+)
+from {{cookiecutter.project_slug}}.services.storage.records import ItemRecord
+
+
+class InMemoryItemStore:
+    """
+    Item store backed by a dict, with secondary indexes for listing and search.
+
+    Items are held as compact ItemRecords and turned back into Item models
+    only when returned. Data lives only as long as the process does.
+    """
+
+    blocking = False
+
+    def __init__(self) -> None:
+        """Initialize empty storage and indexes."""
+        self._items: dict[str, ItemRecord] = {}
+        # Secondary index of (created_at, id) keys kept sorted on every write,
+        # so listing slices it instead of sorting the whole store per request.
+        # created_at is in microseconds, as in the records.
+        self._order: list[tuple[int, str]] = []
+        # Trigram index over item names, so search verifies a few candidates
+        # instead of lowercasing and scanning every name per request.
+        self._name_index = NgramIndex()
+        # Bumped on every write; the epoch keeps versions from a previous
+        # process from colliding with this one's after a restart.
+        self._epoch = secrets.token_hex(4)
+        self._version = 0
+
+    def get(self, item_id: str) -> Optional[Item]:
+        """Return the item with the given ID, or None."""
+        record = self._items.get(item_id)
+        return record.to_item() if record is not None else None
+
+    def add(self, item: Item) -> None:
+        """Store a new item."""
+        if item.id in self._items:
+            raise DuplicateItemError(item.id)
+        record = ItemRecord.from_item(item)
+        self._items[item.id] = record
+        bisect.insort(self._order, record.key)
+        self._name_index.add(item.id, item.name)
+        self._version += 1
+
+    def replace(
+        self, item: Item, expected_updated_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Overwrite an existing item; created_at must not change.
+
+        Raises:
+            KeyError: If no item with that ID is stored
+        """
+        if expected_updated_at is not None:
+            self._check_current(item.id, expected_updated_at)
+        if item.id not in self._items:
+            raise KeyError(item.id)
+        record = ItemRecord.from_item(item)
+        # Indexed first, so a name that cannot be indexed leaves the item as it was
+        self._name_index.add(item.id, item.name)
+        self._items[item.id] = record
+        self._version += 1
+
+    def delete(
+        self, item_id: str, expected_updated_at: Optional[datetime] = None
+    ) -> Optional[Item]:
+        """Remove an item and return it, or None if it did not exist."""
+        if expected_updated_at is not None and item_id in self._items:
+            self._check_current(item_id, expected_updated_at)
+        record = self._items.pop(item_id, None)
+        if record is None:
+            return None
+        del self._order[bisect.bisect_left(self._order, record.key)]
+        self._name_index.remove(item_id)
+        self._version += 1
+        return record.to_item()
+
+    def get_many(self, item_ids: list[str]) -> dict[str, Item]:
+        """Return the existing items among the given IDs, keyed by ID."""
+        items = self._items
+        return {
+            item_id: items[item_id].to_item()
+            for item_id in item_ids
+            if item_id in items
+        }
+
+    def add_many(self, items: list[Item]) -> None:
+        """Store several new items, merging their keys into the index at once."""
+        self._check_new([item.id for item in items])
+        records = [ItemRecord.from_item(item) for item in items]
+        for record in records:
+            self._items[record.id] = record
+        self._name_index.add_many((record.id, record.name) for record in records)
+        keys = sorted(record.key for record in records)
+        needs_merge = bool(self._order and keys) and keys[0] < self._order[-1]
+        self._order.extend(keys)
+        if needs_merge:
+            # Timsort merges the two sorted runs in linear time
+            self._order.sort()
+        self._version += 1
+
+    def replace_many(self, items: list[Item]) -> None:
+        """Overwrite several existing items."""
+        for item in items:
+            self.replace(item)
+
+    def delete_many(self, item_ids: list[str]) -> list[Item]:
+        """Remove the given items and return those that existed."""
+        deleted = (self.delete(item_id) for item_id in item_ids)
+        return [item for item in deleted if item is not None]
+
+    def list_page(self, skip: int, limit: int) -> list[Item]:
+        """Return a slice of all items in listing order."""
+        return self._resolve(self._order[skip : skip + limit])
+
+    def list_after(self, position: Optional[SortKey], limit: int) -> list[Item]:
+        """Return up to ``limit`` items ordered after ``position``."""
+        start = bisect.bisect_right(self._order, self._key(position)) if position else 0
+        return self._resolve(self._order[start : start + limit])
+
+    def search_page(self, query: str, skip: int, limit: int) -> tuple[list[Item], int]:
+        """Return a slice of items whose name contains ``query`` and the match count."""
+        keys = sorted(self._match_keys(query))
+        return self._resolve(keys[skip : skip + limit]), len(keys)
+
+    def search_after(
+        self, query: str, position: Optional[SortKey], limit: int
+    ) -> list[Item]:
+        """
+        Return up to ``limit`` matching items ordered after ``position``.
+
+        Only the requested page of matches is sorted, so deep pages cost no
+        more than the first one.
+        """
+        keys = self._match_keys(query)
+        if position:
+            after = self._key(position)
+            keys = [key for key in keys if key > after]
+        return self._resolve(heapq.nsmallest(limit, keys))
+
+    def count(self) -> int:
+        """Return the number of stored items."""
+        return len(self._items)
+
+    def version(self) -> str:
+        """Return an opaque token that changes whenever any item is written."""
+        return f"{self._epoch}-{self._version}"
+
+    def close(self) -> None:
+        """Nothing to release for in-memory storage."""
+
+    def _check_new(self, item_ids: list[str]) -> None:
+        """Raise DuplicateItemError if an ID is stored or repeated."""
+        if len(set(item_ids)) != len(item_ids):
+            raise DuplicateItemError("IDs repeated within the batch")
+        existing = next(
+            (item_id for item_id in item_ids if item_id in self._items), None
+        )
+        if existing is not None:
+            raise DuplicateItemError(existing)
+
+    def _check_current(self, item_id: str, expected_updated_at: datetime) -> None:
+        """Raise StaleItemError unless the stored item has the expected timestamp."""
+        current = self._items.get(item_id)
+        if current is None or current.updated_at != to_micros(expected_updated_at):
+            raise StaleItemError(item_id)
+
+    def _key(self, position: SortKey) -> tuple[int, str]:
+        """Listing key of a (created_at, id) position."""
+        return to_micros(position[0]), position[1]
+
+    def _match_keys(self, query: str) -> list[tuple[int, str]]:
+        """Listing keys of all items whose name matches the query."""
+        items = self._items
+        return [items[item_id].key for item_id in self._name_index.search(query)]
+
+    def _resolve(self, keys: list[tuple[int, str]]) -> list[Item]:
+        """Build the items for a list of listing keys."""
+        items = self._items
+        return [items[item_id].to_item() for _, item_id in keys]
+{% endif -%}
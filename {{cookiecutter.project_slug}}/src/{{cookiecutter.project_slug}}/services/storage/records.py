@@ -0,0 +1,182 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Compact in-memory and binary representations of items, shared by the stores."""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from typing import Optional
+
+from {{cookiecutter.project_slug}}.models.item import Item
+from {{cookiecutter.project_slug}}.services.storage.base import from_micros, to_micros
+
+# Anything sliced into bytes: a bytes object or a memory-mapped file
+BytesLike = bytes | mmap.mmap
+
+# Fixed part of an encoded item: created_at and updated_at in microseconds,
+# price, tax, flags, then the UTF-8 byte lengths of id, name and description
+_ITEM = struct.Struct("<qqddBHHI")
+_HAS_TAX = 1
+_HAS_DESCRIPTION = 2
+
+
+class ItemRecord:
+    """
+    Compact stored form of an item.
+
+    An Item model carries an instance dict, a set of explicitly set fields
+    and two datetime objects. A record keeps the same values in slots, with
+    timestamps as integer microseconds and descriptions interned (catalogs
+    repeat them), in a fraction of the memory. Stores keep records and
+    build Item models only for the items they return.
+
+    Records are never modified in place; a write replaces the whole record.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "description",
+        "price",
+        "tax",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        description: Optional[str],
+        price: float,
+        tax: Optional[float],
+        created_at: int,
+        updated_at: int,
+    ) -> None:
+        """Create a record; timestamps are microseconds since the epoch."""
+        self.id = id
+        self.name = name
+        self.description = sys.intern(description) if description is not None else None
+        self.price = price
+        self.tax = tax
+        self.created_at = created_at
+        # Share one int object while the item was never updated
+        self.updated_at = created_at if updated_at == created_at else updated_at
+
+    @classmethod
+    def from_item(cls, item: Item) -> ItemRecord:
+        """Build the record of an item."""
+        return cls(
+            item.id,
+            item.name,
+            item.description,
+            item.price,
+            item.tax,
+            to_micros(item.created_at),
+            to_micros(item.updated_at),
+        )
+
+    @classmethod
+    def decode(cls, buffer: BytesLike, offset: int) -> ItemRecord:
+        """Read the record encoded at an offset of a buffer (e.g. an mmap)."""
+        (
+            created_at,
+            updated_at,
+            price,
+            tax,
+            flags,
+            id_length,
+            name_length,
+            text_length,
+        ) = _ITEM.unpack_from(buffer, offset)
+        id_start = offset + _ITEM.size
+        name_start = id_start + id_length
+        text_start = name_start + name_length
+        return cls(
+            buffer[id_start:name_start].decode(),
+            buffer[name_start:text_start].decode(),
+            (
+                buffer[text_start : text_start + text_length].decode()
+                if flags & _HAS_DESCRIPTION
+                else None
+            ),
+            price,
+            tax if flags & _HAS_TAX else None,
+            created_at,
+            updated_at,
+        )
+
+    @property
+    def key(self) -> tuple[int, str]:
+        """Position in the listing order, with created_at in microseconds."""
+        return (self.created_at, self.id)
+
+    def encode(self) -> bytes:
+        """Serialize the record."""
+        item_id = self.id.encode()
+        name = self.name.encode()
+        description = (self.description or "").encode()
+        flags = (_HAS_TAX if self.tax is not None else 0) | (
+            _HAS_DESCRIPTION if self.description is not None else 0
+        )
+        fixed = _ITEM.pack(
+            self.created_at,
+            self.updated_at,
+            self.price,
+            self.tax or 0.0,
+            flags,
+            len(item_id),
+            len(name),
+            len(description),
+        )
+        return b"".join((fixed, item_id, name, description))
+
+    def to_item(self) -> Item:
+        """
+        Build the Item model of the record.
+
+        The item is not validated again: it was valid when it was stored.
+        """
+        created_at = from_micros(self.created_at)
+        return Item.model_construct(
+            id=self.id,
+            name=self.name,
+            description=self.description,
+            price=self.price,
+            tax=self.tax,
+            created_at=created_at,
+            updated_at=(
+                created_at
+                if self.updated_at == self.created_at
+                else from_micros(self.updated_at)
+            ),
+        )
+
+
+def encode_item(item: Item) -> bytes:
+    """Serialize an item."""
+    return ItemRecord.from_item(item).encode()
+
+
+def decode_item(buffer: BytesLike, offset: int) -> Item:
+    """Deserialize the item encoded at an offset of a buffer (e.g. an mmap)."""
+    return ItemRecord.decode(buffer, offset).to_item()
+
+
+def decode_key(buffer: BytesLike, offset: int) -> tuple[int, str, str]:
+    """created_at in microseconds, id and name of the item encoded at an offset."""
+    fields = _ITEM.unpack_from(buffer, offset)
+    id_start = offset + _ITEM.size
+    name_start = id_start + fields[5]
+    return (
+        fields[0],
+        buffer[id_start:name_start].decode(),
+        buffer[name_start : name_start + fields[6]].decode(),
+    )
+
+
+def decode_updated_at(buffer: BytesLike, offset: int) -> int:
+    """updated_at in microseconds of the item encoded at an offset."""
+    return _ITEM.unpack_from(buffer, offset)[1]
+{% endif -%}
@@ -0,0 +1,434 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Item storage backend shared between processes through a memory-mapped log."""
+
+from __future__ import annotations
+
+import bisect
+import fcntl
+import heapq
+import mmap
+import os
+import secrets
+import struct
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+from {{cookiecutter.project_slug}}.models.item import Item
+from {{cookiecutter.project_slug}}.services.search_index import NgramIndex
+from {{cookiecutter.project_slug}}.services.storage.base import (
+    DuplicateItemError,
+    SortKey,
+    StaleItemError,
+    to_micros,
+)
+from {{cookiecutter.project_slug}}.services.storage.records import (
+    decode_item,
+    decode_key,
+    decode_updated_at,
+    encode_item,
+)
+
+_MAGIC = b"ITEMLOG1"
+# File header: magic, generation (bumped by compaction), committed end of
+# the log, random epoch, superseded flag (set once compaction replaced the file)
+_HEADER = struct.Struct("<8sQQ4sB")
+_HEADER_SIZE = 64
+_END_AT = 16
+_SUPERSEDED_AT = 28
+_END = struct.Struct("<Q")
+
+# Record header: payload length, operation
+_RECORD = struct.Struct("<IB")
+_PUT = 1
+_DELETE = 2
+
+_INITIAL_SIZE = 1 << 20
+# Catching up on more than this many bytes rebuilds the listing order in one
+# sort instead of inserting every key into it
+_REBUILD_BYTES = 1 << 20
+
+
+class SharedItemStore:
+    """
+    Item store kept in one memory-mapped file shared by every process.
+
+    Items are appended to a log of PUT and DELETE records; a write becomes
+    visible only once the committed end offset in the file header moves past
+    it, so readers never see half-written records and a crashed writer
+    leaves nothing behind. Every process maps the file and keeps a small
+    index of it (ID to record offset, listing order, name trigrams), which
+    it brings up to date by replaying the records committed since its last
+    access. Item payloads are decoded from the shared pages on demand, so N
+    workers serve one dataset without holding N copies of it.
+
+    Writers take an exclusive flock on the file, so there is a single writer
+    at a time across processes, and conditional writes are checked under
+    that lock. Readers only take a shared lock while catching up. Once dead
+    records outweigh live ones, the writer rewrites the log with only live
+    records and renames it over the old file; other processes notice the
+    superseded flag and reopen.
+
+    Writes are not fsynced: data survives worker restarts but not an
+    operating system crash. The store is fork-safe, reopening its file
+    descriptor in a forked child so file locks are not shared with the parent.
+    """
+
+    blocking = False
+
+    def __init__(self, path: str, compact_min_bytes: int = 1 << 20) -> None:
+        """
+        Open or create the shared log file.
+
+        Args:
+            path: File path; every process sharing the store uses the same one
+            compact_min_bytes: Dead bytes tolerated before the log is compacted
+        """
+        self._path = path
+        self._compact_min_bytes = compact_min_bytes
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+        self._attach()
+
+    def get(self, item_id: str) -> Optional[Item]:
+        """Return the item with the given ID, or None."""
+        with self._reading():
+            offset = self._offsets.get(item_id)
+            return self._item_at(offset) if offset is not None else None
+
+    def add(self, item: Item) -> None:
+        """Store a new item."""
+        self.add_many([item])
+
+    def replace(
+        self, item: Item, expected_updated_at: Optional[datetime] = None
+    ) -> None:
+        """Overwrite an existing item; created_at must not change."""
+        with self._writing():
+            if expected_updated_at is not None:
+                self._check_current(item.id, expected_updated_at)
+            self._append([(_PUT, encode_item(item))])
+
+    def delete(
+        self, item_id: str, expected_updated_at: Optional[datetime] = None
+    ) -> Optional[Item]:
+        """Remove an item and return it, or None if it did not exist."""
+        with self._writing():
+            offset = self._offsets.get(item_id)
+            if offset is None:
+                return None
+            if expected_updated_at is not None:
+                self._check_current(item_id, expected_updated_at)
+            item = self._item_at(offset)
+            self._append([(_DELETE, item_id.encode())])
+            return item
+
+    def get_many(self, item_ids: list[str]) -> dict[str, Item]:
+        """Return the existing items among the given IDs, keyed by ID."""
+        with self._reading():
+            offsets = self._offsets
+            return {
+                item_id: self._item_at(offsets[item_id])
+                for item_id in item_ids
+                if item_id in offsets
+            }
+
+    def add_many(self, items: list[Item]) -> None:
+        """Store several new items, committed together."""
+        with self._writing():
+            item_ids = [item.id for item in items]
+            if len(set(item_ids)) != len(item_ids):
+                raise DuplicateItemError("IDs repeated within the batch")
+            existing = next((i for i in item_ids if i in self._offsets), None)
+            if existing is not None:
+                raise DuplicateItemError(existing)
+            self._append([(_PUT, encode_item(item)) for item in items])
+
+    def replace_many(self, items: list[Item]) -> None:
+        """Overwrite several existing items, committed together."""
+        with self._writing():
+            self._append([(_PUT, encode_item(item)) for item in items])
+
+    def delete_many(self, item_ids: list[str]) -> list[Item]:
+        """Remove the given items and return those that existed."""
+        with self._writing():
+            offsets = self._offsets
+            existing = [i for i in dict.fromkeys(item_ids) if i in offsets]
+            items = [self._item_at(offsets[item_id]) for item_id in existing]
+            self._append([(_DELETE, item_id.encode()) for item_id in existing])
+            return items
+
+    def list_page(self, skip: int, limit: int) -> list[Item]:
+        """Return a slice of all items in listing order."""
+        with self._reading():
+            return self._resolve(self._order[skip : skip + limit])
+
+    def list_after(self, position: Optional[SortKey], limit: int) -> list[Item]:
+        """Return up to ``limit`` items ordered after ``position``."""
+        with self._reading():
+            start = (
+                bisect.bisect_right(self._order, self._key(position)) if position else 0
+            )
+            return self._resolve(self._order[start : start + limit])
+
+    def search_page(self, query: str, skip: int, limit: int) -> tuple[list[Item], int]:
+        """Return a slice of items whose name contains ``query`` and the match count."""
+        with self._reading():
+            keys = sorted(self._match_keys(query))
+            return self._resolve(keys[skip : skip + limit]), len(keys)
+
+    def search_after(
+        self, query: str, position: Optional[SortKey], limit: int
+    ) -> list[Item]:
+        """Return up to ``limit`` matching items ordered after ``position``."""
+        with self._reading():
+            keys = self._match_keys(query)
+            if position:
+                after = self._key(position)
+                keys = [key for key in keys if key > after]
+            return self._resolve(heapq.nsmallest(limit, keys))
+
+    def count(self) -> int:
+        """Return the number of stored items."""
+        with self._reading():
+            return len(self._offsets)
+
+    def version(self) -> str:
+        """Return an opaque token that changes whenever any item is written."""
+        with self._reading():
+            return f"{self._epoch}-{self._generation}-{self._applied}"
+
+    def close(self) -> None:
+        """Unmap and close the log file."""
+        with self._lock:
+            self._detach()
+
+    def _attach(self) -> None:
+        """Map the file currently at the store path and reset the index."""
+        while True:
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+            # Exclusive, so only one process initializes a new file
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size == 0:
+                    header = _HEADER.pack(
+                        _MAGIC, 0, _HEADER_SIZE, secrets.token_bytes(4), 0
+                    )
+                    os.ftruncate(fd, _INITIAL_SIZE)
+                    os.pwrite(fd, header, 0)
+                mm = mmap.mmap(fd, os.fstat(fd).st_size)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            magic, generation, _, epoch, superseded = _HEADER.unpack_from(mm)
+            if magic != _MAGIC:
+                mm.close()
+                os.close(fd)
+                raise ValueError(f"{self._path} is not a shared item store file")
+            if not superseded:
+                break
+            # Replaced by compaction between open and map: open the new file
+            mm.close()
+            os.close(fd)
+
+        self._fd = fd
+        self._mm = mm
+        self._generation = generation
+        self._epoch = epoch.hex()
+        self._offsets: dict[str, int] = {}
+        # Listing order as (created_at microseconds, id), like the other stores
+        self._order: list[tuple[int, str]] = []
+        self._name_index = NgramIndex()
+        self._live_bytes = 0
+        self._applied = _HEADER_SIZE
+
+    def _detach(self) -> None:
+        """Unmap and close the current file."""
+        self._mm.close()
+        os.close(self._fd)
+
+    def _check_fork(self) -> None:
+        """Give a forked child its own file descriptor and thread lock."""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._lock = threading.RLock()
+        # flock locks belong to the open file description, which a child
+        # shares with its parent; closing the child's copy keeps the parent's
+        inherited = self._fd
+        self._fd = os.open(self._path, os.O_RDWR)
+        same_file = os.fstat(self._fd).st_ino == os.fstat(inherited).st_ino
+        os.close(inherited)
+        if not same_file:
+            # Compacted since the fork: map the new file
+            self._detach()
+            self._attach()
+
+    @contextmanager
+    def _reading(self) -> Iterator[None]:
+        """Hold the store for a read, catching up with other writers first."""
+        self._check_fork()
+        with self._lock:
+            if self._mm[_SUPERSEDED_AT] or self._committed_end() != self._applied:
+                with self._file_lock(fcntl.LOCK_SH):
+                    pass
+            yield
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """Hold the store as its single writer, caught up with the log."""
+        self._check_fork()
+        with self._lock, self._file_lock(fcntl.LOCK_EX):
+            yield
+
+    @contextmanager
+    def _file_lock(self, operation: int) -> Iterator[None]:
+        """Lock the current log file and replay records committed since the last access."""
+        while True:
+            fd = self._fd
+            fcntl.flock(fd, operation)
+            if not self._mm[_SUPERSEDED_AT]:
+                break
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            self._detach()
+            self._attach()
+        try:
+            end = self._committed_end()
+            if end > len(self._mm):
+                self._remap()
+            self._replay(self._applied, end)
+            yield
+        finally:
+            # Compaction closes the locked descriptor, which releases the lock
+            if self._fd == fd:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _committed_end(self) -> int:
+        """Offset up to which the log is committed."""
+        return _END.unpack_from(self._mm, _END_AT)[0]
+
+    def _remap(self) -> None:
+        """Map the whole file again after it grew."""
+        self._mm.close()
+        self._mm = mmap.mmap(self._fd, os.fstat(self._fd).st_size)
+
+    def _append(self, records: list[tuple[int, bytes]]) -> None:
+        """Write records after the end of the log and commit them at once."""
+        if not records:
+            return
+        data = b"".join(
+            _RECORD.pack(len(payload), op) + payload for op, payload in records
+        )
+        start = self._applied
+        end = start + len(data)
+        if end > len(self._mm):
+            size = len(self._mm)
+            while size < end:
+                size *= 2
+            os.ftruncate(self._fd, size)
+            self._remap()
+        self._mm[start:end] = data
+        _END.pack_into(self._mm, _END_AT, end)
+        self._replay(start, end)
+
+        dead_bytes = self._applied - _HEADER_SIZE - self._live_bytes
+        if dead_bytes > max(self._live_bytes, self._compact_min_bytes):
+            self._compact()
+
+    def _replay(self, start: int, end: int) -> None:
+        """Apply the committed records between two offsets to the index."""
+        mm = self._mm
+        rebuild = start == _HEADER_SIZE or end - start > _REBUILD_BYTES
+        position = start
+        while position < end:
+            length, op = _RECORD.unpack_from(mm, position)
+            payload = position + _RECORD.size
+            if op == _PUT:
+                self._index_put(position, rebuild)
+            else:
+                self._index_delete(mm[payload : payload + length].decode(), rebuild)
+            position = payload + length
+        self._applied = end
+        if rebuild and start != end:
+            self._order = sorted(
+                self._key_at(offset) for offset in self._offsets.values()
+            )
+
+    def _index_put(self, offset: int, rebuild: bool) -> None:
+        """Index the PUT record at an offset."""
+        created_at, item_id, name = decode_key(self._mm, offset + _RECORD.size)
+        previous = self._offsets.get(item_id)
+        if previous is not None:
+            self._live_bytes -= self._record_size(previous)
+        elif not rebuild:
+            bisect.insort(self._order, (created_at, item_id))
+        self._offsets[item_id] = offset
+        self._live_bytes += self._record_size(offset)
+        self._name_index.add(item_id, name)
+
+    def _index_delete(self, item_id: str, rebuild: bool) -> None:
+        """Drop a deleted item from the index."""
+        offset = self._offsets.pop(item_id, None)
+        if offset is None:
+            return
+        if not rebuild:
+            del self._order[bisect.bisect_left(self._order, self._key_at(offset))]
+        self._live_bytes -= self._record_size(offset)
+        self._name_index.remove(item_id)
+
+    def _compact(self) -> None:
+        """Rewrite the log with only live records and swap it in for the old file."""
+        temp_path = f"{self._path}.compact"
+        end = _HEADER_SIZE + self._live_bytes
+        with open(temp_path, "wb") as file:
+            epoch = bytes.fromhex(self._epoch)
+            header = _HEADER.pack(_MAGIC, self._generation + 1, end, epoch, 0)
+            file.write(header.ljust(_HEADER_SIZE, b"\0"))
+            for key in self._order:
+                offset = self._offsets[key[1]]
+                file.write(self._mm[offset : offset + self._record_size(offset)])
+            file.truncate(max(_INITIAL_SIZE, 1 << end.bit_length()))
+        os.replace(temp_path, self._path)
+        # Tell processes still mapping the old file to reopen the new one
+        self._mm[_SUPERSEDED_AT] = 1
+        self._detach()
+        self._attach()
+
+    def _record_size(self, offset: int) -> int:
+        """Size of the record at an offset, including its header."""
+        return _RECORD.size + _RECORD.unpack_from(self._mm, offset)[0]
+
+    def _key_at(self, offset: int) -> tuple[int, str]:
+        """Listing key of the PUT record at an offset."""
+        created_at, item_id, _ = decode_key(self._mm, offset + _RECORD.size)
+        return created_at, item_id
+
+    def _item_at(self, offset: int) -> Item:
+        """Decode the item stored by the PUT record at an offset."""
+        return decode_item(self._mm, offset + _RECORD.size)
+
+    def _check_current(self, item_id: str, expected_updated_at: datetime) -> None:
+        """Raise StaleItemError unless the stored item has the expected timestamp."""
+        offset = self._offsets.get(item_id)
+        if offset is None or (
+            decode_updated_at(self._mm, offset + _RECORD.size)
+            != to_micros(expected_updated_at)
+        ):
+            raise StaleItemError(item_id)
+
+    def _key(self, position: SortKey) -> tuple[int, str]:
+        """Listing key of a (created_at, id) position."""
+        return to_micros(position[0]), position[1]
+
+    def _match_keys(self, query: str) -> list[tuple[int, str]]:
+        """Listing keys of all items whose name matches the query."""
+        offsets = self._offsets
+        matches = self._name_index.search(query)
+        return [self._key_at(offsets[item_id]) for item_id in matches]
+
+    def _resolve(self, keys: list[tuple[int, str]]) -> list[Item]:
+        """Decode the items for a list of listing keys."""
+        offsets = self._offsets
+        return [self._item_at(offsets[item_id]) for _, item_id in keys]
+{% endif -%}
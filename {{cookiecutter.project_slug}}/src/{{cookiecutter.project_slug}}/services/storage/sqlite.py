@@ -0,0 +1,492 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""SQLite item storage backend."""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from {{cookiecutter.project_slug}}.core.logging import logger
+from {{cookiecutter.project_slug}}.models.item import Item
+from {{cookiecutter.project_slug}}.services.storage.base import (
+    DuplicateItemError,
+    SortKey,
+    StaleItemError,
+    from_micros,
+    to_micros,
+)
+
+_COLUMNS = "id, name, description, price, tax, created_at, updated_at"
+
+# Timestamps are stored as integer microseconds since the epoch, so the
+# (created_at, id) index orders rows exactly like the in-memory store.
+# item_stats holds the row count and a write version, both maintained by
+# triggers so counting never scans the table and every connection, in any
+# process, sees the same version. Its random epoch tells databases apart.
+# The explicit integer pk keeps rowids stable across VACUUM, as the name
+# index below refers to rows by it.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    pk INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    description TEXT,
+    price REAL NOT NULL,
+    tax REAL,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_items_created_at_id ON items (created_at, id);
+DROP INDEX IF EXISTS ix_items_name_lower;
+CREATE TABLE IF NOT EXISTS item_stats (
+    n INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    epoch TEXT NOT NULL
+);
+INSERT INTO item_stats (n, version, epoch)
+    SELECT COUNT(*), 0, lower(hex(randomblob(4))) FROM items
+    WHERE NOT EXISTS (SELECT 1 FROM item_stats);
+CREATE TRIGGER IF NOT EXISTS trg_items_insert AFTER INSERT ON items
+    BEGIN UPDATE item_stats SET n = n + 1, version = version + 1; END;
+CREATE TRIGGER IF NOT EXISTS trg_items_update AFTER UPDATE ON items
+    BEGIN UPDATE item_stats SET version = version + 1; END;
+CREATE TRIGGER IF NOT EXISTS trg_items_delete AFTER DELETE ON items
+    BEGIN UPDATE item_stats SET n = n - 1, version = version + 1; END;
+"""
+
+# Trigram full-text index over the lowercased names, kept in sync by
+# triggers. A substring query of three or more characters is answered from
+# its trigrams instead of scanning every name. Needs SQLite 3.34 or newer
+# built with FTS5; without it, search scans.
+_NAME_INDEX_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS items_name_fts USING fts5(
+    name_lower, content='items', content_rowid='pk', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS trg_items_fts_insert AFTER INSERT ON items
+    BEGIN
+        INSERT INTO items_name_fts (rowid, name_lower) VALUES (new.pk, new.name_lower);
+    END;
+CREATE TRIGGER IF NOT EXISTS trg_items_fts_delete AFTER DELETE ON items
+    BEGIN
+        INSERT INTO items_name_fts (items_name_fts, rowid, name_lower)
+            VALUES ('delete', old.pk, old.name_lower);
+    END;
+CREATE TRIGGER IF NOT EXISTS trg_items_fts_update AFTER UPDATE OF name_lower ON items
+    WHEN old.name_lower <> new.name_lower
+    BEGIN
+        INSERT INTO items_name_fts (items_name_fts, rowid, name_lower)
+            VALUES ('delete', old.pk, old.name_lower);
+        INSERT INTO items_name_fts (rowid, name_lower) VALUES (new.pk, new.name_lower);
+    END;
+"""
+_TRIGRAM = 3
+
+# Older SQLite builds allow at most 999 bound parameters per statement
+_ID_CHUNK = 500
+
+_INSERT = (
+    "INSERT INTO items (id, name, name_lower, description, price, tax, "
+    "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_UPDATE = (
+    "UPDATE items SET name = ?, name_lower = ?, description = ?, price = ?, "
+    "tax = ?, updated_at = ? WHERE id = ?"
+)
+
+# Read queries spell out _COLUMNS instead of formatting it in, so their text
+# is fixed and every value is a bound parameter
+_SELECT_BY_ID = (
+    "SELECT id, name, description, price, tax, created_at, updated_at "
+    "FROM items WHERE id = ?"
+)
+_LIST_PAGE = (
+    "SELECT id, name, description, price, tax, created_at, updated_at "
+    "FROM items ORDER BY created_at, id LIMIT ? OFFSET ?"
+)
+_LIST_AFTER = (
+    "SELECT id, name, description, price, tax, created_at, updated_at "
+    "FROM items WHERE (created_at, id) > (?, ?) "
+    "ORDER BY created_at, id LIMIT ?"
+)
+_SEARCH_PAGE = (
+    "SELECT id, name, description, price, tax, created_at, updated_at "
+    "FROM items WHERE instr(name_lower, ?) > 0 "
+    "ORDER BY created_at, id LIMIT ? OFFSET ?"
+)
+_SEARCH_AFTER = (
+    "SELECT id, name, description, price, tax, created_at, updated_at "
+    "FROM items WHERE (created_at, id) > (?, ?) AND instr(name_lower, ?) > 0 "
+    "ORDER BY created_at, id LIMIT ?"
+)
+_SEARCH_COUNT = "SELECT COUNT(*) FROM items WHERE instr(name_lower, ?) > 0"
+
+# The same searches driven by the trigram index. CROSS JOIN makes SQLite
+# start from the index matches rather than walk items in listing order;
+# instr() still checks each match, so results equal the scan's. Their
+# first parameter is the MATCH phrase.
+_INDEXED_SEARCH_PAGE = (
+    "SELECT id, name, description, price, tax, created_at, updated_at "
+    "FROM items_name_fts CROSS JOIN items ON items.pk = items_name_fts.rowid "
+    "WHERE items_name_fts MATCH ? AND instr(items.name_lower, ?) > 0 "
+    "ORDER BY created_at, id LIMIT ? OFFSET ?"
+)
+_INDEXED_SEARCH_AFTER = (
+    "SELECT id, name, description, price, tax, created_at, updated_at "
+    "FROM items_name_fts CROSS JOIN items ON items.pk = items_name_fts.rowid "
+    "WHERE items_name_fts MATCH ? AND (created_at, id) > (?, ?) "
+    "AND instr(items.name_lower, ?) > 0 "
+    "ORDER BY created_at, id LIMIT ?"
+)
+_INDEXED_SEARCH_COUNT = (
+    "SELECT COUNT(*) "
+    "FROM items_name_fts CROSS JOIN items ON items.pk = items_name_fts.rowid "
+    "WHERE items_name_fts MATCH ? AND instr(items.name_lower, ?) > 0"
+)
+
+
+@dataclass(frozen=True)
+class _SearchQueries:
+    """Statements for one way of searching names."""
+
+    page: str
+    after: str
+    count: str
+
+
+_SCAN_SEARCH = _SearchQueries(_SEARCH_PAGE, _SEARCH_AFTER, _SEARCH_COUNT)
+_INDEXED_SEARCH = _SearchQueries(
+    _INDEXED_SEARCH_PAGE, _INDEXED_SEARCH_AFTER, _INDEXED_SEARCH_COUNT
+)
+
+
+class SQLiteItemStore:
+    """
+    Item store persisted in a SQLite database.
+
+    Connections are pooled and reused, so sqlite3's per-connection statement
+    cache keeps every query prepared. The database runs in WAL mode, letting
+    readers proceed while a write is in progress. Pagination, keyset cursors
+    and search are all evaluated by SQLite, so the catalog never has to fit
+    in memory or be reloaded on restart. Search uses an FTS5 trigram index
+    when SQLite supports it, for queries of at least three characters;
+    shorter queries scan the names.
+
+    The store is fork-safe: a process forked after connections were opened
+    (e.g. a preforked server worker) starts a fresh pool instead of sharing
+    its parent's connections, which SQLite does not allow.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, pool_size: int = 4) -> None:
+        """
+        Open the database and create the schema if needed.
+
+        Args:
+            path: Database file path (":memory:" is not supported)
+            pool_size: Maximum number of pooled connections
+        """
+        self._path = path
+        self._pool_size = pool_size
+        self._pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        # Connections inherited across fork, kept open but never used
+        self._inherited: list[sqlite3.Connection] = []
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+            self._name_index = self._create_name_index(conn)
+
+    def get(self, item_id: str) -> Optional[Item]:
+        """Return the item with the given ID, or None."""
+        rows = self._query(_SELECT_BY_ID, (item_id,))
+        return rows[0] if rows else None
+
+    def add(self, item: Item) -> None:
+        """Store a new item."""
+        self.add_many([item])
+
+    def replace(
+        self, item: Item, expected_updated_at: Optional[datetime] = None
+    ) -> None:
+        """Overwrite an existing item; created_at must not change."""
+        if expected_updated_at is None:
+            self.replace_many([item])
+            return
+        # The timestamp check is part of the UPDATE, so it is atomic even
+        # across processes sharing the database
+        with self._connection() as conn, conn:
+            cursor = conn.execute(
+                f"{_UPDATE} AND updated_at = ?",
+                (*self._update_row(item), to_micros(expected_updated_at)),
+            )
+        if cursor.rowcount == 0:
+            raise StaleItemError(item.id)
+
+    def delete(
+        self, item_id: str, expected_updated_at: Optional[datetime] = None
+    ) -> Optional[Item]:
+        """Remove an item and return it, or None if it did not exist."""
+        if expected_updated_at is None:
+            deleted = self.delete_many([item_id])
+            return deleted[0] if deleted else None
+        with self._connection() as conn, conn:
+            rows = self._select_ids(conn, [item_id])
+            if not rows:
+                return None
+            cursor = conn.execute(
+                "DELETE FROM items WHERE id = ? AND updated_at = ?",
+                (item_id, to_micros(expected_updated_at)),
+            )
+        if cursor.rowcount == 0:
+            raise StaleItemError(item_id)
+        return self._to_item(rows[0])
+
+    def get_many(self, item_ids: list[str]) -> dict[str, Item]:
+        """Return the existing items among the given IDs, keyed by ID."""
+        found: dict[str, Item] = {}
+        with self._connection() as conn:
+            for row in self._select_ids(conn, item_ids):
+                item = self._to_item(row)
+                found[item.id] = item
+        return found
+
+    def add_many(self, items: list[Item]) -> None:
+        """Store several new items in a single transaction."""
+        rows = [
+            (
+                item.id,
+                item.name,
+                item.name.lower(),
+                item.description,
+                item.price,
+                item.tax,
+                to_micros(item.created_at),
+                to_micros(item.updated_at),
+            )
+            for item in items
+        ]
+        try:
+            with self._connection() as conn, conn:
+                conn.executemany(_INSERT, rows)
+        except sqlite3.IntegrityError as e:
+            # The primary key is the only uniqueness constraint
+            if "UNIQUE" not in str(e):
+                raise
+            raise DuplicateItemError(str(e)) from e
+
+    def replace_many(self, items: list[Item]) -> None:
+        """Overwrite several existing items in a single transaction."""
+        rows = [self._update_row(item) for item in items]
+        with self._connection() as conn, conn:
+            conn.executemany(_UPDATE, rows)
+
+    def delete_many(self, item_ids: list[str]) -> list[Item]:
+        """Remove the given items in a single transaction."""
+        with self._connection() as conn, conn:
+            deleted = [self._to_item(row) for row in self._select_ids(conn, item_ids)]
+            conn.executemany(
+                "DELETE FROM items WHERE id = ?", [(item.id,) for item in deleted]
+            )
+        return deleted
+
+    def list_page(self, skip: int, limit: int) -> list[Item]:
+        """Return a slice of all items in listing order."""
+        return self._query(_LIST_PAGE, (limit, skip))
+
+    def list_after(self, position: Optional[SortKey], limit: int) -> list[Item]:
+        """Return up to ``limit`` items ordered after ``position``."""
+        if not position:
+            return self.list_page(0, limit)
+        return self._query(_LIST_AFTER, (*self._position(position), limit))
+
+    def search_page(self, query: str, skip: int, limit: int) -> tuple[list[Item], int]:
+        """Return a slice of items whose name contains ``query`` and the match count."""
+        query_lower = query.lower()
+        queries, match = self._search_queries(query_lower)
+        items = self._query(queries.page, (*match, query_lower, limit, skip))
+        with self._connection() as conn:
+            (total,) = conn.execute(queries.count, (*match, query_lower)).fetchone()
+        return items, int(total)
+
+    def search_after(
+        self, query: str, position: Optional[SortKey], limit: int
+    ) -> list[Item]:
+        """Return up to ``limit`` matching items ordered after ``position``."""
+        query_lower = query.lower()
+        queries, match = self._search_queries(query_lower)
+        if not position:
+            return self._query(queries.page, (*match, query_lower, limit, 0))
+        return self._query(
+            queries.after, (*match, *self._position(position), query_lower, limit)
+        )
+
+    def count(self) -> int:
+        """Return the number of stored items."""
+        with self._connection() as conn:
+            (total,) = conn.execute("SELECT n FROM item_stats").fetchone()
+        return int(total)
+
+    def version(self) -> str:
+        """Return an opaque token that changes whenever any item is written."""
+        with self._connection() as conn:
+            epoch, version = conn.execute(
+                "SELECT epoch, version FROM item_stats"
+            ).fetchone()
+        return f"{epoch}-{version}"
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            while True:
+                try:
+                    self._pool.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._opened -= 1
+
+    def _search_queries(
+        self, query_lower: str
+    ) -> tuple[_SearchQueries, tuple[str, ...]]:
+        """Statements for a search, and the MATCH parameter they start with, if any."""
+        if not self._name_index or len(query_lower) < _TRIGRAM:
+            return _SCAN_SEARCH, ()
+        # A quoted FTS5 string matches its text as a substring
+        return _INDEXED_SEARCH, ('"' + query_lower.replace('"', '""') + '"',)
+
+    @staticmethod
+    def _create_name_index(conn: sqlite3.Connection) -> bool:
+        """Create the trigram name index if possible and report whether it exists."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+        if "pk" not in columns:
+            # Databases created before the pk column keep scanning
+            return False
+        existed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'items_name_fts'"
+        ).fetchone()
+        try:
+            conn.executescript(_NAME_INDEX_SCHEMA)
+        except sqlite3.OperationalError as e:
+            # No FTS5 module or trigram tokenizer in this SQLite build
+            logger.warning(
+                "SQLite name index unavailable, search will scan", error=str(e)
+            )
+            return False
+        if not existed:
+            # Index the items of a database created without it
+            with conn:
+                conn.execute(
+                    "INSERT INTO items_name_fts (items_name_fts) VALUES ('rebuild')"
+                )
+        return True
+
+    def _query(self, sql: str, params: tuple[Any, ...]) -> list[Item]:
+        """Run a SELECT over the item columns and convert the rows."""
+        with self._connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._to_item(row) for row in rows]
+
+    @staticmethod
+    def _select_ids(
+        conn: sqlite3.Connection, item_ids: list[str]
+    ) -> list[tuple[Any, ...]]:
+        """Fetch the rows for a list of IDs, in chunks below SQLite's variable limit."""
+        unique_ids = list(dict.fromkeys(item_ids))
+        rows: list[tuple[Any, ...]] = []
+        for start in range(0, len(unique_ids), _ID_CHUNK):
+            chunk = unique_ids[start : start + _ID_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            # Only the "?" placeholders are interpolated; the IDs are bound
+            sql = f"SELECT {_COLUMNS} FROM items WHERE id IN ({placeholders})"  # noqa: S608
+            rows.extend(conn.execute(sql, chunk))
+        return rows
+
+    @staticmethod
+    def _update_row(item: Item) -> tuple[Any, ...]:
+        """Parameters of the UPDATE statement for an item."""
+        return (
+            item.name,
+            item.name.lower(),
+            item.description,
+            item.price,
+            item.tax,
+            to_micros(item.updated_at),
+            item.id,
+        )
+
+    @staticmethod
+    def _position(position: SortKey) -> tuple[int, str]:
+        """Parameters of the condition selecting rows after a keyset position."""
+        created_at, item_id = position
+        return to_micros(created_at), item_id
+
+    @staticmethod
+    def _to_item(row: tuple[Any, ...]) -> Item:
+        """Build an Item from a trusted row without re-running validation."""
+        item_id, name, description, price, tax, created_at, updated_at = row
+        return Item.model_construct(
+            id=item_id,
+            name=name,
+            description=description,
+            price=price,
+            tax=tax,
+            created_at=from_micros(created_at),
+            updated_at=from_micros(updated_at),
+        )
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection, opening one lazily if allowed."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, open a new one, or wait for one."""
+        if self._pid != os.getpid():
+            self._reset_after_fork()
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self._pool_size:
+                self._opened += 1
+                return self._connect()
+        return self._pool.get()
+
+    def _reset_after_fork(self) -> None:
+        """Start a fresh pool in a forked child process."""
+        # Closing the parent's connections here could release locks the
+        # parent still relies on, so they are only set aside. The pool's
+        # locks are replaced too, as another thread may have held them at
+        # the time of the fork (so the old queue is read without its lock).
+        self._inherited.extend(self._pool.queue)
+        self._pool = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self._path,
+            timeout=5.0,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+{% endif -%}
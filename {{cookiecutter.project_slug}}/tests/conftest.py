@@ -2,10 +2,19 @@
 
 from __future__ import annotations
 
+{% if cookiecutter.project_type != "cli" -%}
+import os
+from pathlib import Path
+
+{% endif -%}
 import pytest
 {% if cookiecutter.project_type != "cli" -%}
 from fastapi.testclient import TestClient
 
+# Report ready immediately instead of after the startup grace period
+os.environ.setdefault("HEALTH_CHECK_GRACE_PERIOD", "0")
+
+from {{cookiecutter.project_slug}}.core.config import settings
 from {{cookiecutter.project_slug}}.main import app
 
 
@@ -15,6 +24,13 @@ def client() -> TestClient:
     return TestClient(app)
 
 
+@pytest.fixture
+def sqlite_settings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Configure the SQLite item store in a temporary directory."""
+    monkeypatch.setattr(settings, "item_store", "sqlite")
+    monkeypatch.setattr(settings, "sqlite_path", str(tmp_path / "items.db"))
+
+
 @pytest.fixture
 def sample_data() -> dict[str, str]:
     """Sample data for testing."""
@@ -0,0 +1,137 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for the async read-through cache."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+import pytest
+
+from {{cookiecutter.project_slug}}.services.cache import AsyncCache
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        """Start at time zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+class CountingLoader:
+    """Loader that records how often each key is loaded."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        """Optionally delay each load to let concurrent callers pile up."""
+        self.delay = delay
+        self.calls: list[str] = []
+
+    async def __call__(self, key: str) -> Optional[str]:
+        """Load a key, returning None for the key "missing"."""
+        self.calls.append(key)
+        await asyncio.sleep(self.delay)
+        return None if key == "missing" else f"value-{key}-{len(self.calls)}"
+
+
+class TestAsyncCache:
+    """Test suite for AsyncCache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_after_miss(self) -> None:
+        """Test that a loaded value is served from the cache."""
+        cache: AsyncCache[str, Optional[str]] = AsyncCache(maxsize=10, ttl=60)
+        loader = CountingLoader()
+
+        first = await cache.get_or_load("a", lambda: loader("a"))
+        second = await cache.get_or_load("a", lambda: loader("a"))
+        assert first == second
+        assert loader.calls == ["a"]
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self) -> None:
+        """Test that the least recently used entry is evicted first."""
+        cache: AsyncCache[str, Optional[str]] = AsyncCache(maxsize=2, ttl=60)
+        loader = CountingLoader()
+
+        for key in ["a", "b", "a", "c"]:
+            await cache.get_or_load(key, lambda key=key: loader(key))
+        await cache.get_or_load("a", lambda: loader("a"))
+        await cache.get_or_load("b", lambda: loader("b"))
+
+        assert loader.calls == ["a", "b", "c", "b"]
+        assert cache.stats().evictions == 2
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self) -> None:
+        """Test that entries are reloaded once their TTL has passed."""
+        clock = FakeClock()
+        cache: AsyncCache[str, Optional[str]] = AsyncCache(
+            maxsize=10, ttl=5, clock=clock
+        )
+        loader = CountingLoader()
+
+        await cache.get_or_load("a", lambda: loader("a"))
+        clock.now = 4.9
+        await cache.get_or_load("a", lambda: loader("a"))
+        clock.now = 5.0
+        await cache.get_or_load("a", lambda: loader("a"))
+
+        assert loader.calls == ["a", "a"]
+        assert cache.stats().expirations == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self) -> None:
+        """Test single-flight coalescing of concurrent misses."""
+        cache: AsyncCache[str, Optional[str]] = AsyncCache(maxsize=10, ttl=60)
+        loader = CountingLoader(delay=0.01)
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("a", lambda: loader("a")) for _ in range(10))
+        )
+        assert len(set(results)) == 1
+        assert loader.calls == ["a"]
+        assert cache.stats().coalesced == 9
+
+    @pytest.mark.asyncio
+    async def test_invalidate_detaches_inflight_load(self) -> None:
+        """Test that a load racing with an invalidation is not cached."""
+        cache: AsyncCache[str, Optional[str]] = AsyncCache(maxsize=10, ttl=60)
+        loader = CountingLoader(delay=0.01)
+
+        pending = asyncio.ensure_future(cache.get_or_load("a", lambda: loader("a")))
+        await asyncio.sleep(0)
+        cache.invalidate("a")
+        assert await pending == "value-a-1"
+
+        assert await cache.get_or_load("a", lambda: loader("a")) == "value-a-2"
+
+    @pytest.mark.asyncio
+    async def test_none_is_not_cached(self) -> None:
+        """Test that missing values always reach the loader."""
+        cache: AsyncCache[str, Optional[str]] = AsyncCache(maxsize=10, ttl=60)
+        loader = CountingLoader()
+
+        assert await cache.get_or_load("missing", lambda: loader("missing")) is None
+        assert await cache.get_or_load("missing", lambda: loader("missing")) is None
+        assert loader.calls == ["missing", "missing"]
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_not_cached(self) -> None:
+        """Test that loader errors propagate and are retried next time."""
+        cache: AsyncCache[str, Optional[str]] = AsyncCache(maxsize=10, ttl=60)
+
+        async def failing() -> Optional[str]:
+            raise RuntimeError("backend down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("a", failing)
+        assert len(cache) == 0
+{% endif -%}
@@ -25,7 +25,7 @@ def test_cli_help():
 
 
 def test_cli_version():
-    """Test CLI version command.""" 
+    """Test CLI version command."""
     result = runner.invoke(app, ["--version"])
     assert result.exit_code == 0
     assert "{{cookiecutter.project_name}}" in result.stdout
@@ -50,7 +50,39 @@ def test_hello_with_count():
     result = runner.invoke(app, ["hello", "--count", "3"])
     assert result.exit_code == 0
     assert result.stdout.count("Hello World!") == 3
+{% if cookiecutter.project_type != "cli" %}
+
+def test_loadtest_command():
+    """Test loadtest command against the in-process app."""
+    result = runner.invoke(
+        app, ["loadtest", "--rate", "50", "--duration", "0.2", "--mix", "health"]
+    )
+    assert result.exit_code == 0
+    assert "Throughput:" in result.stdout
+    assert "99.9%" in result.stdout
+
+
+def test_loadtest_invalid_mix():
+    """Test loadtest command with an unknown operation."""
+    result = runner.invoke(app, ["loadtest", "--mix", "fetch=1"])
+    assert result.exit_code == 1
+
+
+def test_seed_command(sqlite_settings):
+    """Test seed command filling a SQLite store."""
+    result = runner.invoke(app, ["seed", "120", "--seed", "5"])
+    assert result.exit_code == 0
+    assert "Added 120 items" in result.stdout
+
+    result = runner.invoke(app, ["seed", "120", "--seed", "5"])
+    assert result.exit_code == 1
 
+
+def test_seed_command_rejects_memory_store():
+    """Test seed command refusing a store that would not keep the items."""
+    result = runner.invoke(app, ["seed", "10"])
+    assert result.exit_code == 1
+{% endif %}
 {% elif cookiecutter.command_line_interface == "Click" -%}
 from click.testing import CliRunner
 
@@ -92,7 +124,40 @@ def test_hello_with_count():
     result = runner.invoke(main, ["hello", "--count", "3"])
     assert result.exit_code == 0
     assert result.output.count("Hello World!") == 3
+{% if cookiecutter.project_type != "cli" %}
+
+def test_loadtest_command():
+    """Test loadtest command against the in-process app."""
+    result = runner.invoke(main, ["loadtest", "--rate", "50", "--duration", "0.2", "--mix", "health"])
+    assert result.exit_code == 0
+    assert "Throughput:" in result.output
+    assert "99.9%" in result.output
+
+
+def test_loadtest_invalid_mix():
+    """Test loadtest command with an unknown operation."""
+    result = runner.invoke(main, ["loadtest", "--mix", "fetch=1"])
+    assert result.exit_code == 1
+    assert "Unknown operation" in result.output
+
+
+def test_seed_command(sqlite_settings):
+    """Test seed command filling a SQLite store."""
+    result = runner.invoke(main, ["seed", "120", "--seed", "5"])
+    assert result.exit_code == 0
+    assert "Added 120 items" in result.output
+
+    result = runner.invoke(main, ["seed", "120", "--seed", "5"])
+    assert result.exit_code == 1
+    assert "already holds" in result.output
 
+
+def test_seed_command_rejects_memory_store():
+    """Test seed command refusing a store that would not keep the items."""
+    result = runner.invoke(main, ["seed", "10"])
+    assert result.exit_code == 1
+    assert "memory item store" in result.output
+{% endif %}
 {% elif cookiecutter.command_line_interface == "argparse" -%}
 from {{cookiecutter.project_slug}}.cli import main
 
@@ -143,6 +208,43 @@ def test_no_command(capsys):
     captured = capsys.readouterr()
     assert result == 1
     assert "usage:" in captured.out
+{% if cookiecutter.project_type != "cli" %}
+
+def test_loadtest_command(capsys):
+    """Test loadtest command against the in-process app."""
+    result = main(["loadtest", "--rate", "50", "--duration", "0.2", "--mix", "health"])
+    captured = capsys.readouterr()
+    assert result == 0
+    assert "Throughput:" in captured.out
+    assert "99.9%" in captured.out
+
+
+def test_loadtest_invalid_mix(capsys):
+    """Test loadtest command with an unknown operation."""
+    result = main(["loadtest", "--mix", "fetch=1"])
+    captured = capsys.readouterr()
+    assert result == 1
+    assert "Unknown operation" in captured.err
+
+
+def test_seed_command(capsys, sqlite_settings):
+    """Test seed command filling a SQLite store."""
+    result = main(["seed", "120", "--seed", "5"])
+    captured = capsys.readouterr()
+    assert result == 0
+    assert "Added 120 items" in captured.out
+
+    assert main(["seed", "120", "--seed", "5"]) == 1
+    assert "already holds" in capsys.readouterr().err
+
+
+def test_seed_command_rejects_memory_store(capsys):
+    """Test seed command refusing a store that would not keep the items."""
+    result = main(["seed", "10"])
+    captured = capsys.readouterr()
+    assert result == 1
+    assert "memory item store" in captured.err
+{% endif %}
 {% endif %}
 
 
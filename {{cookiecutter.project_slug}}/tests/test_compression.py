@@ -0,0 +1,166 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for the response compression middleware."""
+
+from __future__ import annotations
+
+import gzip
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from {{cookiecutter.project_slug}}.core.compression import CompressionMiddleware
+from {{cookiecutter.project_slug}}.main import app
+
+BIG_BODY = "compressible text " * 500
+
+
+async def big(request: Request) -> Response:
+    """Response well above the size threshold."""
+    return PlainTextResponse(BIG_BODY)
+
+
+async def tagged(request: Request) -> Response:
+    """Large response with a strong ETag."""
+    return PlainTextResponse(BIG_BODY, headers={"ETag": '"v1"'})
+
+
+async def small(request: Request) -> Response:
+    """Response below the size threshold."""
+    return PlainTextResponse("ok")
+
+
+async def stream(request: Request) -> Response:
+    """Streaming response of unknown length."""
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for index in range(5):
+            yield f"chunk {index}\n".encode()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+@pytest.fixture
+def compressed_client() -> TestClient:
+    """Client for a small app wrapped in the compression middleware."""
+    app = Starlette(
+        routes=[
+            Route("/big", big),
+            Route("/tagged", tagged),
+            Route("/small", small),
+            Route("/stream", stream),
+            Route("/healthz", big),
+        ]
+    )
+    return TestClient(
+        CompressionMiddleware(app, minimum_size=100, exclude_paths=["/healthz"])
+    )
+
+
+def raw_get(
+    client: TestClient, path: str, accept_encoding: str
+) -> tuple[Response, bytes]:
+    """GET a path and return the response with its undecoded body."""
+    with client.stream(
+        "GET", path, headers={"Accept-Encoding": accept_encoding}
+    ) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestCompressionMiddleware:
+    """Test suite for CompressionMiddleware."""
+
+    def test_gzip_large_response(self, compressed_client: TestClient) -> None:
+        """Test that large bodies are gzip-compressed with a correct length."""
+        response, body = raw_get(compressed_client, "/big", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(body)
+        assert gzip.decompress(body).decode() == BIG_BODY
+
+    def test_small_response_not_compressed(self, compressed_client: TestClient) -> None:
+        """Test that bodies below the threshold are sent as-is."""
+        response, body = raw_get(compressed_client, "/small", "gzip")
+        assert "content-encoding" not in response.headers
+        assert body == b"ok"
+
+    def test_streaming_response(self, compressed_client: TestClient) -> None:
+        """Test that streamed bodies are compressed chunk by chunk."""
+        response, body = raw_get(compressed_client, "/stream", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        expected = "".join(f"chunk {index}\n" for index in range(5))
+        assert gzip.decompress(body).decode() == expected
+
+    def test_excluded_path_not_compressed(self, compressed_client: TestClient) -> None:
+        """Test that health probe paths bypass compression."""
+        response, body = raw_get(compressed_client, "/healthz", "gzip")
+        assert "content-encoding" not in response.headers
+        assert body.decode() == BIG_BODY
+
+    def test_refused_encoding(self, compressed_client: TestClient) -> None:
+        """Test that q=0 and unknown codings fall back to identity."""
+        for accept_encoding in ["gzip;q=0", "br", "identity"]:
+            response, body = raw_get(compressed_client, "/big", accept_encoding)
+            assert "content-encoding" not in response.headers, accept_encoding
+            assert body.decode() == BIG_BODY
+
+    def test_strong_etag_weakened(self, compressed_client: TestClient) -> None:
+        """Test that compressing a response makes its ETag weak."""
+        response, _ = raw_get(compressed_client, "/tagged", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == 'W/"v1"'
+
+        response, _ = raw_get(compressed_client, "/tagged", "identity")
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == '"v1"'
+
+    def test_zstd_preferred(self, compressed_client: TestClient) -> None:
+        """Test that zstd is used when installed and accepted."""
+        zstandard = pytest.importorskip("zstandard")
+        response, body = raw_get(compressed_client, "/stream", "gzip, zstd")
+        assert response.headers["content-encoding"] == "zstd"
+        decoded = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+        assert decoded.decode() == "".join(f"chunk {index}\n" for index in range(5))
+
+
+def test_item_listing_is_compressed(client: TestClient) -> None:
+    """Test that the application compresses large item listings."""
+    client.post(
+        "/api/v1/items/bulk",
+        json=[{"name": f"Compressed {index}", "price": 1.0} for index in range(50)],
+    )
+    response = client.get("/api/v1/items/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) >= 50
+
+
+def test_compressed_item_has_weak_etag() -> None:
+    """Test that a compressed item response carries a weak ETag that still revalidates."""
+    # Item bodies are below the default threshold; compress everything instead
+    client = TestClient(CompressionMiddleware(app, minimum_size=0))
+    created = client.post(
+        "/api/v1/items/",
+        json={"name": "Weak ETag", "description": "x" * 400, "price": 1.0},
+    ).json()
+    path = f"/api/v1/items/{created['id']}"
+
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    identity = client.get(path, headers={"Accept-Encoding": "identity"})
+    assert identity.headers["etag"] == etag[2:]
+
+    revalidated = client.get(
+        path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+{% endif -%}
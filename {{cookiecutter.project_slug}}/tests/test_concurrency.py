@@ -0,0 +1,210 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for adaptive concurrency limiting and load shedding."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from {{cookiecutter.project_slug}}.core.concurrency import (
+    AIMDLimit,
+    ConcurrencyLimiter,
+    ConcurrencyLimitMiddleware,
+)
+
+
+class BlockingApp:
+    """ASGI app whose requests wait until released."""
+
+    def __init__(self) -> None:
+        """Start with requests blocked."""
+        self.release = asyncio.Event()
+        self.started = 0
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        """Respond 200 once released."""
+        self.started += 1
+        await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        """Start at time zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+class StreamingApp:
+    """ASGI app that starts its response after a delay, then streams slowly."""
+
+    def __init__(self, start_delay: float, chunks: int, chunk_delay: float) -> None:
+        """Set the delays of the response start and of each body chunk."""
+        self.start_delay = start_delay
+        self.chunks = chunks
+        self.chunk_delay = chunk_delay
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        """Respond 200 with a slowly streamed body."""
+        await asyncio.sleep(self.start_delay)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for _ in range(self.chunks):
+            await asyncio.sleep(self.chunk_delay)
+            await send({"type": "http.response.body", "body": b"x", "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+
+async def call(
+    app: Any, path: str = "/api/v1/items/", method: str = "GET"
+) -> dict[str, Any]:
+    """Send one request through an ASGI app and return its response start message."""
+    messages: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": []}
+    await app(scope, receive, send)
+    return messages[0]
+
+
+class TestAIMDLimit:
+    """Test suite for AIMDLimit."""
+
+    def test_backs_off_on_slow_requests_and_recovers(self) -> None:
+        """Test multiplicative decrease and additive increase within bounds."""
+        clock = FakeClock()
+        limit = AIMDLimit(
+            max_limit=10,
+            min_limit=2,
+            latency_target=0.1,
+            backoff_ratio=0.5,
+            clock=clock,
+        )
+
+        limit.on_sample(0.5, in_flight=10)
+        assert limit.limit == 5
+        # At most one decrease per latency window
+        limit.on_sample(0.5, in_flight=10)
+        assert limit.limit == 5
+        for _ in range(5):
+            clock.now += 0.1
+            limit.on_sample(0.5, in_flight=5)
+        assert limit.limit == 2
+
+        limit.on_sample(0.01, in_flight=2)
+        assert limit.limit == 3
+        # Barely used limits do not grow
+        limit.on_sample(0.01, in_flight=1)
+        assert limit.limit == 3
+        for _ in range(20):
+            limit.on_sample(0.01, in_flight=10)
+        assert limit.limit == 10
+
+
+class TestConcurrencyLimiter:
+    """Test suite for ConcurrencyLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_waiters_get_freed_slots_in_order(self) -> None:
+        """Test that released slots go to queued requests first come, first served."""
+        limiter = ConcurrencyLimiter(AIMDLimit(max_limit=1), max_queue=2, max_wait=1)
+        assert await limiter.acquire() == ""
+
+        first = asyncio.create_task(limiter.acquire())
+        second = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert await limiter.acquire() == "queue_full"
+
+        limiter.release()
+        assert await first == ""
+        assert not second.done()
+        limiter.release()
+        assert await second == ""
+        assert limiter.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_waiting_is_bounded_by_deadline(self) -> None:
+        """Test that a queued request gives up after max_wait."""
+        limiter = ConcurrencyLimiter(AIMDLimit(max_limit=1), max_queue=5, max_wait=0.01)
+        await limiter.acquire()
+
+        assert await limiter.acquire() == "timeout"
+
+        limiter.release()
+        assert limiter.in_flight == 0
+        assert await limiter.acquire() == ""
+
+
+class TestConcurrencyLimitMiddleware:
+    """Test suite for ConcurrencyLimitMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_excess_requests_get_503_with_retry_after(self) -> None:
+        """Test load shedding, per-group limits and exempt health paths."""
+        app = BlockingApp()
+        middleware = ConcurrencyLimitMiddleware(
+            app,
+            max_limits={"read": 1, "write": 1},
+            max_queue=0,
+            max_wait=0.5,
+            exempt_paths=["/healthz"],
+        )
+
+        held = asyncio.create_task(call(middleware))
+        await asyncio.sleep(0)
+
+        rejected = await call(middleware)
+        assert rejected["status"] == 503
+        assert (b"retry-after", b"1") in rejected["headers"]
+
+        # Writes have their own slots, and probes are never limited
+        write = asyncio.create_task(call(middleware, method="POST"))
+        probe = asyncio.create_task(call(middleware, path="/healthz"))
+        await asyncio.sleep(0)
+        assert app.started == 3
+
+        app.release.set()
+        assert (await held)["status"] == 200
+        assert (await write)["status"] == 200
+        assert (await probe)["status"] == 200
+        assert (await call(middleware))["status"] == 200
+
+    @pytest.mark.asyncio
+    async def test_slow_streaming_does_not_lower_the_limit(self) -> None:
+        """Test that latency is measured to the response start, not the body end."""
+        middleware = ConcurrencyLimitMiddleware(
+            StreamingApp(start_delay=0, chunks=5, chunk_delay=0.02),
+            max_limits={"read": 10},
+            latency_target=0.05,
+        )
+
+        responses = await asyncio.gather(*(call(middleware) for _ in range(8)))
+
+        assert all(response["status"] == 200 for response in responses)
+        assert middleware.limiters["read"].limit.limit == 10
+
+    @pytest.mark.asyncio
+    async def test_burst_of_slow_responses_lowers_the_limit_once(self) -> None:
+        """Test that slow requests of one latency window count as one overload signal."""
+        middleware = ConcurrencyLimitMiddleware(
+            StreamingApp(start_delay=0.1, chunks=0, chunk_delay=0),
+            max_limits={"read": 10},
+            latency_target=0.05,
+        )
+
+        await asyncio.gather(*(call(middleware) for _ in range(8)))
+
+        assert middleware.limiters["read"].limit.limit == 9
+{% endif -%}
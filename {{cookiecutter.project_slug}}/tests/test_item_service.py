@@ -0,0 +1,455 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for the item service layer."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from {{cookiecutter.project_slug}}.models.item import ItemCreate, ItemUpdate
+from {{cookiecutter.project_slug}}.services.item_service import CachedItemService, ItemService
+from {{cookiecutter.project_slug}}.services.seeding import generate_items
+from {{cookiecutter.project_slug}}.services.storage import (
+    DuplicateItemError,
+    DurableItemStore,
+    InMemoryItemStore,
+    ItemStore,
+    SharedItemStore,
+    SQLiteItemStore,
+    StaleItemError,
+    sort_key,
+)
+
+
+@pytest.fixture(params=["memory", "durable", "sqlite", "shared"])
+def store(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[ItemStore]:
+    """Empty item store for each storage backend."""
+    if request.param == "sqlite":
+        backend: ItemStore = SQLiteItemStore(str(tmp_path / "items.db"))
+    elif request.param == "shared":
+        backend = SharedItemStore(str(tmp_path / "items.log"))
+    elif request.param == "durable":
+        backend = DurableItemStore(str(tmp_path / "wal"))
+    else:
+        backend = InMemoryItemStore()
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def service(store: ItemStore) -> ItemService:
+    """Fresh item service with only the built-in sample data."""
+    return ItemService(store)
+
+
+class TestItemService:
+    """Test suite for ItemService behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_get_items_ordered_by_created_at(self, service: ItemService) -> None:
+        """Test that listing returns items in creation order."""
+        for index in range(5):
+            await service.create_item(ItemCreate(name=f"Ordered {index}", price=1.0))
+
+        items = await service.get_items(limit=1000)
+        created = [item.created_at for item in items]
+        assert created == sorted(created)
+        assert [item.name for item in items[-5:]] == [f"Ordered {i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_get_items_pagination_matches_full_listing(
+        self, service: ItemService
+    ) -> None:
+        """Test that skip/limit pages are slices of the full ordering."""
+        for index in range(10):
+            await service.create_item(ItemCreate(name=f"Page {index}", price=1.0))
+
+        everything = await service.get_items(limit=1000)
+        page = await service.get_items(skip=4, limit=3)
+        assert [item.id for item in page] == [item.id for item in everything[4:7]]
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_item_from_listing(self, service: ItemService) -> None:
+        """Test that deleted items disappear from listings and searches."""
+        item = await service.create_item(ItemCreate(name="Short-lived", price=1.0))
+        assert await service.delete_item(item.id)
+
+        listed = await service.get_items(limit=1000)
+        assert item.id not in {listed_item.id for listed_item in listed}
+        assert await service.search_items("short-lived") == []
+        assert len(listed) == await service.get_item_count()
+
+    @pytest.mark.asyncio
+    async def test_search_matches_substring_scan(self, service: ItemService) -> None:
+        """Test that indexed search agrees with a case-insensitive scan."""
+        names = ["Gaming Laptop", "laptop stand", "LAPTOP SLEEVE", "Desk Lamp", "Ab"]
+        for name in names:
+            await service.create_item(ItemCreate(name=name, price=1.0))
+
+        everything = await service.get_items(limit=1000)
+        for query in ["laptop", "Top S", "la", "a", "ab", "missing", "LAMP"]:
+            expected = [i.id for i in everything if query.lower() in i.name.lower()]
+            found = await service.search_items(query, limit=1000)
+            assert [item.id for item in found] == expected, query
+
+    @pytest.mark.asyncio
+    async def test_search_follows_renames(self, service: ItemService) -> None:
+        """Test that updating a name re-indexes the item."""
+        item = await service.create_item(ItemCreate(name="Old Widget", price=1.0))
+        await service.update_item(item.id, ItemUpdate(name="Shiny Gadget"))
+
+        assert await service.search_items("old widget") == []
+        assert [found.id for found in await service.search_items("gadget")] == [item.id]
+
+    @pytest.mark.asyncio
+    async def test_invalid_merged_update_is_not_stored(
+        self, service: ItemService
+    ) -> None:
+        """Test that an update producing an invalid item fails before any write."""
+        item = await service.create_item(ItemCreate(name="Kept Name", price=1.0))
+        version = await service.get_version()
+
+        # model_construct bypasses ItemUpdate's own checks
+        with pytest.raises(ValidationError):
+            await service.update_item(item.id, ItemUpdate.model_construct(name=None))
+
+        assert await service.get_item(item.id) == item
+        assert await service.get_version() == version
+        assert [found.id for found in await service.search_items("kept name")] == [
+            item.id
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_page_resumes_after_cursor(self, service: ItemService) -> None:
+        """Test that cursor search pages cover every match exactly once."""
+        for index in range(7):
+            await service.create_item(ItemCreate(name=f"Widget {index}", price=1.0))
+
+        seen: list[str] = []
+        page = await service.search_items_page("widget", limit=3)
+        seen.extend(item.name for item in page.items)
+        while page.next_cursor:
+            page = await service.search_items_page("widget", page.next_cursor, limit=3)
+            seen.extend(item.name for item in page.items)
+        assert seen == [f"Widget {index}" for index in range(7)]
+
+    @pytest.mark.asyncio
+    async def test_batch_operations(self, service: ItemService) -> None:
+        """Test batch create, update and delete against every backend."""
+        created = await service.create_items(
+            [ItemCreate(name=f"Batch {index}", price=1.0) for index in range(3)]
+        )
+        assert len({item.id for item in created}) == 3
+        assert len({item.created_at for item in created}) == 1
+
+        listed = await service.get_items(limit=1000)
+        assert {item.id for item in created} <= {item.id for item in listed}
+
+        updated = await service.update_items(
+            [(created[0].id, ItemUpdate(price=9.5)), ("missing", ItemUpdate(price=1.0))]
+        )
+        assert updated[0] is not None and updated[0].price == 9.5
+        assert updated[1] is None
+
+        ids = [created[1].id, created[1].id, "missing"]
+        assert await service.delete_items(ids) == [True, False, False]
+        assert await service.get_item(created[1].id) is None
+
+    def test_store_rejects_duplicate_ids(self, store: ItemStore) -> None:
+        """Test that adding a stored or repeated ID fails and stores nothing."""
+        first, second = next(generate_items(2))
+        store.add(first)
+        version = store.version()
+
+        with pytest.raises(DuplicateItemError):
+            store.add(first.model_copy(update={"name": "Overwritten"}))
+        with pytest.raises(DuplicateItemError):
+            store.add_many([second, first])
+        with pytest.raises(DuplicateItemError):
+            store.add_many([second, second])
+
+        assert store.list_page(0, 10) == [first]
+        assert store.version() == version
+
+    @pytest.mark.asyncio
+    async def test_iter_items_covers_store_in_order(self, service: ItemService) -> None:
+        """Test that batched iteration yields every item once, in order."""
+        await service.create_items([ItemCreate(name="Iterated", price=1.0)] * 4)
+
+        batches = [batch async for batch in service.iter_items(batch_size=2)]
+        assert all(len(batch) <= 2 for batch in batches)
+        iterated = [item.id for batch in batches for item in batch]
+        assert iterated == [item.id for item in await service.get_items(limit=1000)]
+
+    @pytest.mark.asyncio
+    async def test_version_changes_on_every_write(self, service: ItemService) -> None:
+        """Test that the collection version moves on create, update and delete."""
+        versions = [await service.get_version()]
+        item = await service.create_item(ItemCreate(name="Versioned", price=1.0))
+        versions.append(await service.get_version())
+        await service.update_item(item.id, ItemUpdate(price=2.0))
+        versions.append(await service.get_version())
+        await service.delete_item(item.id)
+        versions.append(await service.get_version())
+        assert len(set(versions)) == 4
+
+        await service.get_items()
+        assert await service.get_version() == versions[-1]
+
+    @pytest.mark.asyncio
+    async def test_conditional_writes_reject_stale_items(
+        self, service: ItemService
+    ) -> None:
+        """Test that expected_updated_at guards update and delete."""
+        item = await service.create_item(ItemCreate(name="Guarded", price=1.0))
+        updated = await service.update_item(
+            item.id, ItemUpdate(price=2.0), expected_updated_at=item.updated_at
+        )
+        assert updated is not None
+
+        with pytest.raises(StaleItemError):
+            await service.update_item(
+                item.id, ItemUpdate(price=3.0), expected_updated_at=item.updated_at
+            )
+        with pytest.raises(StaleItemError):
+            await service.delete_item(item.id, expected_updated_at=item.updated_at)
+        assert await service.delete_item(
+            item.id, expected_updated_at=updated.updated_at
+        )
+
+    @pytest.mark.asyncio
+    async def test_seed_items_adds_generated_catalog(self, store: ItemStore) -> None:
+        """Test that seeding fills the store with the generated catalog."""
+        service = ItemService(store, sample_data=False)
+        assert await service.get_item_count() == 0
+
+        assert await service.seed_items(250, seed=7, batch_size=100) == 250
+
+        items = await service.get_items(limit=1000)
+        assert len(items) == 250
+        generated = [item for batch in generate_items(250, seed=7) for item in batch]
+        assert items == sorted(generated, key=sort_key)
+        assert await service.search_items(items[0].name.split()[-1])
+
+
+class TestCachedItemService:
+    """Test suite for the caching ItemService wrapper."""
+
+    @pytest.fixture
+    def cached(self, store: ItemStore) -> CachedItemService:
+        """Cached item service over each storage backend."""
+        return CachedItemService(store, max_items=100, max_queries=100, ttl=60)
+
+    @pytest.mark.asyncio
+    async def test_reads_are_cached(self, cached: CachedItemService) -> None:
+        """Test that repeated reads are served from the cache."""
+        item = await cached.create_item(ItemCreate(name="Cached", price=1.0))
+        for _ in range(3):
+            assert await cached.get_item(item.id) == item
+            await cached.get_items()
+            await cached.search_items("cached")
+
+        stats = cached.cache_stats()
+        assert (stats["items"].misses, stats["items"].hits) == (1, 2)
+        assert (stats["queries"].misses, stats["queries"].hits) == (2, 4)
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate(self, cached: CachedItemService) -> None:
+        """Test that writes are visible through every cached read."""
+        item = await cached.create_item(ItemCreate(name="Before", price=1.0))
+        await cached.get_item(item.id)
+        await cached.get_items(limit=1000)
+        await cached.search_items("before")
+
+        await cached.update_item(item.id, ItemUpdate(name="After"))
+        fetched = await cached.get_item(item.id)
+        assert fetched is not None and fetched.name == "After"
+        assert await cached.search_items("before") == []
+        listed = {i.id: i.name for i in await cached.get_items(limit=1000)}
+        assert listed[item.id] == "After"
+
+        created = await cached.create_items([ItemCreate(name="Batch", price=1.0)])
+        listed = {i.id for i in await cached.get_items(limit=1000)}
+        assert created[0].id in listed
+
+        await cached.delete_items([item.id])
+        assert await cached.get_item(item.id) is None
+        assert item.id not in {i.id for i in await cached.get_items(limit=1000)}
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_persists_across_instances(tmp_path: Path) -> None:
+    """Test that the SQLite store keeps items across service restarts."""
+    path = str(tmp_path / "items.db")
+    first = ItemService(SQLiteItemStore(path))
+    created = await first.create_item(ItemCreate(name="Durable", price=2.5, tax=0.25))
+    first.close()
+
+    reopened = ItemService(SQLiteItemStore(path))
+    try:
+        assert await reopened.get_item(created.id) == created
+        # Sample data is only seeded into an empty store
+        assert await reopened.get_item_count() == 4
+    finally:
+        reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_name_index_follows_writes(tmp_path: Path) -> None:
+    """Test that indexed SQLite search sees renames, deletes and quoted queries."""
+    path = str(tmp_path / "items.db")
+    service = ItemService(SQLiteItemStore(path))
+    try:
+        item = await service.create_item(
+            ItemCreate(name='The "Blue" Widget', price=1.0)
+        )
+        assert [i.id for i in await service.search_items('"blue"')] == [item.id]
+
+        await service.update_item(item.id, ItemUpdate(name="Red Widget"))
+        assert await service.search_items("blue") == []
+        assert [i.id for i in await service.search_items("red wid")] == [item.id]
+
+        await service.delete_item(item.id)
+        assert await service.search_items("red wid") == []
+        page = await service.search_items_page("widget")
+        assert page.items == []
+    finally:
+        service.close()
+
+    # A database whose index went missing is indexed again on open
+    with sqlite3.connect(path) as conn:
+        conn.execute("DROP TABLE items_name_fts")
+    reopened = ItemService(SQLiteItemStore(path))
+    try:
+        assert [i.name for i in await reopened.search_items("keyb")] == ["Keyboard"]
+    finally:
+        reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_durable_store_recovers_from_log_and_snapshot(tmp_path: Path) -> None:
+    """Test that the durable store restores its items, with and without snapshots."""
+    directory = str(tmp_path / "wal")
+    first = ItemService(DurableItemStore(directory, snapshot_bytes=2048))
+    created = await first.create_items(
+        [ItemCreate(name=f"Logged {index}", price=1.0) for index in range(40)]
+    )
+    updated = await first.update_item(
+        created[0].id, ItemUpdate(name="Renamed", tax=None)
+    )
+    await first.delete_item(created[1].id)
+    expected = await first.get_items(limit=1000)
+    first.close()
+
+    # Snapshots replaced the segments they cover
+    files = sorted(os.listdir(directory))
+    assert "snapshot" in files
+    assert len([name for name in files if name.startswith("wal.")]) <= 2
+    # A write torn by a crash is ignored
+    with open(os.path.join(directory, files[-1]), "ab") as segment:
+        segment.write(b"\x50\x00\x00\x00torn")
+
+    reopened = ItemService(DurableItemStore(directory))
+    try:
+        assert await reopened.get_items(limit=1000) == expected
+        assert await reopened.get_item(created[0].id) == updated
+        assert await reopened.get_item(created[1].id) is None
+        assert [item.id for item in await reopened.search_items("renamed")] == [
+            updated.id
+        ]
+        with pytest.raises(RuntimeError):
+            DurableItemStore(directory)
+    finally:
+        reopened.close()
+
+
+def test_memory_store_replace_requires_existing_item() -> None:
+    """Test that replacing a missing item fails instead of leaving it unindexed."""
+    store = InMemoryItemStore()
+    item = next(generate_items(1))[0]
+
+    with pytest.raises(KeyError):
+        store.replace(item)
+    assert store.count() == 0
+    assert store.list_page(0, 10) == []
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_sqlite_store_is_fork_safe(tmp_path: Path) -> None:
+    """Test that a forked process opens its own connections."""
+    store = SQLiteItemStore(str(tmp_path / "items.db"))
+    inherited = store._pool.queue[-1]
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            ok = store.count() == 0 and store._pool.queue[-1] is not inherited
+        finally:
+            os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert store._pool.queue[-1] is inherited
+    assert store.count() == 0
+    store.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_shared_store_is_shared_between_processes(tmp_path: Path) -> None:
+    """Test that writes from a forked process are visible to its parent and back."""
+    path = str(tmp_path / "items.log")
+    parent = SharedItemStore(path)
+    service = ItemService(parent)
+    sample = service._store.list_page(0, 1)[0]
+
+    pid = os.fork()
+    if pid == 0:
+        ok = False
+        try:
+            # Inherited instance and a fresh one see the same data
+            child = SharedItemStore(path)
+            deleted = parent.delete(sample.id)
+            ok = (
+                deleted == sample
+                and child.get(sample.id) is None
+                and child.count() == 2
+            )
+            child.close()
+        finally:
+            os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert parent.get(sample.id) is None
+    assert [item.id for item in parent.list_page(0, 10)] == [
+        item.id for item in SharedItemStore(path).list_page(0, 10)
+    ]
+    parent.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_store_compacts_and_reopens(tmp_path: Path) -> None:
+    """Test that compaction keeps live items and other instances follow the new file."""
+    path = str(tmp_path / "items.log")
+    writer = ItemService(SharedItemStore(path, compact_min_bytes=0))
+    reader = SharedItemStore(path)
+    item = await writer.create_item(ItemCreate(name="Churn", price=1.0))
+    for index in range(20):
+        item = await writer.update_item(item.id, ItemUpdate(price=index + 1.0))
+    version = reader.version()
+
+    # Compacted at least once, back to the initial file size
+    assert version.split("-")[1] != "0"
+    assert os.path.getsize(path) == 1 << 20
+    assert reader.get(item.id) == item
+    assert reader.count() == 4
+    assert reader.version() == version
+    assert reader.search_page("churn", 0, 10) == ([item], 1)
+    writer.close()
+    reader.close()
+{% endif -%}
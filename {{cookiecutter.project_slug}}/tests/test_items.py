@@ -3,10 +3,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import csv
+import io
+import json
+from http import HTTPStatus
+
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from {{cookiecutter.project_slug}}.api.v1.endpoints import items as items_endpoints
+from {{cookiecutter.project_slug}}.core.config import settings
+from {{cookiecutter.project_slug}}.models.item import ItemCreate
+from {{cookiecutter.project_slug}}.services.item_service import CachedItemService, ItemService
+from {{cookiecutter.project_slug}}.services.storage import InMemoryItemStore
+
 
 class TestItemsAPI:
     """Test suite for items CRUD operations."""
@@ -15,12 +27,12 @@ class TestItemsAPI:
         """Test listing all items."""
         response = client.get("/api/v1/items/")
         assert response.status_code == status.HTTP_200_OK
-        
+
         data = response.json()
         assert isinstance(data, list)
         # Should have sample items from initialization
         assert len(data) > 0
-        
+
         # Check structure of first item
         if data:
             item = data[0]
@@ -35,11 +47,41 @@ class TestItemsAPI:
         # Test with skip
         response = client.get("/api/v1/items/?skip=1&limit=2")
         assert response.status_code == status.HTTP_200_OK
-        
+
         data = response.json()
         assert isinstance(data, list)
         assert len(data) <= 2
 
+    def test_list_items_cursor_pagination(self, client: TestClient) -> None:
+        """Test walking all items with cursor pagination."""
+        expected = [
+            item["id"] for item in client.get("/api/v1/items/?limit=1000").json()
+        ]
+
+        seen: list[str] = []
+        cursor = ""
+        while cursor is not None:
+            response = client.get(
+                "/api/v1/items/", params={"after": cursor, "limit": 2}
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+            page = response.json()
+            assert page["limit"] == 2
+            assert len(page["items"]) <= 2
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+
+        assert seen == expected
+
+    def test_list_items_invalid_cursor(self, client: TestClient) -> None:
+        """Test that malformed cursors are rejected."""
+        response = client.get("/api/v1/items/?after=not-a-cursor")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = client.get("/api/v1/items/?after=&skip=1")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_create_item(self, client: TestClient) -> None:
         """Test creating a new item."""
         item_data = {
@@ -48,10 +90,10 @@ class TestItemsAPI:
             "price": 99.99,
             "tax": 9.99,
         }
-        
+
         response = client.post("/api/v1/items/", json=item_data)
         assert response.status_code == status.HTTP_201_CREATED
-        
+
         data = response.json()
         assert data["name"] == item_data["name"]
         assert data["description"] == item_data["description"]
@@ -66,18 +108,14 @@ class TestItemsAPI:
         # Missing required field
         response = client.post("/api/v1/items/", json={"description": "No name"})
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
-        
+
         # Invalid price (negative)
-        response = client.post(
-            "/api/v1/items/",
-            json={"name": "Test", "price": -10.00}
-        )
+        response = client.post("/api/v1/items/", json={"name": "Test", "price": -10.00})
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
-        
+
         # Invalid tax (negative)
         response = client.post(
-            "/api/v1/items/",
-            json={"name": "Test", "price": 10.00, "tax": -5.00}
+            "/api/v1/items/", json={"name": "Test", "price": 10.00, "tax": -5.00}
         )
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
@@ -85,16 +123,15 @@ class TestItemsAPI:
         """Test getting a single item."""
         # First create an item
         create_response = client.post(
-            "/api/v1/items/",
-            json={"name": "Get Test Item", "price": 49.99}
+            "/api/v1/items/", json={"name": "Get Test Item", "price": 49.99}
         )
         assert create_response.status_code == status.HTTP_201_CREATED
         item_id = create_response.json()["id"]
-        
+
         # Now get the item
         response = client.get(f"/api/v1/items/{item_id}")
         assert response.status_code == status.HTTP_200_OK
-        
+
         data = response.json()
         assert data["id"] == item_id
         assert data["name"] == "Get Test Item"
@@ -104,7 +141,7 @@ class TestItemsAPI:
         """Test getting a non-existent item."""
         response = client.get("/api/v1/items/nonexistent-id")
         assert response.status_code == status.HTTP_404_NOT_FOUND
-        
+
         data = response.json()
         assert "detail" in data
         assert "not found" in data["detail"].lower()
@@ -113,12 +150,11 @@ class TestItemsAPI:
         """Test updating an item."""
         # First create an item
         create_response = client.post(
-            "/api/v1/items/",
-            json={"name": "Update Test Item", "price": 29.99}
+            "/api/v1/items/", json={"name": "Update Test Item", "price": 29.99}
         )
         assert create_response.status_code == status.HTTP_201_CREATED
         item_id = create_response.json()["id"]
-        
+
         # Update the item
         update_data = {
             "name": "Updated Item",
@@ -127,7 +163,7 @@ class TestItemsAPI:
         }
         response = client.put(f"/api/v1/items/{item_id}", json=update_data)
         assert response.status_code == status.HTTP_200_OK
-        
+
         data = response.json()
         assert data["id"] == item_id
         assert data["name"] == "Updated Item"
@@ -142,47 +178,61 @@ class TestItemsAPI:
             json={
                 "name": "Partial Update Test",
                 "description": "Original description",
-                "price": 19.99
-            }
+                "price": 19.99,
+            },
         )
         assert create_response.status_code == status.HTTP_201_CREATED
         item_id = create_response.json()["id"]
-        
+
         # Partial update - only change price
         response = client.put(f"/api/v1/items/{item_id}", json={"price": 24.99})
         assert response.status_code == status.HTTP_200_OK
-        
+
         data = response.json()
         assert data["name"] == "Partial Update Test"  # Unchanged
         assert data["description"] == "Original description"  # Unchanged
         assert data["price"] == 24.99  # Updated
 
+    def test_update_rejects_null_required_fields(self, client: TestClient) -> None:
+        """Test that null name or price is a 422 and leaves the item unchanged."""
+        created = client.post(
+            "/api/v1/items/", json={"name": "Nullable Name", "price": 5.0}
+        )
+        item_id = created.json()["id"]
+
+        for update in ({"name": None}, {"price": None}):
+            response = client.put(f"/api/v1/items/{item_id}", json=update)
+            assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        response = client.put(f"/api/v1/items/{item_id}", json={"description": None})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == "Nullable Name"
+        assert response.json()["price"] == 5.0
+        found = client.get("/api/v1/items/search/?q=nullable name").json()
+        assert [item["id"] for item in found] == [item_id]
+
     def test_update_nonexistent_item(self, client: TestClient) -> None:
         """Test updating a non-existent item."""
-        response = client.put(
-            "/api/v1/items/nonexistent-id",
-            json={"name": "New Name"}
-        )
+        response = client.put("/api/v1/items/nonexistent-id", json={"name": "New Name"})
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_delete_item(self, client: TestClient) -> None:
         """Test deleting an item."""
         # First create an item
         create_response = client.post(
-            "/api/v1/items/",
-            json={"name": "Delete Test Item", "price": 9.99}
+            "/api/v1/items/", json={"name": "Delete Test Item", "price": 9.99}
         )
         assert create_response.status_code == status.HTTP_201_CREATED
         item_id = create_response.json()["id"]
-        
+
         # Delete the item
         response = client.delete(f"/api/v1/items/{item_id}")
         assert response.status_code == status.HTTP_200_OK
-        
+
         data = response.json()
         assert "message" in data
         assert "deleted successfully" in data["message"]
-        
+
         # Verify item is deleted
         get_response = client.get(f"/api/v1/items/{item_id}")
         assert get_response.status_code == status.HTTP_404_NOT_FOUND
@@ -196,22 +246,15 @@ class TestItemsAPI:
         """Test searching items by name."""
         # Create items with specific names
         client.post(
-            "/api/v1/items/",
-            json={"name": "Search Test Alpha", "price": 10.00}
+            "/api/v1/items/", json={"name": "Search Test Alpha", "price": 10.00}
         )
-        client.post(
-            "/api/v1/items/",
-            json={"name": "Search Test Beta", "price": 20.00}
-        )
-        client.post(
-            "/api/v1/items/",
-            json={"name": "Different Item", "price": 30.00}
-        )
-        
+        client.post("/api/v1/items/", json={"name": "Search Test Beta", "price": 20.00})
+        client.post("/api/v1/items/", json={"name": "Different Item", "price": 30.00})
+
         # Search for "Search Test"
         response = client.get("/api/v1/items/search/?q=Search Test")
         assert response.status_code == status.HTTP_200_OK
-        
+
         data = response.json()
         assert len(data) >= 2
         for item in data:
@@ -222,15 +265,14 @@ class TestItemsAPI:
         """Test that search is case-insensitive."""
         # Create an item
         client.post(
-            "/api/v1/items/",
-            json={"name": "CaseSensitiveTest", "price": 15.00}
+            "/api/v1/items/", json={"name": "CaseSensitiveTest", "price": 15.00}
         )
-        
+
         # Search with different cases
         for query in ["casesensitive", "CASESENSITIVE", "CaseSensitive"]:
             response = client.get(f"/api/v1/items/search/?q={query}")
             assert response.status_code == status.HTTP_200_OK
-            
+
             data = response.json()
             found = any("casesensitive" in item["name"].lower() for item in data)
             assert found, f"Should find item with query '{query}'"
@@ -239,24 +281,330 @@ class TestItemsAPI:
         """Test searching items with pagination."""
         response = client.get("/api/v1/items/search/?q=test&skip=0&limit=1")
         assert response.status_code == status.HTTP_200_OK
-        
+
         data = response.json()
         assert len(data) <= 1
 
+    def test_search_items_cursor_pagination(self, client: TestClient) -> None:
+        """Test searching items with cursor pagination."""
+        for suffix in ["One", "Two", "Three"]:
+            client.post(
+                "/api/v1/items/", json={"name": f"Cursor {suffix}", "price": 1.00}
+            )
+
+        first = client.get("/api/v1/items/search/?q=cursor&after=&limit=2").json()
+        assert len(first["items"]) == 2
+        assert first["next_cursor"] is not None
+
+        second = client.get(
+            "/api/v1/items/search/",
+            params={"q": "cursor", "after": first["next_cursor"], "limit": 2},
+        ).json()
+        names = [item["name"] for item in first["items"] + second["items"]]
+        assert names[:3] == ["Cursor One", "Cursor Two", "Cursor Three"]
+
     def test_search_items_empty_query(self, client: TestClient) -> None:
         """Test that empty search query returns validation error."""
         response = client.get("/api/v1/items/search/?q=")
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    def test_bulk_create_items(self, client: TestClient) -> None:
+        """Test creating items in bulk with per-item status."""
+        response = client.post(
+            "/api/v1/items/bulk",
+            json=[
+                {"name": "Bulk One", "price": 1.00},
+                {"name": "Bulk Invalid", "price": -1.00},
+                {"name": "Bulk Two", "price": 2.00},
+            ],
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["succeeded"] == 2
+        assert data["failed"] == 1
+        assert [result["status"] for result in data["results"]] == [
+            "created",
+            "invalid",
+            "created",
+        ]
+        assert "price" in data["results"][1]["error"]
+
+        created_id = data["results"][0]["id"]
+        assert client.get(f"/api/v1/items/{created_id}").json()["name"] == "Bulk One"
+
+    def test_bulk_create_items_ndjson(self, client: TestClient) -> None:
+        """Test creating items from an NDJSON body."""
+        body = '{"name": "Stream A", "price": 1.5}\nnot json\n{"name": "Stream B", "price": 2.5}\n'
+        response = client.post(
+            "/api/v1/items/bulk",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        statuses = [result["status"] for result in response.json()["results"]]
+        assert statuses == ["created", "invalid", "created"]
+
+    def test_bulk_update_and_delete_items(self, client: TestClient) -> None:
+        """Test updating and deleting items in bulk."""
+        created = client.post(
+            "/api/v1/items/bulk",
+            json=[{"name": "Bulk Edit", "price": 3.00}],
+        ).json()
+        item_id = created["results"][0]["id"]
+
+        response = client.patch(
+            "/api/v1/items/bulk",
+            json=[
+                {"id": item_id, "price": 4.00},
+                {"id": "nonexistent-id", "price": 1.00},
+            ],
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["status"] for r in response.json()["results"]] == [
+            "updated",
+            "not_found",
+        ]
+        assert client.get(f"/api/v1/items/{item_id}").json()["price"] == 4.00
+
+        response = client.request(
+            "DELETE", "/api/v1/items/bulk", json=[item_id, {"id": item_id}, 42]
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["status"] for r in response.json()["results"]] == [
+            "deleted",
+            "not_found",
+            "invalid",
+        ]
+        assert (
+            client.get(f"/api/v1/items/{item_id}").status_code
+            == status.HTTP_404_NOT_FOUND
+        )
+
+    def test_bulk_update_rejects_null_required_fields(self, client: TestClient) -> None:
+        """Test that a bulk update nulling a required field is an invalid entry."""
+        created = client.post(
+            "/api/v1/items/bulk",
+            json=[{"name": "Bulk Null", "price": 3.00}],
+        ).json()
+        item_id = created["results"][0]["id"]
+
+        response = client.patch(
+            "/api/v1/items/bulk",
+            json=[{"id": item_id, "name": None}, {"id": item_id, "price": 4.00}],
+        )
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == ["invalid", "updated"]
+        assert "name" in results[0]["error"]
+
+        item = client.get(f"/api/v1/items/{item_id}").json()
+        assert (item["name"], item["price"]) == ("Bulk Null", 4.00)
+        found = client.get("/api/v1/items/search/?q=bulk null").json()
+        assert [found_item["id"] for found_item in found] == [item_id]
+
+    def test_bulk_rejects_non_array_body(self, client: TestClient) -> None:
+        """Test that a JSON body must be an array."""
+        response = client.post(
+            "/api/v1/items/bulk", json={"name": "Lonely", "price": 1.00}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_rejects_too_many_records(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the record limit: 413 for a JSON array, a cut-off NDJSON stream."""
+        monkeypatch.setattr(settings, "bulk_max_records", 2)
+        entries = [{"name": f"Over Limit {index}", "price": 1.0} for index in range(3)]
+
+        response = client.post("/api/v1/items/bulk", json=entries)
+        assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        assert "2 records" in response.json()["detail"]
+        assert client.get("/api/v1/items/search/?q=over limit").json() == []
+
+        response = client.post(
+            "/api/v1/items/bulk",
+            content="\n".join(json.dumps(entry) for entry in entries),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["stopped_at"] == 2
+        assert (data["succeeded"], data["failed"]) == (2, 1)
+        assert [result["status"] for result in data["results"]] == [
+            "created",
+            "created",
+            "invalid",
+        ]
+        assert "2 records" in data["results"][2]["error"]
+        created = [result["id"] for result in data["results"][:2]]
+        for item_id in created:
+            assert (
+                client.get(f"/api/v1/items/{item_id}").status_code == status.HTTP_200_OK
+            )
+
+    def test_bulk_stops_at_long_ndjson_line(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that an NDJSON line over the length limit ends the stream, even unterminated."""
+        monkeypatch.setattr(settings, "bulk_max_line_bytes", 100)
+        short = json.dumps({"name": "Before Long", "price": 1.0})
+        long = json.dumps({"name": "Long", "description": "x" * 200, "price": 1.0})
+
+        for body in (f"{short}\n{long}\n{short}\n", f"{short}\n{long}"):
+            response = client.post(
+                "/api/v1/items/bulk",
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()
+            assert data["stopped_at"] == 1
+            assert [result["status"] for result in data["results"]] == [
+                "created",
+                "invalid",
+            ]
+            assert "100 bytes" in data["results"][1]["error"]
+
+    def test_export_items_ndjson(self, client: TestClient) -> None:
+        """Test streaming every item as NDJSON."""
+        expected = [
+            item["id"] for item in client.get("/api/v1/items/?limit=1000").json()
+        ]
+
+        response = client.get("/api/v1/items/export")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = response.text.splitlines()
+        assert [json.loads(line)["id"] for line in lines] == expected
+
+    def test_export_items_csv(self, client: TestClient) -> None:
+        """Test streaming every item as CSV."""
+        response = client.get("/api/v1/items/export?format=csv")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == len(client.get("/api/v1/items/?limit=1000").json())
+        assert {"id", "name", "price", "created_at"} <= set(rows[0])
+
     def test_item_price_precision(self, client: TestClient) -> None:
         """Test that prices are rounded to 2 decimal places."""
         response = client.post(
             "/api/v1/items/",
-            json={"name": "Precision Test", "price": 19.999, "tax": 1.999}
+            json={"name": "Precision Test", "price": 19.999, "tax": 1.999},
         )
         assert response.status_code == status.HTTP_201_CREATED
-        
+
         data = response.json()
         assert data["price"] == 20.00  # Should be rounded
         assert data["tax"] == 2.00  # Should be rounded
+
+    def test_get_item_not_modified(self, client: TestClient) -> None:
+        """Test conditional GET of a single item with If-None-Match."""
+        created = client.post(
+            "/api/v1/items/", json={"name": "ETag Item", "price": 5.0}
+        )
+        item_id = created.json()["id"]
+        etag = created.headers["etag"]
+
+        response = client.get(
+            f"/api/v1/items/{item_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        client.put(f"/api/v1/items/{item_id}", json={"price": 6.0})
+        response = client.get(
+            f"/api/v1/items/{item_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != etag
+        assert response.json()["price"] == 6.0
+
+    def test_list_items_not_modified(self, client: TestClient) -> None:
+        """Test that the collection ETag holds until any item changes."""
+        # Uncompressed, so the ETag is strong
+        etag = client.get(
+            "/api/v1/items/", headers={"Accept-Encoding": "identity"}
+        ).headers["etag"]
+
+        response = client.get(
+            "/api/v1/items/", headers={"If-None-Match": f'W/{etag}, "x"'}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        response = client.get(
+            "/api/v1/items/search/?q=a", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        client.post("/api/v1/items/", json={"name": "Version Bump", "price": 1.0})
+        response = client.get("/api/v1/items/", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != etag
+
+    def test_cached_page_keeps_its_etag(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a page cached before another worker's write is sent with its own ETag."""
+        store = InMemoryItemStore()
+        cached = CachedItemService(store, ttl=60)
+        other_worker = ItemService(store, sample_data=False)
+        monkeypatch.setattr(items_endpoints, "item_service", cached)
+        first = client.get("/api/v1/items/")
+        etag = first.headers["etag"]
+
+        asyncio.run(other_worker.create_item(ItemCreate(name="Elsewhere", price=1.0)))
+        response = client.get("/api/v1/items/")
+        assert response.json() == first.json()
+        assert response.headers["etag"] == etag
+        response = client.get("/api/v1/items/", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        # Once the page is reloaded, body and ETag move on together
+        asyncio.run(cached.create_item(ItemCreate(name="Here", price=1.0)))
+        response = client.get("/api/v1/items/", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != etag
+        assert {"Elsewhere", "Here"} <= {item["name"] for item in response.json()}
+
+    def test_update_item_if_match(self, client: TestClient) -> None:
+        """Test optimistic concurrency on update with If-Match."""
+        created = client.post(
+            "/api/v1/items/", json={"name": "Contested", "price": 1.0}
+        )
+        item_id = created.json()["id"]
+        etag = created.headers["etag"]
+
+        first = client.put(
+            f"/api/v1/items/{item_id}", json={"price": 2.0}, headers={"If-Match": etag}
+        )
+        assert first.status_code == status.HTTP_200_OK
+
+        # A second writer still holding the old ETag is rejected
+        second = client.put(
+            f"/api/v1/items/{item_id}", json={"price": 3.0}, headers={"If-Match": etag}
+        )
+        assert second.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert client.get(f"/api/v1/items/{item_id}").json()["price"] == 2.0
+
+    def test_delete_item_if_match(self, client: TestClient) -> None:
+        """Test that delete honours If-Match."""
+        created = client.post("/api/v1/items/", json={"name": "Guarded", "price": 1.0})
+        item_id = created.json()["id"]
+
+        response = client.delete(
+            f"/api/v1/items/{item_id}", headers={"If-Match": '"stale"'}
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+        response = client.delete(
+            f"/api/v1/items/{item_id}", headers={"If-Match": created.headers["etag"]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response = client.delete(f"/api/v1/items/{item_id}", headers={"If-Match": "*"})
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
 {% endif -%}
\ No newline at end of file
@@ -0,0 +1,108 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for the load generator."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from {{cookiecutter.project_slug}}.core.config import settings
+from {{cookiecutter.project_slug}}.loadtest import (
+    LatencyHistogram,
+    _run,
+    parse_mix,
+    run_load_test,
+)
+from {{cookiecutter.project_slug}}.main import create_app
+
+
+def test_histogram_percentiles() -> None:
+    """Test that percentiles are within the histogram's precision."""
+    histogram = LatencyHistogram()
+    for millis in range(1, 1001):
+        histogram.record(millis / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(500, rel=0.02)
+    assert histogram.percentile(99) == pytest.approx(990, rel=0.02)
+    assert histogram.percentile(100) == 1000
+    assert histogram.mean == pytest.approx(500.5)
+
+
+def test_histogram_is_exact_for_small_values() -> None:
+    """Test that latencies below 128 microseconds are recorded exactly."""
+    histogram = LatencyHistogram()
+    histogram.record(0.000_042)
+
+    assert histogram.percentile(50) == 0.042
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+def test_parse_mix() -> None:
+    """Test parsing request mixes."""
+    assert parse_mix("get=3, list=1,health") == {"get": 3.0, "list": 1.0, "health": 1.0}
+    with pytest.raises(ValueError, match="Unknown operation"):
+        parse_mix("get=1,fetch=2")
+    with pytest.raises(ValueError, match="positive"):
+        parse_mix("get=0")
+
+
+@pytest.mark.asyncio
+async def test_run_load_test_in_process() -> None:
+    """Test an open-loop run against the in-process app."""
+    report = await run_load_test(
+        rate=100, duration=0.3, mix="get=2,list=1,create=1,delete=1,health=1", seed=1
+    )
+
+    assert report.sent == 30
+    assert report.completed == 30
+    assert not report.errors
+    assert set(report.statuses) <= {200, 201, 204}
+    assert sum(histogram.count for histogram in report.operations.values()) == 30
+    assert "99.9%" in report.format()
+
+
+@pytest.mark.asyncio
+async def test_in_process_run_is_not_throttled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the app's own limits do not reject the load test's requests."""
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_policies", {"read": "2/minute"})
+    throttled_app = create_app()
+
+    report = await run_load_test(rate=100, duration=0.3, mix="get=1,list=1", seed=2)
+
+    assert report.completed == report.sent == 30
+    assert not report.throttled
+    # The configured application keeps its limits
+    assert throttled_app.state.rate_limiter is not None
+
+
+async def throttling_app(scope: Any, receive: Any, send: Any) -> None:
+    """Serve an empty item list and reject every health probe with 429."""
+    if scope["path"] == "/healthz":
+        status, body = 429, b'{"detail": "Rate limit exceeded"}'
+    else:
+        status, body = 200, json.dumps([]).encode()
+    await send({"type": "http.response.start", "status": status, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+@pytest.mark.asyncio
+async def test_rejections_are_reported_apart() -> None:
+    """Test that throttled responses stay out of the latency percentiles."""
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=throttling_app), base_url="http://test"
+    )
+
+    report = await _run(
+        client, {"list": 1.0, "health": 1.0}, rate=200, duration=0.2, seed=3
+    )
+
+    assert report.throttled == report.failed.count == report.statuses[429] > 0
+    assert report.completed == report.statuses[200] == report.sent - report.throttled
+    assert set(report.operations) == {"list"}
+    assert report.format().startswith(f"WARNING: {report.throttled} of {report.sent}")
+{% endif -%}
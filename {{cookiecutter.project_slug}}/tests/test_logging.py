@@ -0,0 +1,157 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for the queue-based logging pipeline and log sampling."""
+
+from __future__ import annotations
+
+import io
+import logging
+import queue
+from typing import Any
+
+import pytest
+import structlog
+
+from {{cookiecutter.project_slug}}.core.log_sampling import SUPPRESSED_EVENT, LogSampler
+from {{cookiecutter.project_slug}}.core.logging import (
+    LOG_RECORDS_DROPPED,
+    BoundedQueueHandler,
+    _DrainingQueueListener,
+)
+
+
+def make_logger(handler: logging.Handler) -> logging.Logger:
+    """Isolated logger that only writes to the given handler."""
+    test_logger = logging.getLogger(f"test_logging.{id(handler)}")
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    test_logger.addHandler(handler)
+    return test_logger
+
+
+class TestBoundedQueueHandler:
+    """Test suite for BoundedQueueHandler policies."""
+
+    def test_drop_policy_counts_dropped_records(self) -> None:
+        """Test that records beyond the queue size are dropped and counted."""
+        log_queue: queue.Queue[Any] = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue, policy="drop")
+        dropped_before = LOG_RECORDS_DROPPED.value()
+
+        test_logger = make_logger(handler)
+        for index in range(5):
+            test_logger.info("record %d", index)
+
+        assert log_queue.qsize() == 2
+        assert handler.dropped == 3
+        assert LOG_RECORDS_DROPPED.value() == dropped_before + 3
+
+    def test_block_policy_waits_then_drops(self) -> None:
+        """Test that the block policy gives up after its timeout."""
+        log_queue: queue.Queue[Any] = queue.Queue(maxsize=1)
+        handler = BoundedQueueHandler(log_queue, policy="block", block_timeout=0.01)
+
+        test_logger = make_logger(handler)
+        test_logger.info("first")
+        test_logger.info("second")
+
+        assert log_queue.get_nowait().getMessage() == "first"
+        assert handler.dropped == 1
+
+    def test_listener_writes_every_record_before_stopping(self) -> None:
+        """Test that stopping the listener flushes a full queue."""
+        log_queue: queue.Queue[Any] = queue.Queue(maxsize=3)
+        stream = io.StringIO()
+        stream_handler = logging.StreamHandler(stream)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        handler = BoundedQueueHandler(log_queue, policy="block", block_timeout=5)
+
+        test_logger = make_logger(handler)
+        for index in range(3):
+            test_logger.info("queued %d", index)
+
+        listener = _DrainingQueueListener(log_queue, stream_handler)
+        listener.start()
+        for index in range(3, 10):
+            test_logger.info("queued %d", index)
+        listener.stop()
+
+        assert stream.getvalue().splitlines() == [
+            f"queued {index}" for index in range(10)
+        ]
+        assert handler.dropped == 0
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def run_sampler(sampler: LogSampler, event: str, method_name: str = "info") -> bool:
+    """Whether the sampler keeps an event."""
+    try:
+        sampler(None, method_name, {"event": event})
+    except structlog.DropEvent:
+        return False
+    return True
+
+
+class TestLogSampler:
+    """Test suite for LogSampler."""
+
+    def test_sample_rate_keeps_exact_fraction(self) -> None:
+        """Test that a 0.25 sample rate keeps every fourth event."""
+        sampler = LogSampler(sample_rates={"hot": 0.25}, clock=FakeClock())
+
+        kept = [run_sampler(sampler, "hot") for _ in range(8)]
+
+        assert kept == [False, False, False, True] * 2
+        assert all(run_sampler(sampler, "other") for _ in range(5))
+
+    def test_rate_limit_refills_over_time(self) -> None:
+        """Test that the token bucket allows bursts and refills at its rate."""
+        clock = FakeClock()
+        sampler = LogSampler(rate_limits={"*": 2}, clock=clock)
+
+        assert [run_sampler(sampler, "busy") for _ in range(3)] == [True, True, False]
+        clock.now += 0.5
+        assert run_sampler(sampler, "busy")
+        assert not run_sampler(sampler, "busy")
+
+    @pytest.mark.parametrize("method_name", ["error", "exception", "critical"])
+    def test_errors_are_never_dropped(self, method_name: str) -> None:
+        """Test that error-level events bypass sampling and rate limits."""
+        sampler = LogSampler(
+            sample_rates={"*": 0.0}, rate_limits={"*": 1}, clock=FakeClock()
+        )
+
+        assert all(run_sampler(sampler, "failure", method_name) for _ in range(10))
+        assert not run_sampler(sampler, "failure", "warning")
+
+    def test_suppressed_summary_is_periodic(self) -> None:
+        """Test that suppressed counts are summarised once per interval."""
+        clock = FakeClock()
+        sampler = LogSampler(
+            sample_rates={"hot": 0.0}, summary_interval=10, clock=clock
+        )
+
+        with structlog.testing.capture_logs() as logs:
+            for _ in range(3):
+                run_sampler(sampler, "hot")
+            clock.now = 10
+            run_sampler(sampler, "hot")
+            run_sampler(sampler, "hot")
+            sampler.flush()
+            sampler.flush()
+
+        summaries = [log for log in logs if log["event"] == SUPPRESSED_EVENT]
+        assert [summary["suppressed"] for summary in summaries] == [
+            {"hot": 4},
+            {"hot": 1},
+        ]
+        assert summaries[0]["log_level"] == "warning"
+{% endif -%}
@@ -0,0 +1,99 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for the event loop lag monitor."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from {{cookiecutter.project_slug}}.core import loop_monitor as loop_monitor_module
+from {{cookiecutter.project_slug}}.core.loop_monitor import LoopLagMonitor
+from {{cookiecutter.project_slug}}.main import app
+
+
+class RecordingLogger:
+    """Logger that keeps its warnings."""
+
+    def __init__(self) -> None:
+        """Start with no records."""
+        self.warnings: list[tuple[str, dict[str, Any]]] = []
+
+    def warning(self, event: str, **fields: Any) -> None:
+        """Record a warning."""
+        self.warnings.append((event, fields))
+
+
+def block_loop(seconds: float) -> None:
+    """Hold the event loop thread without yielding."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_blocking_callback_is_reported(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a blocking call is logged once, with its stack, and shows as lag."""
+    log = RecordingLogger()
+    monkeypatch.setattr(loop_monitor_module, "logger", log)
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.05)
+
+    await monitor.start()
+    await asyncio.sleep(0.05)
+    block_loop(0.3)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert len(log.warnings) == 1
+    event, fields = log.warnings[0]
+    assert event == "Event loop blocked"
+    assert fields["blocked_for"] > 0.05
+    stack = fields["stack"]
+    assert (
+        0
+        <= stack.index("in test_blocking_callback_is_reported")
+        < stack.index("in block_loop")
+    )
+    # The event loop's own frames are left out
+    assert "base_events.py" not in stack
+
+    summary = monitor.summary()
+    assert summary.blocked_calls == 1
+    assert summary.max_ms > 250
+    assert summary.p50_ms < 50
+    assert not monitor.running
+
+
+@pytest.mark.asyncio
+async def test_idle_loop_has_low_lag(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an idle loop reports no blocking."""
+    log = RecordingLogger()
+    monkeypatch.setattr(loop_monitor_module, "logger", log)
+    monitor = LoopLagMonitor(interval=0.005, threshold=0.1, window=10)
+
+    assert monitor.summary().samples == 0
+    await monitor.start()
+    await asyncio.sleep(0.2)
+    await monitor.stop()
+
+    summary = monitor.summary()
+    assert summary.samples == 10
+    assert summary.p50_ms <= summary.p90_ms <= summary.p99_ms <= summary.max_ms < 100
+    assert summary.blocked_calls == 0
+    assert not log.warnings
+
+
+def test_health_reports_event_loop_lag() -> None:
+    """Test that the health endpoints include lag percentiles while serving."""
+    with TestClient(app) as client:
+        time.sleep(0.3)
+        data = client.get("/healthz").json()
+
+    assert data["event_loop"]["samples"] > 0
+    assert data["event_loop"]["p99_ms"] >= data["event_loop"]["p50_ms"]
+    # Without the lifespan the monitor is not running
+    assert TestClient(app).get("/livez").json()["event_loop"] is None
+{% endif -%}
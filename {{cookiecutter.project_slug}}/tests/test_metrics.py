@@ -0,0 +1,86 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for the metrics registry and /metrics endpoint."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from {{cookiecutter.project_slug}}.core.metrics import Counter, Gauge, Histogram, Registry
+
+
+class TestRegistry:
+    """Test suite for metric types and text rendering."""
+
+    def test_counter_and_gauge(self) -> None:
+        """Test counter and gauge samples with labels."""
+        registry = Registry()
+        counter = Counter("jobs_total", "Jobs run", ("kind",), registry=registry)
+        gauge = Gauge("queue_depth", "Queued jobs", registry=registry)
+        counter.inc(("a",))
+        counter.inc(("a",), amount=2)
+        counter.inc(('quote"d',))
+        gauge.inc(amount=5)
+        gauge.dec()
+
+        text = registry.render()
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{kind="a"} 3' in text
+        assert 'jobs_total{kind="quote\\"d"} 1' in text
+        assert "# TYPE queue_depth gauge" in text
+        assert "queue_depth 4" in text
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Test histogram bucket, sum and count lines."""
+        registry = Registry()
+        histogram = Histogram(
+            "latency_seconds",
+            "Latency",
+            ("route",),
+            buckets=(0.1, 1.0),
+            registry=registry,
+        )
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, ("/x",))
+
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{route="/x",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{route="/x",le="1"} 3' in lines
+        assert 'latency_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+        assert 'latency_seconds_sum{route="/x"} 3.65' in lines
+        assert 'latency_seconds_count{route="/x"} 4' in lines
+
+    def test_duplicate_names_rejected(self) -> None:
+        """Test that a metric name can only be registered once."""
+        registry = Registry()
+        Counter("dup_total", "First", registry=registry)
+        with pytest.raises(ValueError):
+            Gauge("dup_total", "Second", registry=registry)
+
+
+def test_metrics_endpoint(client: TestClient) -> None:
+    """Test that requests and item service operations show up in /metrics."""
+    item_id = client.get("/api/v1/items/").json()[0]["id"]
+    client.get(f"/api/v1/items/{item_id}")
+    client.get("/no/such/path")
+
+    response = client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    text = response.text
+    assert (
+        'http_requests_total{method="GET",route="/api/v1/items/{item_id}",status="200"}'
+        in text
+    )
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"}' in text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/v1/items/"}'
+        in text
+    )
+    assert 'http_response_size_bytes_bucket{method="GET",route="/api/v1/items/"' in text
+    assert 'item_service_operation_duration_seconds_count{operation="get_item"}' in text
+    assert "http_requests_in_progress 1" in text
+    assert "item_store_items " in text
+{% endif -%}
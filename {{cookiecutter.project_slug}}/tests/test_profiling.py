@@ -0,0 +1,120 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for the per-request sampling profiler."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+from {{cookiecutter.project_slug}}.core.profiling import SUSPENDED, ProfilerMiddleware
+
+TOKEN = "test-profile-token"  # noqa: S105 - fixed token for tests only
+
+
+def busy_work(seconds: float) -> None:
+    """Keep the event loop thread busy."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def slow_app(scope: Any, receive: Any, send: Any) -> None:
+    """Block the loop, then wait, then respond."""
+    busy_work(0.1)
+    await asyncio.sleep(0.1)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def call(
+    app: Any, headers: Optional[list[tuple[bytes, bytes]]] = None
+) -> dict[str, Any]:
+    """Send one request through an ASGI app and return its response start message."""
+    messages: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/items/",
+        "headers": headers or [],
+    }
+    await app(scope, receive, send)
+    return messages[0]
+
+
+def profile_file(message: dict[str, Any], directory: Path) -> Path:
+    """Path of the profile named in a response, once it is written."""
+    filename = dict(message["headers"])[b"x-profile-file"].decode()
+    path = directory / filename
+    # The profile is renamed into place complete, so it exists only once written
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [entry.name for entry in directory.iterdir()] == [filename]
+    return path
+
+
+@pytest.mark.asyncio
+async def test_header_with_token_profiles_request(tmp_path: Path) -> None:
+    """Test that running and suspended time are both attributed to the request."""
+    app = ProfilerMiddleware(slow_app, str(tmp_path), token=TOKEN, interval=0.002)
+
+    message = await call(app, [(b"x-profile", TOKEN.encode())])
+
+    stacks = profile_file(message, tmp_path).read_text().splitlines()
+    running = [line for line in stacks if ";busy_work (" in line]
+    waiting = [line for line in stacks if line.rsplit(" ", 1)[0].endswith(SUSPENDED)]
+    assert running and all(";slow_app (" in line for line in running)
+    assert waiting and all(";sleep (asyncio/tasks.py" in line for line in waiting)
+    # Stacks start at the request's task, not in the event loop
+    assert all(line.startswith("test_header_with_token") for line in stacks)
+
+
+@pytest.mark.asyncio
+async def test_requests_without_trigger_pass_through(tmp_path: Path) -> None:
+    """Test that wrong tokens and unsampled requests are not profiled."""
+    app = ProfilerMiddleware(
+        slow_app, str(tmp_path), token=TOKEN, sample_rate=0.5, random_source=lambda: 0.9
+    )
+
+    message = await call(app, [(b"x-profile", b"guess")])
+
+    assert b"x-profile-file" not in dict(message["headers"])
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_sampled_request_writes_speedscope(tmp_path: Path) -> None:
+    """Test random sampling and the speedscope output format."""
+    app = ProfilerMiddleware(
+        slow_app,
+        str(tmp_path),
+        sample_rate=0.1,
+        interval=0.002,
+        output_format="speedscope",
+        random_source=lambda: 0.05,
+    )
+
+    message = await call(app)
+
+    path = profile_file(message, tmp_path)
+    assert path.name.endswith(".speedscope.json")
+    document = json.loads(path.read_text())
+    profile = document["profiles"][0]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"]) > 0
+    names = [frame["name"] for frame in document["shared"]["frames"]]
+    assert any(name.startswith("busy_work") for name in names)
+    assert sum(profile["weights"]) == pytest.approx(profile["endValue"], abs=0.05)
+{% endif -%}
@@ -0,0 +1,158 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for per-client rate limiting."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from {{cookiecutter.project_slug}}.core.rate_limit import (
+    MemoryRateLimitStore,
+    RateLimiter,
+    RateLimitHeadersMiddleware,
+    RateLimitPolicy,
+)
+from {{cookiecutter.project_slug}}.main import app
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        """Start at time zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+class TestRateLimitPolicy:
+    """Test suite for RateLimitPolicy parsing."""
+
+    def test_parse(self) -> None:
+        """Test parsing of "<count>/<period>" rates."""
+        assert RateLimitPolicy.parse("read", "120/minute") == RateLimitPolicy(
+            "read", 120, 60
+        )
+        assert RateLimitPolicy.parse("write", " 5 / second ").interval == 0.2
+
+    @pytest.mark.parametrize("rate", ["", "10", "0/minute", "10/fortnight"])
+    def test_parse_rejects_invalid_rates(self, rate: str) -> None:
+        """Test that malformed rates are rejected."""
+        with pytest.raises(ValueError):
+            RateLimitPolicy.parse("read", rate)
+
+
+class TestMemoryRateLimitStore:
+    """Test suite for MemoryRateLimitStore."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_refill(self) -> None:
+        """Test that a full bucket allows a burst and then refills evenly."""
+        clock = FakeClock()
+        store = MemoryRateLimitStore(clock=clock)
+        policy = RateLimitPolicy("read", 3, 3)
+
+        results = [await store.take("client", policy) for _ in range(4)]
+        assert [result.allowed for result in results] == [True, True, True, False]
+        assert [result.remaining for result in results] == [2, 1, 0, 0]
+        assert results[2].reset_after == 3
+        assert results[3].retry_after == 1
+
+        clock.now = 1
+        assert (await store.take("client", policy)).allowed
+        assert not (await store.take("client", policy)).allowed
+        # Other clients have their own buckets
+        assert (await store.take("other", policy)).remaining == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_buckets_are_swept(self) -> None:
+        """Test that buckets that have refilled are dropped over a sweep interval."""
+        clock = FakeClock()
+        store = MemoryRateLimitStore(shards=4, sweep_interval=4, clock=clock)
+        policy = RateLimitPolicy("read", 10, 1)
+        for index in range(100):
+            await store.take(f"client-{index}", policy)
+        assert len(store) == 100
+
+        for step in range(1, 5):
+            clock.now = 1 + step
+            await store.take("active", policy)
+        assert len(store) <= 1
+
+
+class TestRateLimiter:
+    """Test suite for RateLimiter client identification."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_api_keys_share_the_ip_bucket(self) -> None:
+        """Test that made-up API keys neither widen the quota nor add buckets."""
+        store = MemoryRateLimitStore(clock=FakeClock())
+        limiter = RateLimiter(
+            {"read": RateLimitPolicy("read", 3, 60)}, store=store, api_keys=["known"]
+        )
+
+        def scope(api_key: bytes) -> dict[str, object]:
+            return {"headers": [(b"x-api-key", api_key)], "client": ("10.0.0.1", 1234)}
+
+        results = [
+            await limiter.hit("read", scope(f"guess-{i}".encode())) for i in range(4)
+        ]
+        assert [result.allowed for _, result in results] == [True, True, True, False]
+        assert limiter.client_key(scope(b"guess")) == "ip:10.0.0.1"
+        assert len(store) == 1
+
+        # A known key has its own bucket
+        assert limiter.client_key(scope(b"known")).startswith("key:")
+        _, result = await limiter.hit("read", scope(b"known"))
+        assert result.allowed
+        assert len(store) == 2
+
+
+def test_rate_limit_headers_and_429(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test RateLimit headers on limited endpoints and 429 once exhausted."""
+    # Rate limiting is off by default, so the app has no headers middleware
+    client = TestClient(RateLimitHeadersMiddleware(app))
+    monkeypatch.setattr(
+        app.state,
+        "rate_limiter",
+        RateLimiter(
+            {
+                "read": RateLimitPolicy("read", 3, 60),
+                "write": RateLimitPolicy("write", 1, 60),
+            },
+            store=MemoryRateLimitStore(clock=FakeClock()),
+            api_keys=["test-rate-limit-key"],
+        ),
+    )
+    headers = {"X-API-Key": "test-rate-limit-key"}
+
+    response = client.get("/api/v1/items/", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["RateLimit-Limit"] == "3"
+    assert response.headers["RateLimit-Remaining"] == "2"
+    assert response.headers["RateLimit-Reset"] == "20"
+    assert response.headers["RateLimit-Policy"] == "3;w=60"
+
+    # Single item reads are not limited
+    item_id = response.json()[0]["id"]
+    assert "RateLimit-Limit" not in client.get(f"/api/v1/items/{item_id}").headers
+
+    # Listing and search share the read policy
+    for _ in range(2):
+        assert (
+            client.get("/api/v1/items/search/?q=a", headers=headers).status_code == 200
+        )
+    response = client.get("/api/v1/items/", headers=headers)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response.headers["RateLimit-Remaining"] == "0"
+    assert response.headers["Retry-After"] == "20"
+
+    # Writes have a separate policy, and other clients their own buckets
+    response = client.delete("/api/v1/items/no-such-item", headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.headers["RateLimit-Limit"] == "1"
+    assert client.get("/api/v1/items/").status_code == status.HTTP_200_OK
+{% endif -%}
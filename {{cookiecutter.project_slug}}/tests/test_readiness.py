@@ -0,0 +1,131 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for the background-refreshed readiness registry."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from {{cookiecutter.project_slug}}.core.readiness import ReadinessRegistry, readiness
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        """Start at time zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+class CountingCheck:
+    """Check that records its runs and returns a configurable result."""
+
+    def __init__(self, ok: bool = True, delay: float = 0.0) -> None:
+        """Optionally delay each run."""
+        self.ok = ok
+        self.delay = delay
+        self.runs = 0
+
+    async def __call__(self) -> bool:
+        """Run the check."""
+        self.runs += 1
+        await asyncio.sleep(self.delay)
+        return self.ok
+
+
+class TestReadinessRegistry:
+    """Test suite for ReadinessRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently(self) -> None:
+        """Test that a refresh runs its checks at the same time."""
+        registry = ReadinessRegistry()
+        for name in ("a", "b", "c"):
+            registry.register(name, CountingCheck(delay=0.05))
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await registry.refresh()
+        elapsed = loop.time() - start
+
+        assert elapsed < 0.12
+        assert {name: result.ok for name, result in registry.snapshot().items()} == {
+            "a": True,
+            "b": True,
+            "c": True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_checks_run_on_their_own_interval(self) -> None:
+        """Test that only checks whose interval has passed are run again."""
+        clock = FakeClock()
+        registry = ReadinessRegistry(clock=clock)
+        fast, slow = CountingCheck(), CountingCheck()
+        registry.register("fast", fast, interval=1)
+        registry.register("slow", slow, interval=10)
+
+        await registry.refresh()
+        clock.now = 2
+        await registry.refresh()
+
+        assert (fast.runs, slow.runs) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_failures_and_timeouts(self) -> None:
+        """Test that raising and slow checks are recorded as failed."""
+
+        async def broken() -> bool:
+            raise ConnectionError("refused")
+
+        registry = ReadinessRegistry()
+        registry.register("broken", broken)
+        registry.register("slow", CountingCheck(delay=1), timeout=0.01)
+        registry.register("down", CountingCheck(ok=False))
+
+        await registry.refresh()
+        results = registry.snapshot()
+
+        assert not any(result.ok for result in results.values())
+        assert results["broken"].error == "ConnectionError: refused"
+        assert results["slow"].error == "timed out after 0.01s"
+        assert results["down"].error is None
+
+    @pytest.mark.asyncio
+    async def test_background_refresh(self) -> None:
+        """Test that start() checks at once and then keeps refreshing."""
+        registry = ReadinessRegistry()
+        check = CountingCheck()
+        registry.register("check", check, interval=0.01)
+
+        await registry.start()
+        assert check.runs == 1 and registry.running
+        await asyncio.sleep(0.05)
+        await registry.stop()
+
+        assert check.runs > 1
+        assert not registry.running
+
+
+def test_readyz_returns_503_when_a_check_fails(client: TestClient) -> None:
+    """Test that /readyz reports failed checks with a 503 status."""
+    readiness.register("always_down", CountingCheck(ok=False))
+    try:
+        response = client.get("/readyz")
+    finally:
+        readiness.unregister("always_down")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    data = response.json()
+    assert data["status"] == "not_ready"
+    assert data["checks"]["always_down"] is False
+    assert data["checks"]["item_store"] is True
+
+    assert client.get("/readyz").status_code == status.HTTP_200_OK
+{% endif -%}
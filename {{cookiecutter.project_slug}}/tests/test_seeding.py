@@ -0,0 +1,65 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for the synthetic catalog generator."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from {{cookiecutter.project_slug}}.models.item import Item
+from {{cookiecutter.project_slug}}.services.seeding import (
+    MAX_CATALOG_SIZE,
+    catalog_id,
+    generate_items,
+)
+
+
+def test_generate_items_is_deterministic() -> None:
+    """Test that a seed always yields the same catalog, whatever the batch size."""
+    first = [item for batch in generate_items(1000, seed=3) for item in batch]
+    second = [
+        item for batch in generate_items(1000, seed=3, batch_size=64) for item in batch
+    ]
+    other = [item for batch in generate_items(1000, seed=4) for item in batch]
+
+    assert first == second
+    assert [item.name for item in first] != [item.name for item in other]
+
+
+def test_generated_items_are_valid_and_unique() -> None:
+    """Test that generated items pass validation and never share an ID."""
+    items = [
+        item
+        for batch in generate_items(5000, seed=1, batch_size=1000)
+        for item in batch
+    ]
+
+    for item in items[:200]:
+        assert Item.model_validate(item.model_dump()) == item
+    assert len({item.id for item in items}) == 5000
+    assert not {item.id for item in items} & {catalog_id(2, i) for i in range(5000)}
+    assert [item.created_at for item in items] == sorted(
+        item.created_at for item in items
+    )
+
+
+def test_generated_names_follow_skewed_distribution() -> None:
+    """Test that a few words dominate, as in real catalogs."""
+    items = [item for batch in generate_items(5000) for item in batch]
+    nouns = Counter(item.name.split()[-1] for item in items)
+
+    (top, top_count), *_ = nouns.most_common()
+    assert top == "Laptop"
+    assert top_count > 4 * nouns.most_common()[-1][1]
+    assert 0.05 < sum(item.description is None for item in items) / 5000 < 0.2
+
+
+def test_generate_items_rejects_invalid_count() -> None:
+    """Test the catalog size limits."""
+    with pytest.raises(ValueError):
+        next(generate_items(-1))
+    with pytest.raises(ValueError):
+        next(generate_items(MAX_CATALOG_SIZE + 1))
+    assert list(generate_items(0)) == []
+{% endif -%}
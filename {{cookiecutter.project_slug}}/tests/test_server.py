@@ -0,0 +1,77 @@
+{% if cookiecutter.project_type != "cli" -%}
+"""Tests for the production server launcher."""
+
+from __future__ import annotations
+
+import os
+import signal
+import threading
+from pathlib import Path
+
+import pytest
+
+from {{cookiecutter.project_slug}}.core.config import Settings
+from {{cookiecutter.project_slug}}.server import (
+    WorkerPool,
+    max_requests,
+    uvicorn_options,
+    worker_count,
+)
+
+
+def test_worker_count() -> None:
+    """Test that 0 workers means one per available CPU."""
+    assert worker_count(3) == 3
+    assert worker_count(0) >= 1
+
+
+def test_uvicorn_options_from_settings() -> None:
+    """Test that server settings map onto uvicorn options."""
+    config = Settings(
+        server_loop="uvloop",
+        server_backlog=128,
+        server_keep_alive=30,
+        server_limit_concurrency=500,
+    )
+
+    options = uvicorn_options(config)
+
+    assert options["loop"] == "uvloop"
+    assert options["http"] == "auto"
+    assert options["backlog"] == 128
+    assert options["timeout_keep_alive"] == 30
+    assert options["limit_concurrency"] == 500
+
+
+def test_max_requests_jitter() -> None:
+    """Test worker recycling limits with jitter."""
+    assert max_requests(0, 100) is None
+    assert max_requests(1000, 0) == 1000
+    assert all(1000 <= max_requests(1000, 50) <= 1050 for _ in range(20))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_worker_pool_restarts_exited_workers(tmp_path: Path) -> None:
+    """Test that workers are forked, replaced when they exit and stopped on SIGTERM."""
+    log = tmp_path / "workers.log"
+
+    def target(index: int) -> None:
+        with open(log, "a") as file:
+            file.write(f"{index}\n")
+
+    pool = WorkerPool(target, workers=2, graceful_timeout=1)
+    previous = signal.getsignal(signal.SIGTERM), signal.getsignal(signal.SIGINT)
+    timer = threading.Timer(0.5, os.kill, (os.getpid(), signal.SIGTERM))
+    timer.start()
+    try:
+        pool.run()
+    finally:
+        timer.cancel()
+        signal.signal(signal.SIGTERM, previous[0])
+        signal.signal(signal.SIGINT, previous[1])
+
+    starts = log.read_text().split()
+    assert {"0", "1"} <= set(starts)
+    # Workers exiting cleanly are restarted at once
+    assert len(starts) > 2
+{% endif -%}